@@ -0,0 +1,21 @@
+from MAPFSolver import *
+
+
+# Regression: without stay at goal, an agent that starts in his goal has a path of cost one and a lower bound of the
+# same cost, so ECBS finds the same solution of CBS.
+problem_map = Map(4, 4, set())
+problem_agents = [Agent(0, (0, 0), (1, 0)), Agent(1, (3, 3), (3, 3))]
+problem_instance = ProblemInstance(problem_map, problem_agents)
+
+solver_settings = SolverSettings(stay_at_goal=False, time_out=10)
+
+cbs_paths, cbs_infos = CBSSolver(solver_settings).solve(problem_instance, return_infos=True)
+ecbs_paths, ecbs_infos = ECBSSolver(solver_settings).solve(problem_instance, return_infos=True)
+
+print("CBS: ", cbs_paths, cbs_infos)
+print("ECBS:", ecbs_paths, ecbs_infos)
+
+assert ecbs_paths, "ECBS didn't find a solution"
+assert check_conflicts(ecbs_paths, solver_settings.stay_at_goal(), solver_settings.is_edge_conflict()) is None
+assert ecbs_infos["lower_bound"] <= cbs_infos["sum_of_costs"] <= ecbs_infos["sum_of_costs"]
+assert ecbs_infos["sum_of_costs"] <= solver_settings.get_suboptimality_factor() * ecbs_infos["lower_bound"]
@@ -44,6 +44,7 @@ ALGORITHMS_MODES = [
     ("A* with Operator Decomposition", "A* with Operator Decomposition"),
     ("Increasing Cost Tree Search", "Increasing Cost Tree Search"),
     ("Conflict Based Search", "Conflict Based Search"),
+    ("Enhanced Conflict Based Search", "Enhanced Conflict Based Search"),
     ("M*", "M*"),
 ]
 
@@ -53,7 +54,8 @@ COLORS_LIST =["#FF0000", "#00FF00", "#0000FF", "#FFFF00", "#00FFFF", "#FF00FF",
 
 HEURISTICS_MODES = [
     ("Manhattan Distance", "Manhattan"),
-    ("Abstract Distance with RRA*", "AbstractDistance")
+    ("Abstract Distance with RRA*", "AbstractDistance"),
+    ("True Distance with BFS tables", "TrueDistance")
 ]
 
 OBJECTIVE_FUNCTION_MODES = [
@@ -1,4 +1,5 @@
-from MAPFSolver.Utilities.StatesQueue import StatesQueue
+from MAPFSolver.Utilities.HeapQueue import HeapQueue
+from MAPFSolver.Utilities.ClosedList import ClosedList
 from .Heuristic import Heuristic
 
 
@@ -28,23 +29,25 @@ class AbstractDistanceHeuristicWithRRAStar(Heuristic):
         :param goal_pos: position of the goal of the agent.
         :return:
         """
-        while not self._open_lists[goal_pos].is_empty():
-            self._open_lists[goal_pos].sort_by_f_value()
-            cur_state = self._open_lists[goal_pos].pop()
-            self._closed_lists[goal_pos].add(cur_state)
+        open_list = self._open_lists[goal_pos]
+        closed_list = self._closed_lists[goal_pos]
+
+        while not open_list.is_empty():
+            cur_state = open_list.pop()
+            closed_list.add(cur_state)
 
             if cur_state.get_position() == position:
-                self._open_lists[goal_pos].add(cur_state)
+                open_list.add(cur_state)
                 return True
 
             expanded_nodes = cur_state.expand()
             for state in expanded_nodes:
-                if not self._open_lists[goal_pos].contains_position(state.get_position()) and \
-                        not self._closed_lists[goal_pos].contains_position(state.get_position()):
-                    self._open_lists[goal_pos].add(state)
-                if self._open_lists[goal_pos].contains_position(state.get_position()):
-                    if state.f_value() < self._open_lists[goal_pos].contains_position(state.get_position()).f_value():
-                        self._open_lists[goal_pos].update(state)
+                if open_list.get(state.get_position()) is None and \
+                        not closed_list.contains_position(state.get_position()):
+                    open_list.add(state)
+                if open_list.get(state.get_position()) is not None:
+                    if state.f_value() < open_list.get(state.get_position()).f_value():
+                        open_list.update(state)
         return False
 
     def compute_heuristic(self, position, goal):
@@ -67,8 +70,8 @@ class AbstractDistanceHeuristicWithRRAStar(Heuristic):
         for agent in self._problem_instance.get_agents():
             goal_pos = agent.get_goal()
 
-            self._open_lists[goal_pos] = StatesQueue()
-            self._closed_lists[goal_pos] = StatesQueue()
+            self._open_lists[goal_pos] = HeapQueue(index_function=lambda x: x.get_position())
+            self._closed_lists[goal_pos] = ClosedList()
 
             from MAPFSolver.Utilities.SingleAgentState import SingleAgentState
             from MAPFSolver.Utilities.SolverSettings import SolverSettings
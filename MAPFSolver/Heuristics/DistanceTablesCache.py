@@ -0,0 +1,134 @@
+from MAPFSolver.Utilities.distance_field import compute_distance_field
+from MAPFSolver.Utilities.IndividualPolicy import IndividualPolicy
+from collections import OrderedDict
+from threading import Lock
+
+DEFAULT_MEMORY_BUDGET = 128 * 1024 * 1024  # Bytes
+
+
+class DistanceTablesCache:
+    """
+    Process-wide cache of the distance tables (distance fields to a goal). The tables are keyed by the map identity and
+    the goal position, so they are shared between different solves on the same map: the CBS low level replans, the ID
+    framework subproblems and the solvers run one after the other reuse them instead of computing them again.
+    It also keeps the optimal individual policies derived from the distance tables, used by M*.
+    The cache has a memory budget. When the tables exceed it, the least recently used ones are evicted.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        Initialize an empty cache.
+        :param memory_budget: maximum number of bytes used by the cached tables.
+        """
+        self._tables = OrderedDict()
+        self._memory_budget = memory_budget
+        self._memory_used = 0
+        self._n_of_hits = 0
+        self._n_of_misses = 0
+        self._lock = Lock()
+
+    def get_table(self, problem_map, goal):
+        """
+        Return the distance table of the given goal in the given map. It is computed only if not already cached.
+        :param problem_map: map of the problem.
+        :param goal: goal position.
+        :return: the distance table as (height x width) array.
+        """
+        return self._get_or_compute(("distance", problem_map.get_key(), goal),
+                                    lambda: compute_distance_field(problem_map, goal))
+
+    def get_policy(self, problem_map, goal):
+        """
+        Return the optimal individual policy toward the given goal in the given map. It is computed from the distance
+        table only if not already cached.
+        :param problem_map: map of the problem.
+        :param goal: goal position.
+        :return: an IndividualPolicy instance.
+        """
+        return self._get_or_compute(("policy", problem_map.get_key(), goal),
+                                    lambda: IndividualPolicy(self.get_table(problem_map, goal)))
+
+    def _get_or_compute(self, key, compute_function):
+        """
+        Return the cached entry with the given key. If not present it is computed and added to the cache.
+        :param key: key of the entry.
+        :param compute_function: function that computes the entry. The entry must have the nbytes attribute.
+        """
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is not None:
+                self._tables.move_to_end(key)
+                self._n_of_hits += 1
+                return entry
+            self._n_of_misses += 1
+
+        entry = compute_function()
+
+        with self._lock:
+            if key not in self._tables and entry.nbytes <= self._memory_budget:
+                self._tables[key] = entry
+                self._memory_used += entry.nbytes
+                self.evict()
+        return entry
+
+    def evict(self):
+        """
+        Evict the least recently used tables until the memory used is within the budget.
+        """
+        while self._memory_used > self._memory_budget:
+            key, table = self._tables.popitem(last=False)
+            self._memory_used -= table.nbytes
+
+    def set_memory_budget(self, memory_budget):
+        """
+        Set the maximum number of bytes used by the cached tables. If needed the tables are evicted immediately.
+        :param memory_budget: new memory budget in bytes.
+        """
+        with self._lock:
+            self._memory_budget = memory_budget
+            self.evict()
+
+    def get_memory_budget(self):
+        """
+        Return the memory budget in bytes.
+        """
+        return self._memory_budget
+
+    def get_memory_used(self):
+        """
+        Return the number of bytes used by the cached tables.
+        """
+        return self._memory_used
+
+    def get_n_of_hits(self):
+        """
+        Return the number of requests answered by the cache.
+        """
+        return self._n_of_hits
+
+    def get_n_of_misses(self):
+        """
+        Return the number of requests that required to compute the table.
+        """
+        return self._n_of_misses
+
+    def clear(self):
+        """
+        Remove all the tables from the cache.
+        """
+        with self._lock:
+            self._tables.clear()
+            self._memory_used = 0
+
+    def __len__(self):
+        return len(self._tables)
+
+
+DISTANCE_TABLES_CACHE = DistanceTablesCache()
+
+
+def get_distance_tables_cache():
+    """
+    Return the process-wide distance tables cache.
+    """
+    return DISTANCE_TABLES_CACHE
@@ -0,0 +1,60 @@
+from MAPFSolver.Utilities.distance_field import UNREACHABLE
+from .DistanceTablesCache import get_distance_tables_cache
+from .Heuristic import Heuristic
+
+
+class TrueDistanceHeuristic(Heuristic):
+    """
+    True distance heuristic. Like the abstract distance heuristic it is a perfect estimate of the distance to the
+    destination with all the other agents removed, but instead of resuming RRA* for each query it computes once the
+    whole distance field of each goal with a breadth-first sweep over the occupancy grid. The fields are stored as
+    arrays, so each heuristic value is a constant time lookup.
+    The fields are taken from the process-wide distance tables cache, so initializing this heuristic again for the same
+    map and goals (e.g. for each low level search of CBS) doesn't compute them again.
+    """
+
+    def __init__(self, problem_instance):
+        """
+        Initialize the heuristic. It computes the distance field of the goal of each agent.
+        :param problem_instance: instance of the problem to compute the heuristic values.
+        """
+        self._problem_instance = problem_instance
+        self._distance_tables = dict()
+        self.initialize_table()
+
+    def compute_heuristic(self, position, goal):
+        """
+        Compute the value of the heuristic in that position to the goal position. If the goal can't be reached from
+        that position it returns None.
+        """
+        distance = self.get_distance_table(goal).item(position[1], position[0])
+        if distance == UNREACHABLE:
+            return None
+        return distance
+
+    def compute_table(self, goal):
+        """
+        Get from the cache, or compute, and store the distance field of the given goal.
+        :param goal: goal position.
+        :return: the distance field as (height x width) array.
+        """
+        self._distance_tables[goal] = get_distance_tables_cache().get_table(self._problem_instance.get_map(), goal)
+        return self._distance_tables[goal]
+
+    def get_distance_table(self, goal):
+        """
+        Return the distance field of the given goal. The unreachable cells have value UNREACHABLE.
+        :param goal: goal position.
+        """
+        distance_table = self._distance_tables.get(goal)
+        if distance_table is None:
+            distance_table = self.compute_table(goal)
+        return distance_table
+
+    def initialize_table(self):
+        """
+        Initialize the tables. For each agent it computes the distance field of his goal position.
+        """
+        for agent in self._problem_instance.get_agents():
+            if agent.get_goal() not in self._distance_tables:
+                self.compute_table(agent.get_goal())
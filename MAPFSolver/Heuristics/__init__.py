@@ -2,3 +2,5 @@ from .Heuristic import Heuristic
 from .initialize_heuristic import initialize_heuristics
 from .ManhattanDistanceHeuristic import ManhattanDistanceHeuristic
 from .AbstractDistanceHeuristicWithRRAStar import AbstractDistanceHeuristicWithRRAStar
+from .TrueDistanceHeuristic import TrueDistanceHeuristic
+from .DistanceTablesCache import DistanceTablesCache, get_distance_tables_cache
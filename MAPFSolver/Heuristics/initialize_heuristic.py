@@ -12,3 +12,7 @@ def initialize_heuristics(heuristics_name, problem_instance):
     if heuristics_name == "AbstractDistance":
         from .AbstractDistanceHeuristicWithRRAStar import AbstractDistanceHeuristicWithRRAStar
         return AbstractDistanceHeuristicWithRRAStar(problem_instance)
+
+    if heuristics_name == "TrueDistance":
+        from .TrueDistanceHeuristic import TrueDistanceHeuristic
+        return TrueDistanceHeuristic(problem_instance)
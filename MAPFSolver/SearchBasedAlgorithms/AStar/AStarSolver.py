@@ -1,7 +1,8 @@
 from MAPFSolver.Utilities.paths_processing import calculate_soc, calculate_makespan
 from MAPFSolver.Utilities.SingleAgentState import SingleAgentState
 from MAPFSolver.Utilities.AbstractSolver import AbstractSolver
-from MAPFSolver.Utilities.StatesQueue import StatesQueue
+from MAPFSolver.Utilities.ClosedList import ClosedList
+from MAPFSolver.Utilities.HeapQueue import HeapQueue
 from .MultiAgentState import MultiAgentState
 from threading import Thread, Event
 import time
@@ -72,7 +73,6 @@ class AStarSolver(AbstractSolver):
             if self._stop_event.is_set():
                 break
 
-            self._frontier.sort_by_f_value()
             cur_state = self._frontier.pop()
 
             if cur_state.is_completed():
@@ -94,7 +94,7 @@ class AStarSolver(AbstractSolver):
                     expanded_nodes = cur_state.expand(verbose=verbose)
                     self._n_of_generated_nodes += len(expanded_nodes)
                     self._n_of_expanded_nodes += 1
-                    self._frontier.add_list_of_states(expanded_nodes)
+                    self._frontier.add_list(expanded_nodes)
 
             else:
                 # Standard version: no detect duplicates in the frontier.
@@ -103,7 +103,7 @@ class AStarSolver(AbstractSolver):
                     expanded_nodes = cur_state.expand(verbose=verbose)
                     self._n_of_generated_nodes += len(expanded_nodes)
                     self._n_of_expanded_nodes += 1
-                    self._frontier.add_list_of_states(expanded_nodes)
+                    self._frontier.add_list(expanded_nodes)
 
                 # Version 2: duplicate detection in the frontier.
                 """self._closed_list.add(cur_state)
@@ -122,15 +122,15 @@ class AStarSolver(AbstractSolver):
     
                 self._n_of_generated_nodes += len(expanded_nodes_not_in_closed_list)
                 self._n_of_expanded_nodes += 1
-                self._frontier.add_list_of_states(expanded_nodes_not_in_closed_list)"""
+                self._frontier.add_list(expanded_nodes_not_in_closed_list)"""
 
     def initialize_problem(self, problem_instance):
         """
         Initialize the frontier and the heuristic for the given problem.
         """
         self._solver_settings.initialize_heuristic(problem_instance)
-        self._frontier = StatesQueue()
-        self._closed_list = StatesQueue()
+        self._frontier = HeapQueue()
+        self._closed_list = ClosedList()
         self._n_of_generated_nodes = 1
         self._n_of_expanded_nodes = 0
 
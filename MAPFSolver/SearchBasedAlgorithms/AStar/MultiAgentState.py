@@ -188,6 +188,20 @@ class MultiAgentState(State):
         """
         return [state.get_position() for state in self._single_agents_states]
 
+    def positions_key(self):
+        """
+        Return the hash key of the positions of the single agent states. Two multi agent states with the same positions
+        for all the single agent states have the same key.
+        """
+        return tuple(state.positions_key() for state in self._single_agents_states)
+
+    def state_key(self):
+        """
+        Return the hash key of the state. Two multi agent states with the same positions and the same time steps for all
+        the single agent states have the same key.
+        """
+        return tuple(state.state_key() for state in self._single_agents_states)
+
     def equal_position(self, other):
         """
         Return True if the multi agent state and the given multi agent state has the same positions for all the single
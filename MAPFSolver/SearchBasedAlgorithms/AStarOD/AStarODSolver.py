@@ -2,7 +2,8 @@ from MAPFSolver.SearchBasedAlgorithms.AStarOD.ODState import ODState
 from MAPFSolver.Utilities.paths_processing import calculate_soc, calculate_makespan
 from MAPFSolver.Utilities.SingleAgentState import SingleAgentState
 from MAPFSolver.Utilities.AbstractSolver import AbstractSolver
-from MAPFSolver.Utilities.StatesQueue import StatesQueue
+from MAPFSolver.Utilities.ClosedList import ClosedList
+from MAPFSolver.Utilities.HeapQueue import HeapQueue
 from threading import Thread, Event
 import time
 
@@ -65,7 +66,6 @@ class AStarODSolver(AbstractSolver):
         self.initialize_problem(problem_instance)
 
         while not self._frontier.is_empty():
-            self._frontier.sort_by_f_value()
             cur_state = self._frontier.pop()
 
             if self._stop_event.is_set():
@@ -89,7 +89,7 @@ class AStarODSolver(AbstractSolver):
 
                     self._n_of_generated_nodes += len(expanded_nodes)
                     self._n_of_expanded_nodes += 1
-                    self._frontier.add_list_of_states(expanded_nodes)
+                    self._frontier.add_list(expanded_nodes)
 
             else:
                 if not cur_state.is_a_standard_state() or not self._closed_list.contains_state_same_positions(cur_state):
@@ -99,15 +99,15 @@ class AStarODSolver(AbstractSolver):
 
                     self._n_of_generated_nodes += len(expanded_nodes)
                     self._n_of_expanded_nodes += 1
-                    self._frontier.add_list_of_states(expanded_nodes)
+                    self._frontier.add_list(expanded_nodes)
 
     def initialize_problem(self, problem_instance):
         """
         Initialize the frontier and the heuristic for the given problem.
         """
         self._solver_settings.initialize_heuristic(problem_instance)
-        self._frontier = StatesQueue()
-        self._closed_list = StatesQueue()
+        self._frontier = HeapQueue()
+        self._closed_list = ClosedList()
         self._n_of_generated_nodes = 1
         self._n_of_expanded_nodes = 0
 
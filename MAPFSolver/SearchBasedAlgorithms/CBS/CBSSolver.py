@@ -1,6 +1,8 @@
 from MAPFSolver.Utilities.AbstractSolver import AbstractSolver
+from MAPFSolver.SearchBasedAlgorithms.CBS.ConflictGraphHeuristic import ConflictGraphHeuristic
 from MAPFSolver.SearchBasedAlgorithms.CBS.ConstraintTreeNode import ConstraintTreeNode
 from MAPFSolver.SearchBasedAlgorithms.CBS.ConstraintTreeNodesQueue import ConstraintTreeNodesQueue
+from MAPFSolver.SearchBasedAlgorithms.CBS.LowLevelPathsCache import LowLevelPathsCache
 from MAPFSolver.Utilities.paths_processing import calculate_soc, calculate_makespan
 from threading import Thread, Event
 
@@ -24,6 +26,15 @@ class CBSSolver(AbstractSolver):
         self._frontier = None
         self._n_of_generated_nodes = 0
         self._n_of_expanded_nodes = 0
+        self._n_of_conflicts_avoided = 0
+        self._n_of_bypasses = 0
+        self._n_of_infeasible_children = 0
+        self._n_of_positive_replans = 0
+        self._n_of_rectangle_splits = 0
+        self._n_of_corridor_splits = 0
+        self._n_of_target_splits = 0
+        self._high_level_heuristic = None
+        self._paths_cache = None
         self._solution = []
 
         self._stop_event = None
@@ -52,6 +63,25 @@ class CBSSolver(AbstractSolver):
 
         output_infos = self.generate_output_infos(soc, makespan, self._n_of_generated_nodes, self._n_of_expanded_nodes,
                                                   time.time() - start)
+        # Each conflict avoided by the conflict avoidance table would have been resolved splitting a node in two.
+        output_infos["ct_nodes_saved"] = 2 * self._n_of_conflicts_avoided
+        output_infos["bypasses"] = self._n_of_bypasses
+        output_infos["infeasible_children"] = self._n_of_infeasible_children
+        if self._solver_settings.use_disjoint_splitting() or self._solver_settings.use_target_reasoning():
+            output_infos["positive_replans"] = self._n_of_positive_replans
+        if self._solver_settings.use_rectangle_reasoning():
+            output_infos["rectangle_splits"] = self._n_of_rectangle_splits
+        if self._solver_settings.use_corridor_reasoning():
+            output_infos["corridor_splits"] = self._n_of_corridor_splits
+        if self._solver_settings.use_target_reasoning():
+            output_infos["target_splits"] = self._n_of_target_splits
+        if self._high_level_heuristic is not None:
+            output_infos["heuristic_pairs_cache_hits"] = self._high_level_heuristic.get_n_of_cache_hits()
+            output_infos["heuristic_pairs_cache_misses"] = self._high_level_heuristic.get_n_of_cache_misses()
+        if self._paths_cache is not None:
+            output_infos["paths_cache_hits"] = self._paths_cache.get_n_of_hits()
+            output_infos["paths_cache_misses"] = self._paths_cache.get_n_of_misses()
+            output_infos["paths_cache_hit_rate"] = self._paths_cache.get_hit_rate()
         if verbose:
             print("Problem ended: ", output_infos)
 
@@ -73,7 +103,6 @@ class CBSSolver(AbstractSolver):
         self.initialize_problem(problem_instance)
 
         while not self._frontier.is_empty():
-            self._frontier.sort_by_cost()
             cur_state = self._frontier.pop()
 
             if self._stop_event.is_set():
@@ -89,18 +118,65 @@ class CBSSolver(AbstractSolver):
                 self._solution = cur_state.solution()
                 break
 
+            if self._high_level_heuristic is not None and not cur_state.is_h_computed():
+                # The heuristic is computed only for the nodes that reach the top of the queue. If the lower bound of
+                # the node increases, it's put back in the queue.
+                f_value = cur_state.total_cost() + cur_state.h_value()
+                cur_state.set_h_value(max(self._high_level_heuristic.compute_heuristic(cur_state),
+                                          cur_state.h_value()))
+                if cur_state.total_cost() + cur_state.h_value() > f_value:
+                    self._frontier.add(cur_state)
+                    continue
+
             expanded_nodes = cur_state.expand()
-            self._n_of_generated_nodes += len(expanded_nodes)
-            self._n_of_expanded_nodes += 1
+            self.update_statistics(cur_state, expanded_nodes)
             self._frontier.add_list_of_nodes(expanded_nodes)
 
-    def initialize_problem(self, problem_instance):
+    def update_statistics(self, cur_state, expanded_nodes):
         """
-        Initialize the frontier for the given problem.
+        Update the counters of the solver after the expansion of a node.
+        :param cur_state: node expanded.
+        :param expanded_nodes: nodes returned by the expansion.
+        """
+        new_nodes = [node for node in expanded_nodes if node is not cur_state]  # With bypass it can be re-added.
+        self._n_of_generated_nodes += len(new_nodes)
+        self._n_of_expanded_nodes += 1
+        self._n_of_conflicts_avoided += sum(node.n_of_conflicts_avoided() for node in new_nodes)
+        self._n_of_bypasses += cur_state.n_of_bypasses()
+        self._n_of_infeasible_children += cur_state.n_of_infeasible_children()
+        self._n_of_positive_replans += cur_state.n_of_positive_replans()
+        self._n_of_rectangle_splits += cur_state.n_of_rectangle_splits()
+        self._n_of_corridor_splits += cur_state.n_of_corridor_splits()
+        self._n_of_target_splits += cur_state.n_of_target_splits()
+
+    def reset_statistics(self):
+        """
+        Reset the counters of the solver, the root node is counted as generated.
         """
-        self._frontier = ConstraintTreeNodesQueue()
         self._n_of_generated_nodes = 1
         self._n_of_expanded_nodes = 0
+        self._n_of_bypasses = 0
+        self._n_of_infeasible_children = 0
+        self._n_of_positive_replans = 0
+        self._n_of_rectangle_splits = 0
+        self._n_of_corridor_splits = 0
+        self._n_of_target_splits = 0
 
-        starter_state = ConstraintTreeNode(problem_instance, self._solver_settings)
-        self._frontier.add(starter_state)
+    def initialize_problem(self, problem_instance):
+        """
+        Initialize the frontier for the given problem.
+        """
+        self._frontier = ConstraintTreeNodesQueue()
+        self.reset_statistics()
+        if self._solver_settings.get_high_level_heuristic() is not None:
+            self._high_level_heuristic = ConflictGraphHeuristic(self._solver_settings.get_high_level_heuristic(),
+                                                                self._solver_settings)
+
+        self._paths_cache = None
+        if self._solver_settings.get_paths_cache_size() > 0:
+            self._paths_cache = LowLevelPathsCache(self._solver_settings.get_paths_cache_size())
+
+        starter_state = ConstraintTreeNode(problem_instance, self._solver_settings, paths_cache=self._paths_cache)
+        self._n_of_conflicts_avoided = starter_state.n_of_conflicts_avoided()
+        if starter_state.has_solution():
+            self._frontier.add(starter_state)
@@ -0,0 +1,247 @@
+from collections import OrderedDict
+from MAPFSolver.SearchBasedAlgorithms.CBS.ConstraintMDD import ConstraintMDD
+
+# Components of the graph with more agents than this use a matching as lower bound instead of the exact vertex cover.
+MAX_EXACT_COMPONENT_SIZE = 10
+# Maximum increase of the cost of a pair of agents searched for the weights of the weighted dependency graph.
+MAX_PAIR_COST_INCREASE = 4
+# Maximum number of pairs of agents whose results are stored in the cache.
+MAX_PAIRS_CACHE_SIZE = 100000
+
+
+class ConflictGraphHeuristic:
+    """
+    Admissible heuristics for the high level of CBS, computed from the graph of the agents in conflict:
+    - "CG" (conflict graph): two agents are connected if they have a cardinal conflict, i.e. the cost of at least one
+      of them has to increase. The heuristic is the size of the minimum vertex cover of the graph.
+    - "DG" (dependency graph): two agents are connected if they are dependent, i.e. there is no pair of paths with
+      their current costs that has no conflicts. The heuristic is the size of the minimum vertex cover of the graph.
+    - "WDG" (weighted dependency graph): the edges of the dependency graph are weighted with the minimum increase of
+      the sum of costs of the two agents needed to solve their conflicts. The heuristic is the minimum edge-weighted
+      vertex cover of the graph.
+    The edges are computed from the MDDs of the agents. The result of a pair depends only on the constraints and on the
+    path lengths of the two agents, so it is cached by the keys of their MDDs, see ConstraintMDD.get_key(), and reused
+    by all the nodes with the same ones, also in other branches. The keys don't keep the MDDs alive, and when the cache
+    is full the least recently used pair is evicted.
+    The heuristics are defined for the sum of costs, with the makespan the heuristic is always zero.
+    """
+
+    def __init__(self, heuristic_str, solver_settings):
+        """
+        Initialize the heuristic.
+        :param heuristic_str: heuristic to compute. ("CG", "DG" or "WDG")
+        :param solver_settings: settings of the solver.
+        """
+        assert heuristic_str in ["CG", "DG", "WDG"], "Unknown high level heuristic."
+        self._heuristic_str = heuristic_str
+        self._solver_settings = solver_settings
+        self._pairs_cache = OrderedDict()
+        self._n_of_cache_hits = 0
+        self._n_of_cache_misses = 0
+
+    def compute_heuristic(self, node):
+        """
+        Compute the heuristic value of the given constraint tree node.
+        :param node: ConstraintTreeNode with a solution. Its conflicts are read from the conflict index, so the index
+        must contain the paths of the node.
+        :return: the heuristic value.
+        """
+        if self._solver_settings.get_objective_function() != "SOC":
+            return 0
+
+        edges = dict()
+        for agent_i, agent_j in node.get_conflict_index().get_conflicting_pairs():
+            weight = self.get_pair_weight(node.get_mdd(agent_i), node.get_mdd(agent_j))
+            if weight > 0:
+                edges[(agent_i, agent_j)] = weight
+
+        return minimum_vertex_cover(edges)
+
+    def get_pair_weight(self, mdd_i, mdd_j):
+        """
+        Return the weight of the edge between the two agents of the given MDDs, zero if they are not connected.
+        :param mdd_i: MDD of the first agent.
+        :param mdd_j: MDD of the second agent.
+        """
+        key = (mdd_i.get_key(), mdd_j.get_key())
+        weight = self._pairs_cache.get(key)
+        if weight is not None:
+            self._pairs_cache.move_to_end(key)
+            self._n_of_cache_hits += 1
+            return weight
+        self._n_of_cache_misses += 1
+
+        if self._heuristic_str == "CG":
+            weight = 1 if self.has_cardinal_conflict(mdd_i, mdd_j) else 0
+        elif not self.has_joint_solution(mdd_i, mdd_j):
+            weight = 1 if self._heuristic_str == "DG" else self.compute_pair_cost_increase(mdd_i, mdd_j)
+        else:
+            weight = 0
+
+        self._pairs_cache[key] = weight
+        if len(self._pairs_cache) > MAX_PAIRS_CACHE_SIZE:
+            self._pairs_cache.popitem(last=False)
+        return weight
+
+    def has_cardinal_conflict(self, mdd_i, mdd_j):
+        """
+        Return True if all the paths of the two MDDs have a conflict, that is if in a level both the MDDs have only the
+        same position, or if both the agents have only the opposite move between two levels.
+        """
+        for ts in range(max(mdd_i.get_path_length(), mdd_j.get_path_length())):
+            level_i, level_j = mdd_i.get_level(ts), mdd_j.get_level(ts)
+            if len(level_i) != 1 or len(level_j) != 1:
+                continue
+            if level_i == level_j:
+                return True
+            if self._solver_settings.is_edge_conflict() and ts > 0 and \
+                    mdd_i.get_level(ts-1) == level_j and mdd_j.get_level(ts-1) == level_i:
+                return True
+        return False
+
+    def has_joint_solution(self, mdd_i, mdd_j):
+        """
+        Return True if there is a pair of paths, one from each MDD, without conflicts. The pairs of positions are
+        expanded level by level keeping only the ones without conflicts.
+        """
+        if mdd_i.is_empty() or mdd_j.is_empty():
+            return False
+
+        frontier = {(mdd_i.get_agent().get_start(), mdd_j.get_agent().get_start())}
+        for ts in range(1, max(mdd_i.get_path_length(), mdd_j.get_path_length())):
+            next_frontier = set()
+            for pos_i, pos_j in frontier:
+                for next_i in mdd_i.get_successors(pos_i, ts):
+                    for next_j in mdd_j.get_successors(pos_j, ts):
+                        if next_i is not None and next_i == next_j:
+                            continue
+                        if self._solver_settings.is_edge_conflict() and next_i is not None and \
+                                next_j is not None and next_i == pos_j and next_j == pos_i:
+                            continue
+                        next_frontier.add((next_i, next_j))
+            if not next_frontier:
+                return False
+            frontier = next_frontier
+        return True
+
+    def compute_pair_cost_increase(self, mdd_i, mdd_j):
+        """
+        Compute the minimum increase of the sum of costs of the two agents needed to have paths without conflicts,
+        checking the MDDs with longer paths in increasing order of total increase. If the search reaches the maximum
+        increase, the increase returned is still a lower bound. (Only if stay at goal is True, since the longer paths
+        are built waiting in the goal. Otherwise the pair has weight one.)
+        """
+        if not self._solver_settings.stay_at_goal():
+            return 1
+
+        mdds_i, mdds_j = [mdd_i], [mdd_j]
+        for increase in range(1, MAX_PAIR_COST_INCREASE + 1):
+            mdds_i.append(self.build_longer_mdd(mdd_i, increase))
+            mdds_j.append(self.build_longer_mdd(mdd_j, increase))
+            for increase_i in range(increase + 1):
+                if self.has_joint_solution(mdds_i[increase_i], mdds_j[increase - increase_i]):
+                    return increase
+        return MAX_PAIR_COST_INCREASE + 1
+
+    def build_longer_mdd(self, mdd, increase):
+        """
+        Build the MDD of the same agent with the paths longer than the given ones. The paths that reach the goal before
+        wait there.
+        :param mdd: MDD of the agent.
+        :param increase: increase of the length of the paths.
+        """
+        return ConstraintMDD(mdd.get_map(), mdd.get_agent(), mdd.get_path_length() + increase,
+                             mdd.get_constraint_table(), self._solver_settings)
+
+    def get_n_of_cache_hits(self):
+        """
+        Return the number of pairs whose result has been taken from the cache.
+        """
+        return self._n_of_cache_hits
+
+    def get_n_of_cache_misses(self):
+        """
+        Return the number of pairs whose result has been computed.
+        """
+        return self._n_of_cache_misses
+
+
+def minimum_vertex_cover(edges):
+    """
+    Compute the minimum edge-weighted vertex cover of the graph: the minimum sum of non negative integer values assigned
+    to the vertices such that for each edge the sum of the values of its vertices is at least the weight of the edge.
+    With all weights equal to one it is the size of the minimum vertex cover. Each connected component is solved
+    exactly if it is small, otherwise the weight of a maximal matching is used as lower bound.
+    :param edges: dictionary with the weight of each edge (i, j).
+    :return: the value of the cover.
+    """
+    adjacency = dict()
+    for (i, j), weight in edges.items():
+        adjacency.setdefault(i, dict())[j] = weight
+        adjacency.setdefault(j, dict())[i] = weight
+
+    value = 0
+    visited = set()
+    for vertex in adjacency:
+        if vertex in visited:
+            continue
+        component, stack = [], [vertex]
+        visited.add(vertex)
+        while stack:
+            v = stack.pop()
+            component.append(v)
+            for u in adjacency[v]:
+                if u not in visited:
+                    visited.add(u)
+                    stack.append(u)
+
+        if len(component) <= MAX_EXACT_COMPONENT_SIZE:
+            value += exact_vertex_cover(sorted(component), adjacency)
+        else:
+            component = set(component)
+            value += matching_lower_bound({edge: w for edge, w in edges.items() if edge[0] in component})
+    return value
+
+
+def exact_vertex_cover(vertices, adjacency):
+    """
+    Compute the exact minimum edge-weighted vertex cover of a connected component with a branch and bound: the values
+    are assigned to the vertices in order, and each vertex takes at least the value needed by the edges toward the
+    vertices already assigned.
+    :param vertices: vertices of the component.
+    :param adjacency: for each vertex the dictionary with the weights of his edges.
+    """
+    best = [sum(max(adjacency[v].values()) for v in vertices)]
+    values = dict()
+
+    def assign(index, partial_value):
+        if partial_value >= best[0]:
+            return
+        if index == len(vertices):
+            best[0] = partial_value
+            return
+        v = vertices[index]
+        minimum = max([adjacency[v][u] - values[u] for u in adjacency[v] if u in values] + [0])
+        maximum = max(adjacency[v].values())
+        for value in range(minimum, max(minimum, maximum) + 1):
+            values[v] = value
+            assign(index + 1, partial_value + value)
+        del values[v]
+
+    assign(0, 0)
+    return best[0]
+
+
+def matching_lower_bound(edges):
+    """
+    Return the weight of a maximal matching built greedily by decreasing weight. Since the edges of a matching have no
+    vertices in common, each of them must be covered on its own, so it is a lower bound of the vertex cover.
+    :param edges: dictionary with the weight of each edge (i, j).
+    """
+    matched = set()
+    value = 0
+    for (i, j), weight in sorted(edges.items(), key=lambda x: -x[1]):
+        if i not in matched and j not in matched:
+            matched.update((i, j))
+            value += weight
+    return value
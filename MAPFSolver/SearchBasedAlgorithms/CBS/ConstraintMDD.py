@@ -0,0 +1,159 @@
+from MAPFSolver.Heuristics.DistanceTablesCache import get_distance_tables_cache
+
+
+class ConstraintMDD:
+    """
+    Multi-value decision diagram (MDD) of a single agent under the constraints of a constraint tree node. It contains
+    all the paths of the agent with the same length of his current path that respect his constraints, so all his
+    optimal paths. It is stored by levels: the level t is the set of positions the agent can occupy at the time step t
+    following one of these paths.
+    It is used to classify the conflicts: if the level of the conflict contains only the position of the conflict, every
+    optimal path of the agent passes there and a constraint on it increases the cost of the agent.
+    Differently from the MDD used by ICTS, the constraints are taken into account and the nodes are pruned with the
+    distance table of the goal.
+    """
+
+    def __init__(self, problem_map, agent, path_length, constraint_table, solver_settings):
+        """
+        Initialize the MDD.
+        :param problem_map: map of the problem.
+        :param agent: agent involved.
+        :param path_length: length of the current path of the agent.
+        :param constraint_table: ConstraintTable with the constraints of the agent.
+        :param solver_settings: settings of the solver.
+        """
+        self._problem_map = problem_map
+        self._agent = agent
+        self._path_length = path_length
+        self._constraint_table = constraint_table
+        self._solver_settings = solver_settings
+        self._levels = []
+        self._key = None
+
+        self.build_mdd()
+
+    def build_mdd(self):
+        """
+        Build the levels of the MDD. The positions reachable from the start respecting the constraints are computed
+        going forward, keeping only the ones from which the goal can be reached in time. Then, going backward from the
+        goal, the positions that can't reach the next level are removed.
+        """
+        start, goal = self._agent.get_start(), self._agent.get_goal()
+        distance_table = get_distance_tables_cache().get_table(self._problem_map, goal)
+        goal_occupation_time = 1 if self._solver_settings.stay_at_goal() else \
+            self._solver_settings.get_goal_occupation_time()
+        arrival_time_step = self._path_length - goal_occupation_time
+
+        self._levels = [{start}]
+        for ts in range(1, self._path_length):
+            level = set()
+            for pos in self._levels[ts-1]:
+                for next_pos in self._problem_map.moves(pos):
+                    if next_pos in level:
+                        continue
+                    if ts <= arrival_time_step:
+                        distance = distance_table.item(next_pos[1], next_pos[0])
+                        if distance < 0 or distance > arrival_time_step - ts:
+                            continue
+                    elif next_pos != goal:
+                        continue
+                    if self._constraint_table.is_vertex_constrained(next_pos, ts) or \
+                            self._constraint_table.is_edge_constrained(pos, next_pos, ts):
+                        continue
+                    level.add(next_pos)
+            self._levels.append(level)
+
+        self._levels[-1] &= {goal}
+        if self._solver_settings.stay_at_goal() and \
+                self._constraint_table.get_latest_constraint_time(goal) >= self._path_length - 1:
+            self._levels[-1] = set()  # The agent can't stop in his goal at the end of the paths.
+
+        for ts in range(self._path_length - 2, -1, -1):
+            next_level = self._levels[ts+1]
+            self._levels[ts] = {pos for pos in self._levels[ts] for next_pos in self._problem_map.moves(pos)
+                                if next_pos in next_level and
+                                not self._constraint_table.is_edge_constrained(pos, next_pos, ts+1)}
+
+    def get_level(self, time_step):
+        """
+        Return the set of positions of the MDD at the given time step. After the end of the paths the agent is in his
+        goal if stay at goal is True, otherwise he is disappeared.
+        :param time_step: time step of the level.
+        """
+        if time_step < len(self._levels):
+            return self._levels[time_step]
+        if self._solver_settings.stay_at_goal():
+            return {self._agent.get_goal()}
+        return set()
+
+    def get_successors(self, position, time_step):
+        """
+        Return the positions of the MDD at the given time step reachable from the given position at the previous one.
+        After the end of the paths the agent waits in his goal if stay at goal is True, otherwise he is disappeared
+        and None is returned as his position.
+        :param position: (x, y) position at time_step-1, None if the agent is disappeared.
+        :param time_step: time step of the successors.
+        """
+        if time_step >= len(self._levels):
+            return [position] if self._solver_settings.stay_at_goal() else [None]
+        level = self._levels[time_step]
+        return [next_pos for next_pos in self._problem_map.moves(position) if next_pos in level and
+                not self._constraint_table.is_edge_constrained(position, next_pos, time_step)]
+
+    def is_empty(self):
+        """
+        Return True if there are no paths of the given length that respect the constraints.
+        """
+        return not self._levels[0]
+
+    def is_cardinal_vertex(self, position, time_step):
+        """
+        Return True if all the paths of the MDD pass through the given position at the given time step, so that a
+        vertex constraint on it increases the cost of the agent.
+        :param position: (x, y) position.
+        :param time_step: time step.
+        """
+        return self.get_level(time_step) == {position}
+
+    def is_cardinal_edge(self, initial_position, final_position, time_step):
+        """
+        Return True if all the paths of the MDD move from the initial position to the final position arriving at the
+        given time step, so that an edge constraint on it increases the cost of the agent.
+        :param initial_position: (x, y) position at time_step-1.
+        :param final_position: (x, y) position at time_step.
+        :param time_step: time step in which the agent arrives in the final position.
+        """
+        return self.get_level(time_step-1) == {initial_position} and self.get_level(time_step) == {final_position}
+
+    def get_path_length(self):
+        """
+        Return the length of the paths of the MDD.
+        """
+        return self._path_length
+
+    def get_map(self):
+        """
+        Return the map of the MDD.
+        """
+        return self._problem_map
+
+    def get_agent(self):
+        """
+        Return the agent of the MDD.
+        """
+        return self._agent
+
+    def get_constraint_table(self):
+        """
+        Return the constraint table used to build the MDD.
+        """
+        return self._constraint_table
+
+    def get_key(self):
+        """
+        Return a hashable key of the MDD: the id of the agent, the length of the paths and the key of the constraint
+        table. Two MDDs with the same key contain the same paths. It is computed the first time it is asked.
+        """
+        if self._key is None:
+            self._key = (self._agent.get_id(), self._path_length, self._constraint_table.get_key())
+        return self._key
@@ -1,5 +1,10 @@
+from MAPFSolver.SearchBasedAlgorithms.CBS.ConstraintMDD import ConstraintMDD
+from MAPFSolver.SearchBasedAlgorithms.CBS.CorridorReasoning import CorridorReasoning
 from MAPFSolver.Utilities.AStar import AStar
-from MAPFSolver.Utilities.paths_processing import calculate_soc, calculate_makespan, check_conflicts_with_type
+from MAPFSolver.Utilities.ConflictIndex import ConflictIndex
+from MAPFSolver.Utilities.ConstraintTable import ConstraintTable
+from MAPFSolver.Utilities.SIPP import SIPP
+from MAPFSolver.Utilities.paths_processing import calculate_soc, calculate_makespan
 
 
 class ConstraintTreeNode:
@@ -7,148 +12,534 @@ class ConstraintTreeNode:
     This class represents a single node of the constraint tree.
     """
 
-    def __init__(self, problem_instance, solver_settings, parent=None, vertex_constraints=None, edge_constraints=None,
-                 agent_to_recompute=None):
+    def __init__(self, problem_instance, solver_settings, parent=None, constraint_type=None, constraint=None,
+                 positive=False, paths_cache=None):
         """
-        Initialize the node.
+        Initialize the node. The constraints are stored as a chain linked to the parent: each node keeps only the
+        constraint added with respect to his parent, and the constraint table of an agent is built only when needed,
+        extending the one of the parent, see get_constraint_table(). In the same way a child node keeps only the paths recomputed because of the new constraint,
+        while the paths of the other agents are shared with the parent.
         :param problem_instance: instance of the problem.
         :param solver_settings: settings of the solver.
         :param parent: parent node.
-        :param vertex_constraints: list of vertex constraints. They represents the constraints resulting from vertex
-        conflicts. Their form is the following: (agent_id, position, time_step)
-        :param edge_constraints: list of edge constraints. They represents the constraints resulting from edge
-        conflicts. Their form is the following: (agent_id, initial_position, final_position, final_time_step)
-        :param agent_to_recompute: is used to speed up the process and avoid to recompute each time the path for each
-        agent. if it's not the root and this node change from his predecessor only for a constraint, this represent the
-        agent involved in that constraint. In this way we avoid to recompute all the other paths, but we recompute only
-        the path of the agent involved.
+        :param constraint_type: type of the new constraint, 'vertex_conflict', 'edge_conflict', 'barrier', 'range' or
+        'target'.
+        :param constraint: new constraint of the node. It's (agent_id, position, time_step) for a vertex constraint,
+        (agent_id, initial_position, final_position, final_time_step) for an edge constraint, (agent_id,
+        initial_position, final_position, final_time_step) for a barrier, see get_rectangle_barriers(), (agent_id,
+        position, first_time_step, last_time_step) for a range constraint, see CorridorReasoning, and (agent_id, goal,
+        time_step) for a length constraint, see get_target_constraint(). Only the path of the agent involved is
+        recomputed, the others are the same of the parent.
+        :param positive: if True the constraint is positive, the agent is forced to be in the position (or to do the
+        move) at that time step, or for a length constraint to stay in his goal from that time step on. It implies a
+        negative constraint for all the other agents, so the paths of the agents that violate it are recomputed.
+        :param paths_cache: LowLevelPathsCache shared by the nodes of the tree, None if the paths are not cached. The
+        children use the one of the parent.
         """
         self._problem_instance = problem_instance
         self._solver_settings = solver_settings
         self._parent = parent
 
-        self._vertex_constraints = set() if vertex_constraints is None else vertex_constraints
-        self._edge_constraints = set() if edge_constraints is None else edge_constraints
+        self._constraint_type = constraint_type
+        self._constraint = constraint
+        self._positive = positive
 
-        if agent_to_recompute is None:
+        # The conflict index is shared by all the nodes of the tree. Each time a node is checked the index is updated
+        # only with the paths that are different from the ones of the last node checked.
+        if parent is None:
+            self._conflict_index = ConflictIndex(self._solver_settings.stay_at_goal(),
+                                                 self._solver_settings.is_edge_conflict())
+        else:
+            self._conflict_index = parent._conflict_index
+
+        self._paths_cache = parent._paths_cache if parent is not None else paths_cache
+
+        if parent is not None:
+            self._corridor_reasoning = parent._corridor_reasoning
+        elif self._solver_settings.use_corridor_reasoning():
+            self._corridor_reasoning = CorridorReasoning(self._problem_instance, self._solver_settings)
+        else:
+            self._corridor_reasoning = None
+
+        self._n_of_conflicts_avoided = 0
+        self._n_of_bypasses = 0
+        self._n_of_infeasible_children = 0
+        self._n_of_positive_replans = 0
+        self._n_of_rectangle_splits = 0
+        self._n_of_corridor_splits = 0
+        self._n_of_target_splits = 0
+        self._mdds = dict()  # MDDs of the agents constrained in this node, built when needed.
+        self._constraint_tables = dict()  # Constraint tables of the agents, built when needed and never modified.
+
+        if parent is None:
+            self._paths = dict()
             self._solution = self.low_level_search()
         else:
-            self._solution = parent.solution().copy()
-            path = self.single_agent_low_level_search(self._problem_instance.get_agents()[agent_to_recompute])
-            self._solution[agent_to_recompute] = path
-            if not path:
-                self._solution = None
+            self._conflict_index.set_paths(parent.solution())
+            self._paths = self.replan_agents(self.get_agents_to_recompute())
+            self._solution = None  # Computed only when needed, see solution().
 
         self._total_cost = self.calculate_cost()
 
+        # Until the high level heuristic of the node is computed, the one of the parent is used: the cost of a child
+        # can't be lower than the lower bound of the cost of the parent.
+        self._h_value = 0
+        self._h_computed = False
+        if parent is not None and self._total_cost is not None:
+            self._h_value = max(parent.total_cost() + parent.h_value() - self._total_cost, 0)
+
         self.conflict = None
 
     def low_level_search(self):
         """
         Low level search. For every agent it searches a possible valid path using A* which doesn't violate the set of
-        constraints.
+        constraints. Each path is added to the conflict index, so the following agents avoid the conflicts with it.
         """
         solution = []
-        for agent in self._problem_instance.get_agents():
+        for i, agent in enumerate(self._problem_instance.get_agents()):
             path = self.single_agent_low_level_search(agent)
             if not path:
                 solution = None
                 break
             solution.append(path)
+            self._conflict_index.update_path(i, path)
         return solution
 
+    def get_agents_to_recompute(self):
+        """
+        Return the ids of the agents whose path has to be recomputed because of the new constraint. For a negative
+        constraint it's the agent constrained, for a positive one the other agents that violate the negative constraints
+        implied by it. The conflict index must contain the paths of the parent.
+        """
+        agent_id = self._constraint[0]
+        if not self._positive:
+            return [agent_id]
+
+        if self._constraint_type == 'vertex_conflict':
+            agent, pos, ts = self._constraint
+            agents = self._conflict_index.get_agents_in_position(pos, ts)
+        elif self._constraint_type == 'target':
+            agent, pos, ts = self._constraint
+            agents = self._conflict_index.get_agents_in_position_from(pos, ts)
+        else:
+            agent, pos_i, pos_f, ts = self._constraint
+            agents = self._conflict_index.get_agents_in_position(pos_i, ts-1) | \
+                self._conflict_index.get_agents_in_position(pos_f, ts) | \
+                self._conflict_index.get_agents_in_move(pos_f, pos_i, ts)
+        return sorted(agents - {agent_id})
+
+    def replan_agents(self, agents):
+        """
+        Recompute the paths of the given agents. Each new path is added to the conflict index, so the following agents
+        avoid the conflicts with it.
+        :param agents: ids of the agents.
+        :return: the dictionary with the new path of each agent, None if a path doesn't exist.
+        """
+        paths = dict()
+        for agent_id in agents:
+            path = self.single_agent_low_level_search(self._problem_instance.get_agents()[agent_id])
+            if not path:
+                return None
+            paths[agent_id] = path
+            self._conflict_index.update_path(agent_id, path)
+        return paths
+
     def single_agent_low_level_search(self, agent):
         """
         Low level search for a single agent. It searches a possible valid path using A* which doesn't violate the set
-        of constraints.
+        of constraints. If the conflict avoidance table is used, the conflict index must contain the paths of the other
+        agents: between the optimal paths the one with fewer conflicts with them is returned.
+        If SIPP is the low level, the search is done over the safe intervals and the conflict avoidance table is not used.
+        If the paths are cached, the path computed for the same agent under the same constraints is reused.
         """
-        agent_vertex_constraints = []
-        for vertex_constraint in self._vertex_constraints:
-            agent_id, pos, ts = vertex_constraint
-            if agent_id == agent.get_id():
-                agent_vertex_constraints.append((pos, ts))
+        constraint_table = self.get_constraint_table(agent.get_id())
+
+        if self._paths_cache is None:
+            return self.find_path(agent, constraint_table)
+        constraints_key = constraint_table.get_key()
+        path = self._paths_cache.get(agent.get_id(), constraints_key)
+        if path is None:
+            path = self.find_path(agent, constraint_table)
+            self._paths_cache.add(agent.get_id(), constraints_key, path)
+        return path
 
-        agent_edge_constraints = []
-        for edge_constraint in self._edge_constraints:
-            agent_id, pos_i, pos_f, ts = edge_constraint
-            if agent_id == agent.get_id():
-                agent_edge_constraints.append((pos_i, pos_f, ts))
+    def find_path(self, agent, constraint_table):
+        """
+        Compute the path of the agent that respects the given constraints with the low level search.
+        :param agent: agent involved.
+        :param constraint_table: ConstraintTable with the constraints of the agent.
+        :return: the path, an empty list if it doesn't exist.
+        """
+        if self._solver_settings.get_low_level() == "SIPP":
+            solver = SIPP(self._solver_settings)
+            return solver.find_path_with_constraints(self._problem_instance.get_map(), agent.get_start(),
+                                                     agent.get_goal(), constraint_table)
 
         solver = AStar(self._solver_settings)
 
-        path = solver.find_path_with_constraints(self._problem_instance.get_map(), agent.get_start(),
-                                                 agent.get_goal(), agent_vertex_constraints, agent_edge_constraints)
+        if self._solver_settings.use_conflict_avoidance_table():
+            path = solver.find_path_with_constraints(self._problem_instance.get_map(), agent.get_start(),
+                                                     agent.get_goal(), constraint_table,
+                                                     conflict_index=self._conflict_index, agent_id=agent.get_id())
+            self._n_of_conflicts_avoided += solver.get_n_of_conflicts_avoided()
+        else:
+            path = solver.find_path_with_constraints(self._problem_instance.get_map(), agent.get_start(),
+                                                     agent.get_goal(), constraint_table)
         return path
 
     def expand(self):
         """
         Expand the current state. It generates the two child nodes, once with the conflict constraint added to the first
         agent and the other with the conflict constraint added to the second agent involved in the conflict.
+        With the symmetry reasoning, the target, corridor and rectangle conflicts are split with the constraints of
+        their kind, see get_children_constraints().
+        With the disjoint splitting, the second child has instead the positive constraint for the first agent, so that
+        the solutions of the two subtrees are disjoint.
+        If the bypass is active and a child has the same cost and fewer conflicts, its path is adopted by this node
+        instead of branching, and the node is split again on one of the remaining conflicts. If no conflicts remain,
+        the node itself is returned to be put back in the queue.
         :return: the two possible next states.
         """
-        if self._solution is None:
+        if not self.has_solution():
             # it means that in that state at least a path it's impossible
             # and so it's useless create new states children of that since they will all have
             # the same constraints that make some path impossible to be computed.
             return []
 
-        if self.conflict is None:
-            conflict_type, constraints = check_conflicts_with_type(self._solution, self._solver_settings.stay_at_goal(),
-                                                                   self._solver_settings.is_edge_conflict())
-        else:
-            conflict_type, constraints = self.conflict
+        self._n_of_bypasses = 0
+        self._n_of_infeasible_children = 0
+        self._n_of_positive_replans = 0
+        self._n_of_rectangle_splits = 0
+        self._n_of_corridor_splits = 0
+        self._n_of_target_splits = 0
+        while True:
+            self._conflict_index.set_paths(self.solution())
+            if self._solver_settings.prioritize_conflicts():
+                conflict = self.choose_conflict()
+            elif self.conflict is None:
+                conflict = self._conflict_index.get_first_conflict_with_type()
+            else:
+                conflict = self.conflict
+            self.conflict = None
+
+            if conflict is None:
+                return [self]
+            children = []
+            for constraint_type, constraint, positive in self.get_children_constraints(conflict):
+                node = type(self)(self._problem_instance, self._solver_settings, parent=self,
+                                  constraint_type=constraint_type, constraint=constraint, positive=positive)
+                if not node.has_solution():
+                    self._n_of_infeasible_children += 1
+                    continue
+                if positive:
+                    self._n_of_positive_replans += len(node._paths)
+                children.append(node)
+
+            if not self._solver_settings.use_bypass() or not self.bypass(children):
+                return children
+
+    def get_children_constraints(self, conflict):
+        """
+        Return the constraints of the two children that split the given conflict. If the symmetry reasoning is active
+        and the conflict is a target, corridor or rectangle conflict, it's split with the constraints of that kind.
+        Otherwise with the disjoint splitting the first agent gets a negative and a positive constraint, and by default
+        each agent gets the negative constraint.
+        :param conflict: a couple (type of constraint, new children constraints).
+        :return: a list of (constraint_type, constraint, positive) for each child.
+        """
+        conflict_type, constraints = conflict
+
+        if self._solver_settings.use_target_reasoning():
+            target_constraint = self.get_target_constraint(conflict)
+            if target_constraint is not None:
+                self._n_of_target_splits += 1
+                return [('target', target_constraint, False), ('target', target_constraint, True)]
 
-        node_a, node_b = None, None
+        if self._corridor_reasoning is not None:
+            range_constraints = self._corridor_reasoning.get_corridor_constraints(conflict, self.solution())
+            if range_constraints is not None:
+                self._n_of_corridor_splits += 1
+                return [('range', constraint, False) for constraint in range_constraints]
 
+        if self._solver_settings.use_rectangle_reasoning():
+            rectangle = self.get_rectangle_barriers(conflict)
+            if rectangle is not None:
+                self._n_of_rectangle_splits += 1
+                return [('barrier', constraint, False) for constraint in rectangle[1]]
+
+        if self._solver_settings.use_disjoint_splitting():
+            return [(conflict_type, constraints[0], False), (conflict_type, constraints[0], True)]
+        return [(conflict_type, constraint, False) for constraint in constraints]
+
+    def get_target_constraint(self, conflict):
+        """
+        Check if the given conflict is a target conflict, i.e. a vertex conflict in the goal of an agent that has already
+        reached it and stays there, and return the length constraint to split it. In a child the agent can't stop in his
+        goal at or before the time step of the conflict, in the other one it must stay in his goal from that time step
+        on, and so no other agent can pass through it after. (Only if stay at goal is True)
+        :param conflict: a couple (type of constraint, new children constraints).
+        :return: the length constraint (agent_id, goal, time_step), None if it's not a target conflict.
+        """
+        conflict_type, constraints = conflict
+        if conflict_type != 'vertex_conflict' or not self._solver_settings.stay_at_goal():
+            return None
+        for agent_id, pos, ts in constraints:
+            path = self.solution()[agent_id]
+            if self._problem_instance.get_agents()[agent_id].get_goal() == pos and len(path) - 1 <= ts:
+                return agent_id, pos, ts
+        return None
+
+    def bypass(self, children):
+        """
+        Look for a child with a single path recomputed, the same cost of this node, the path with the same length and
+        fewer conflicts. If it exists, its path is adopted by this node without adding the constraint.
+        :param children: the child nodes generated splitting a conflict of this node.
+        :return: True if a path has been adopted.
+        """
+        n_of_conflicts = self._conflict_index.get_n_of_conflicts()
+        for child in children:
+            if len(child._paths) != 1:
+                continue
+            (agent, path), = child._paths.items()
+            if child.total_cost() != self._total_cost or len(path) != len(self.solution()[agent]):
+                continue
+            self._conflict_index.set_paths(child.solution())
+            if self._conflict_index.get_n_of_conflicts() < n_of_conflicts:
+                self._solution = child.solution()
+                if agent in self._paths:
+                    self._paths[agent] = path
+                self._n_of_bypasses += 1
+                return True
+        return False
+
+    def choose_conflict(self):
+        """
+        Choose the conflict to split. The conflicts are classified using the MDDs of the agents involved: a conflict is
+        cardinal if the constraint increases the cost of both the agents, semi-cardinal if it increases the cost of only
+        one of them and non-cardinal otherwise. The first cardinal conflict is returned, if there isn't any the first
+        semi-cardinal one and otherwise the first conflict. The conflict index must contain the paths of this node.
+        With the rectangle reasoning, a rectangle conflict is classified by the agents whose cost is increased by their
+        barriers.
+        :return: a couple (type of constraint, new children constraints).
+        """
+        best_conflict, best_n_of_cardinal_agents = None, -1
+        for conflict in self._conflict_index.get_all_conflicts_with_type():
+            conflict_type, constraints = conflict
+            n_of_cardinal_agents = sum(1 for constraint in constraints if self.is_cardinal(conflict_type, constraint))
+            if n_of_cardinal_agents < 2 and self._solver_settings.use_rectangle_reasoning():
+                rectangle = self.get_rectangle_barriers(conflict)
+                if rectangle is not None:
+                    n_of_cardinal_agents = max(n_of_cardinal_agents, rectangle[0])
+            if n_of_cardinal_agents == 2:
+                return conflict
+            if n_of_cardinal_agents > best_n_of_cardinal_agents:
+                best_conflict, best_n_of_cardinal_agents = conflict, n_of_cardinal_agents
+        return best_conflict
+
+    def get_rectangle_barriers(self, conflict):
+        """
+        Check if the given conflict is a rectangle conflict and return the barriers to split it. Two agents have a
+        rectangle conflict if they move toward their goals along Manhattan-optimal paths in the same directions and they
+        meet inside the rectangle between the corner Rs, the nearest to the starts, and the corner Rg, the nearest to the
+        goals. One agent enters the rectangle from the side of Rs parallel to the y axis, the other one from the side
+        parallel to the x axis, and any two paths crossing the whole rectangle on time collide. So the first agent must
+        not reach the side of Rg parallel to the x axis at the Manhattan-optimal time steps, or the second agent must
+        not reach the side of Rg parallel to the y axis: these two barriers split the conflict without losing solutions,
+        while the vertex constraints would require to try all the equivalent paths inside the rectangle.
+        :param conflict: a couple (type of constraint, new children constraints).
+        :return: None if it's not a rectangle conflict useful to split, otherwise a couple with the number of agents
+        whose cost is increased by the barrier (1 or 2) and the two barrier constraints (agent_id, initial_position,
+        final_position, final_time_step). A barrier forbids all the positions of the segment from the initial to the
+        final position, each at the time step in which it is reached following a Manhattan-optimal path.
+        """
+        conflict_type, constraints = conflict
+        if conflict_type != 'vertex_conflict':
+            return None
+        (agent_a, pos, ts), (agent_b, pos, ts) = constraints
+        agents = [self._problem_instance.get_agents()[agent_a], self._problem_instance.get_agents()[agent_b]]
+        starts = [agent.get_start() for agent in agents]
+        goals = [agent.get_goal() for agent in agents]
+
+        for agent, start, goal in zip(agents, starts, goals):
+            if manhattan_distance(start, pos) != ts:
+                return None
+            path_cost = calculate_soc([self.solution()[agent.get_id()]], self._solver_settings.stay_at_goal(),
+                                      self._solver_settings.get_goal_occupation_time())
+            if path_cost != manhattan_distance(start, goal):
+                return None
+
+        rs, rg = [], []
+        for axis in range(2):
+            directions = {(goal[axis] > start[axis]) - (goal[axis] < start[axis]) for start, goal in zip(starts, goals)}
+            directions.discard(0)
+            if len(directions) != 1:
+                return None  # Opposite directions or no movement along the axis.
+            direction = directions.pop()
+            rs.append(direction * max(direction * start[axis] for start in starts))
+            rg.append(direction * min(direction * goal[axis] for goal in goals))
+            if not direction * rs[axis] <= direction * pos[axis] <= direction * rg[axis]:
+                return None
+        rs, rg = tuple(rs), tuple(rg)
+
+        # The agent that starts on the line x = Rs.x enters the rectangle from below and must not cross the side y = Rg.y.
+        vertical = 0 if starts[0][0] == rs[0] else 1
+        horizontal = 1 - vertical
+        if starts[vertical][0] != rs[0] or starts[horizontal][1] != rs[1]:
+            return None
+        rs_time_step = manhattan_distance(starts[0], rs)
+        rg_time_step = rs_time_step + manhattan_distance(rs, rg)
+        barriers = [None, None]
+        barriers[vertical] = (agents[vertical].get_id(), (rs[0], rg[1]), rg, rg_time_step)
+        barriers[horizontal] = (agents[horizontal].get_id(), (rg[0], rs[1]), rg, rg_time_step)
+
+        # The barrier increases the cost of the agent if his goal is on the line of the other side of Rg.
+        n_of_cardinal_agents = (goals[vertical][0] == rg[0]) + (goals[horizontal][1] == rg[1])
+        if n_of_cardinal_agents == 0:
+            return None
+        # Both the current paths must violate their barrier, otherwise a child would be the same of this node.
+        for agent_id, pos_i, pos_f, final_ts in barriers:
+            path = self.solution()[agent_id]
+            if self._solver_settings.stay_at_goal():
+                path = path + [path[-1]] * (final_ts + 1 - len(path))
+            if not any(final_ts - manhattan_distance(pos, pos_f) < len(path) and
+                       path[final_ts - manhattan_distance(pos, pos_f)] == pos
+                       for pos in barrier_positions(pos_i, pos_f)):
+                return None
+        return n_of_cardinal_agents, barriers
+
+    def is_cardinal(self, conflict_type, constraint):
+        """
+        Return True if the given constraint increases the cost of the agent involved, that is if all his optimal paths
+        violate it.
+        :param conflict_type: 'vertex_conflict' or 'edge_conflict'.
+        :param constraint: (agent_id, position, time_step) for a vertex conflict or (agent_id, initial_position,
+        final_position, final_time_step) for an edge conflict.
+        """
+        mdd = self.get_mdd(constraint[0])
         if conflict_type == 'vertex_conflict':
-            agent, pos, ts = constraints[0]
-            constraints_a = self._vertex_constraints.copy()
-            constraints_a.add(constraints[0])
-            node_a = ConstraintTreeNode(self._problem_instance, self._solver_settings, parent=self,
-                                        vertex_constraints=constraints_a,
-                                        edge_constraints=self._edge_constraints.copy(), agent_to_recompute=agent)
-
-            agent, pos, ts = constraints[1]
-            constraints_b = self._vertex_constraints.copy()
-            constraints_b.add(constraints[1])
-            node_b = ConstraintTreeNode(self._problem_instance, self._solver_settings, parent=self,
-                                        vertex_constraints=constraints_b,
-                                        edge_constraints=self._edge_constraints.copy(), agent_to_recompute=agent)
-
-        if conflict_type == 'edge_conflict':
-            agent, pos_i, pos_f, ts = constraints[0]
-            constraints_a = self._edge_constraints.copy()
-            constraints_a.add(constraints[0])
-            node_a = ConstraintTreeNode(self._problem_instance, self._solver_settings, parent=self,
-                                        vertex_constraints=self._vertex_constraints.copy(),
-                                        edge_constraints=constraints_a, agent_to_recompute=agent)
-
-            agent, pos_i, pos_f, ts = constraints[1]
-            constraints_b = self._edge_constraints.copy()
-            constraints_b.add(constraints[1])
-            node_b = ConstraintTreeNode(self._problem_instance, self._solver_settings, parent=self,
-                                        vertex_constraints=self._vertex_constraints.copy(),
-                                        edge_constraints=constraints_b, agent_to_recompute=agent)
-
-        if node_a._solution is not None and node_b._solution is not None:
-            return [node_a, node_b]
-        elif node_a._solution is not None:
-            return [node_a]
-        elif node_b._solution is not None:
-            return [node_b]
-        else:
-            return []
+            agent, pos, ts = constraint
+            return mdd.is_cardinal_vertex(pos, ts)
+        agent, pos_i, pos_f, ts = constraint
+        return mdd.is_cardinal_edge(pos_i, pos_f, ts)
+
+    def get_mdd(self, agent_id):
+        """
+        Return the MDD of the given agent. It is built only once in the nearest node that adds constraints to that
+        agent, and it is shared by all the descendants that don't add others. A negative constraint makes the path of
+        the agent recomputed, while a positive constraint adds constraints to all the agents, also to the ones whose
+        path is not recomputed.
+        :param agent_id: id of the agent.
+        :return: a ConstraintMDD instance.
+        """
+        node = self
+        while node._parent is not None and agent_id not in node._paths and not node._positive:
+            node = node._parent
+
+        mdd = node._mdds.get(agent_id)
+        if mdd is None:
+            mdd = ConstraintMDD(self._problem_instance.get_map(), self._problem_instance.get_agents()[agent_id],
+                                len(node.solution()[agent_id]), node.get_constraint_table(agent_id),
+                                self._solver_settings)
+            node._mdds[agent_id] = mdd
+        return mdd
+
+    def get_constraint_table(self, agent_id):
+        """
+        Return the table with all the constraints of the given agent. The positive constraints of the other agents are
+        added as the negative constraints they imply. The tables are built incrementally and kept by the nodes: starting
+        from the nearest ancestor that has the table of the agent, each node in between shares the table of his parent
+        if his constraint doesn't involve the agent, otherwise he extends a copy of it with his constraint. So the table
+        of a child costs a single copy, regardless of the depth of the node.
+        :param agent_id: id of the agent.
+        :return: a ConstraintTable instance. It must not be modified, since it's shared with the other nodes.
+        """
+        nodes = []
+        node = self
+        while agent_id not in node._constraint_tables and node._parent is not None:
+            nodes.append(node)
+            node = node._parent
+        constraint_table = node._constraint_tables.get(agent_id)
+        if constraint_table is None:
+            constraint_table = ConstraintTable()
+            node._constraint_tables[agent_id] = constraint_table
+
+        for node in reversed(nodes):
+            if node._positive or node._constraint[0] == agent_id:
+                constraint_table = constraint_table.copy()
+                node.add_constraint_to_table(constraint_table, agent_id)
+            node._constraint_tables[agent_id] = constraint_table
+        return constraint_table
+
+    def add_constraint_to_table(self, constraint_table, agent_id):
+        """
+        Add to the table of the given agent the constraints implied by the constraint of this node.
+        :param constraint_table: ConstraintTable of the agent, with the constraints of the ancestors of this node.
+        :param agent_id: id of the agent.
+        """
+        own_constraint = self._constraint[0] == agent_id
+        if self._constraint_type == 'vertex_conflict':
+            agent, pos, ts = self._constraint
+            if self._positive and own_constraint:
+                constraint_table.add_positive_constraint(pos, ts)
+            elif self._positive or own_constraint:
+                constraint_table.add_vertex_constraint(pos, ts)
+        elif self._constraint_type == 'edge_conflict':
+            agent, pos_i, pos_f, ts = self._constraint
+            if self._positive and own_constraint:
+                constraint_table.add_positive_constraint(pos_i, ts-1)
+                constraint_table.add_positive_constraint(pos_f, ts)
+            elif self._positive:
+                constraint_table.add_vertex_constraint(pos_i, ts-1)
+                constraint_table.add_vertex_constraint(pos_f, ts)
+                constraint_table.add_edge_constraint(pos_f, pos_i, ts)
+            elif own_constraint:
+                constraint_table.add_edge_constraint(pos_i, pos_f, ts)
+        elif self._constraint_type == 'barrier' and own_constraint:
+            agent, pos_i, pos_f, ts = self._constraint
+            for pos in barrier_positions(pos_i, pos_f):
+                constraint_table.add_vertex_constraint(pos, ts - manhattan_distance(pos, pos_f))
+        elif self._constraint_type == 'range' and own_constraint:
+            agent, pos, first_ts, last_ts = self._constraint
+            for ts in range(first_ts, last_ts + 1):
+                constraint_table.add_vertex_constraint(pos, ts)
+        elif self._constraint_type == 'target':
+            agent, pos, ts = self._constraint
+            if self._positive and own_constraint:
+                constraint_table.add_stay_constraint(pos, ts)
+            elif self._positive:
+                constraint_table.add_permanent_constraint(pos, ts)
+            elif own_constraint:
+                constraint_table.add_length_constraint(pos, ts)
 
     def calculate_cost(self):
         """
-        Compute the cost of the solution based on the objective function we are minimizing.
+        Compute the cost of the solution based on the objective function we are minimizing. For the sum of costs only
+        the costs of the recomputed paths are updated with respect to the parent.
         :return:
         """
+        if not self.has_solution():
+            return None
+
         if self._solver_settings.get_objective_function() == "SOC":
-            return calculate_soc(self._solution, self._solver_settings.stay_at_goal(),
-                                 self._solver_settings.get_goal_occupation_time())
+            if self._parent is None:
+                return calculate_soc(self._solution, self._solver_settings.stay_at_goal(),
+                                     self._solver_settings.get_goal_occupation_time())
+            if not self._paths:
+                return self._parent.total_cost()
+            old_paths = [self._parent.solution()[agent_id] for agent_id in self._paths]
+            return self._parent.total_cost() + \
+                calculate_soc(list(self._paths.values()), self._solver_settings.stay_at_goal(),
+                              self._solver_settings.get_goal_occupation_time()) - \
+                calculate_soc(old_paths, self._solver_settings.stay_at_goal(),
+                              self._solver_settings.get_goal_occupation_time())
         if self._solver_settings.get_objective_function() == "Makespan":
-            return calculate_makespan(self._solution, self._solver_settings.stay_at_goal(),
+            paths = self._solution
+            if self._parent is not None:
+                # Temporary list, the solution of the node is built only when it will be expanded.
+                paths = self._parent.solution().copy()
+                for agent_id, path in self._paths.items():
+                    paths[agent_id] = path
+            return calculate_makespan(paths, self._solver_settings.stay_at_goal(),
                                       self._solver_settings.get_goal_occupation_time())
 
     def total_cost(self):
@@ -157,27 +548,135 @@ class ConstraintTreeNode:
         """
         return self._total_cost
 
+    def h_value(self):
+        """
+        Return the value of the high level heuristic of the node, an estimate if it has not been computed yet.
+        """
+        return self._h_value
+
+    def set_h_value(self, h_value):
+        """
+        Set the value of the high level heuristic of the node, computed from its conflicts.
+        :param h_value: admissible estimate of the increase of the cost needed to solve the conflicts.
+        """
+        self._h_value = h_value
+        self._h_computed = True
+
+    def is_h_computed(self):
+        """
+        Return True if the high level heuristic of the node has been computed.
+        """
+        return self._h_computed
+
+    def get_conflict_index(self):
+        """
+        Return the conflict index shared by the nodes of the tree.
+        """
+        return self._conflict_index
+
     def vertex_constraints(self):
         """
-        Return the list of vertex constraints of the node.
+        Return the set of vertex constraints of the node in the form (agent_id, position, time_step).
         """
-        return self._vertex_constraints
+        return {node._constraint for node in self.get_ancestors()
+                if node._constraint_type == 'vertex_conflict' and not node._positive}
 
     def edge_constraints(self):
         """
-        Return the list of the edge constraints of the node.
+        Return the set of the edge constraints of the node in the form (agent_id, initial_position, final_position,
+        final_time_step).
+        """
+        return {node._constraint for node in self.get_ancestors()
+                if node._constraint_type == 'edge_conflict' and not node._positive}
+
+    def symmetry_constraints(self):
+        """
+        Return the set of the barrier, range and length constraints of the node in the form (constraint_type,
+        constraint, positive).
+        """
+        return {(node._constraint_type, node._constraint, node._positive) for node in self.get_ancestors()
+                if node._constraint_type in ['barrier', 'range', 'target']}
+
+    def positive_constraints(self):
+        """
+        Return the set of the positive constraints of the node, in the form (agent_id, position, time_step) for the
+        vertices and (agent_id, initial_position, final_position, final_time_step) for the moves.
+        """
+        return {node._constraint for node in self.get_ancestors()
+                if node._positive and node._constraint_type in ['vertex_conflict', 'edge_conflict']}
+
+    def get_ancestors(self):
+        """
+        Return the list of nodes from this one up to the root, excluded.
+        """
+        ancestors = []
+        node = self
+        while node._parent is not None:
+            ancestors.append(node)
+            node = node._parent
+        return ancestors
+
+    def n_of_conflicts_avoided(self):
+        """
+        Return the estimated number of conflicts avoided by the conflict avoidance table in the low level searches of
+        this node.
         """
-        return self._edge_constraints
+        return self._n_of_conflicts_avoided
+
+    def n_of_bypasses(self):
+        """
+        Return the number of paths adopted from the children by the bypass the last time this node has been expanded.
+        """
+        return self._n_of_bypasses
+
+    def n_of_infeasible_children(self):
+        """
+        Return the number of children without solution generated the last time this node has been expanded.
+        """
+        return self._n_of_infeasible_children
+
+    def n_of_positive_replans(self):
+        """
+        Return the number of paths recomputed because of the positive constraints of the children generated the last
+        time this node has been expanded.
+        """
+        return self._n_of_positive_replans
+
+    def n_of_rectangle_splits(self):
+        """
+        Return the number of rectangle conflicts split with barriers the last time this node has been expanded.
+        """
+        return self._n_of_rectangle_splits
+
+    def n_of_corridor_splits(self):
+        """
+        Return the number of corridor conflicts split with range constraints the last time this node has been expanded.
+        """
+        return self._n_of_corridor_splits
+
+    def n_of_target_splits(self):
+        """
+        Return the number of target conflicts split with length constraints the last time this node has been expanded.
+        """
+        return self._n_of_target_splits
+
+    def has_solution(self):
+        """
+        Return True if the low level found a path for every agent.
+        """
+        if self._parent is None:
+            return self._solution is not None
+        return self._paths is not None
 
     def is_valid(self):
         """
         Returns True if the solution of the node is valid i.e.the set of paths for all agents have no conflicts
         """
-        if self._solution is None:
+        if not self.has_solution():
             return False
 
-        self.conflict = check_conflicts_with_type(self._solution, self._solver_settings.stay_at_goal(),
-                                                  self._solver_settings.is_edge_conflict())
+        self._conflict_index.set_paths(self.solution())
+        self.conflict = self._conflict_index.get_first_conflict_with_type()
 
         if self.conflict is None:
             return True
@@ -188,13 +687,36 @@ class ConstraintTreeNode:
         """
         Return the solution found for the current node. Note that the list of paths can have conflicts.
         Check if the solution has no conflicts before call this method otherwise the solution returned could not be
-        valid.
+        valid. The list is built from the parent solution the first time it's requested.
         """
+        if self._solution is None and self.has_solution():
+            self._solution = self._parent.solution().copy()
+            for agent_id, path in self._paths.items():
+                self._solution[agent_id] = path
         return self._solution
 
     def __str__(self):
-        string = '[Constraints:' + str(self._vertex_constraints) + \
-                 ' Transactional constraints:' + str(self._edge_constraints) + \
+        string = '[Constraints:' + str(self.vertex_constraints()) + \
+                 ' Transactional constraints:' + str(self.edge_constraints()) + \
+                 ' Positive constraints:' + str(self.positive_constraints()) + \
+                 ' Symmetry constraints:' + str(self.symmetry_constraints()) + \
                  ' Total Cost:' + str(self._total_cost) + \
-                 ' PATH:' + str(self._solution) + ']'
+                 ' PATH:' + str(self.solution()) + ']'
         return string
+
+
+def manhattan_distance(position_a, position_b):
+    """
+    Return the Manhattan distance between the two positions.
+    """
+    return abs(position_a[0] - position_b[0]) + abs(position_a[1] - position_b[1])
+
+
+def barrier_positions(initial_position, final_position):
+    """
+    Return the positions of the horizontal or vertical segment between the two positions, both included.
+    """
+    x_step = (final_position[0] > initial_position[0]) - (final_position[0] < initial_position[0])
+    y_step = (final_position[1] > initial_position[1]) - (final_position[1] < initial_position[1])
+    n_of_positions = manhattan_distance(initial_position, final_position) + 1
+    return [(initial_position[0] + i * x_step, initial_position[1] + i * y_step) for i in range(n_of_positions)]
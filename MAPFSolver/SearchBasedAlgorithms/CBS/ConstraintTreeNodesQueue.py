@@ -1,16 +1,18 @@
 from MAPFSolver.SearchBasedAlgorithms.CBS.ConstraintTreeNode import ConstraintTreeNode
+from MAPFSolver.Utilities.HeapQueue import HeapQueue
 
 
-class ConstraintTreeNodesQueue:
+class ConstraintTreeNodesQueue(HeapQueue):
     """
-    Structure used as queue for the Constraint Tree Nodes.
+    Structure used as queue for the Constraint Tree Nodes. The nodes are kept in a binary heap ordered by their costs
+    plus the value of the high level heuristic.
     """
 
     def __init__(self):
         """
         Initialize a new queue.
         """
-        self._queue = []
+        super().__init__(priority_function=lambda x: x.total_cost() + x.h_value())
 
     def contains_node(self, item):
         """
@@ -19,8 +21,8 @@ class ConstraintTreeNodesQueue:
         :return: True if the node is already present in the queue.
         """
         assert isinstance(item, ConstraintTreeNode)
-        for node in self._queue:
-            if node.vertex_constraints() == item.vertex_constraints():
+        for priority, count, node, removed in self._heap:
+            if not removed and node.vertex_constraints() == item.vertex_constraints():
                 return True
         return False
 
@@ -30,29 +32,11 @@ class ConstraintTreeNodesQueue:
         :param item: node to add.
         """
         assert isinstance(item, ConstraintTreeNode)
-        self._queue.append(item)
+        super().add(item)
 
     def add_list_of_nodes(self, node_list):
         """
         Add a list of nodes to the queue.
         :param node_list: list of nodes to add.
         """
-        self._queue.extend(node_list)
-
-    def pop(self):
-        """
-        Pop the first element of the queue and return it.
-        """
-        return self._queue.pop(0)
-
-    def is_empty(self):
-        """
-        Return True if the queue is empty.
-        """
-        return len(self._queue) == 0
-
-    def sort_by_cost(self):
-        """
-        Sort the queue by the nodes costs.
-        """
-        self._queue.sort(key=lambda x: x.total_cost(), reverse=False)
+        self.add_list(node_list)
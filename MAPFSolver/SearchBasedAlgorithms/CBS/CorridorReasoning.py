@@ -0,0 +1,163 @@
+from MAPFSolver.Heuristics.DistanceTablesCache import get_distance_tables_cache
+from collections import deque
+
+
+class CorridorReasoning:
+    """
+    Detection of the corridor conflicts for CBS. A corridor is a chain of free cells with exactly two free neighbours,
+    so it can be entered only from the two cells at its ends. When two agents conflict inside a corridor crossing it in
+    opposite directions, one of them has to wait until the other one has left the corridor. Splitting the conflict
+    with vertex constraints would try all the time steps in which the agents could meet, instead the conflict is
+    split with two range constraints, each one forbidding an agent to reach the end of the corridor before the other
+    agent could have crossed it.
+    An instance is shared by all the nodes of a constraint tree, so the corridors and the distances found are cached.
+    """
+
+    def __init__(self, problem_instance, solver_settings):
+        """
+        Initialize the corridor reasoning for the given problem.
+        :param problem_instance: instance of the problem.
+        :param solver_settings: settings of the solver.
+        """
+        self._problem_instance = problem_instance
+        self._solver_settings = solver_settings
+        self._corridors = dict()
+        self._distances_avoiding_corridors = dict()
+
+    def get_corridor_constraints(self, conflict, solution):
+        """
+        Check if the given conflict is a corridor conflict and return the range constraints to split it.
+        Let the first agent cross the corridor from the end e1 to the end e2 and the second agent from e2 to e1, and
+        let k be the distance between e1 and e2 through the corridor. If the first agent reaches e2 before the earliest
+        time step it could reach it without passing through the corridor, it has crossed the corridor. So if the first
+        agent crosses first, the second agent enters the corridor after the first one has reached e2 and can't reach e1
+        before the earliest arrival of the first agent in e2 plus k plus one, and vice versa. Since the edge conflicts
+        don't let the agents swap inside the corridor, any solution respects at least one of the two range constraints.
+        The earliest arrivals are computed without constraints, they are lower bounds of the actual ones.
+        :param conflict: a couple (type of constraint, new children constraints).
+        :param solution: list of paths of the node.
+        :return: None if it's not a corridor conflict useful to split, otherwise the two range constraints
+        (agent_id, position, first_time_step, last_time_step).
+        """
+        if not self._solver_settings.is_edge_conflict():
+            return None  # Without edge conflicts the agents can swap inside the corridor.
+
+        conflict_type, constraints = conflict
+        if conflict_type == 'vertex_conflict':
+            (agent_a, pos, ts), (agent_b, pos, ts) = constraints
+            corridor = self.get_corridor(pos)
+            last_time_step = ts
+        else:
+            (agent_b, pos_i_b, pos_f_b, ts), (agent_a, pos_i_a, pos_f_a, ts) = constraints
+            corridor = self.get_corridor(pos_i_a) or self.get_corridor(pos_f_a)
+            last_time_step = ts - 1
+        if corridor is None:
+            return None
+        cells, ends = corridor
+
+        agents = [self._problem_instance.get_agents()[agent_id] for agent_id in [agent_a, agent_b]]
+        entries = []
+        for agent in agents:
+            if agent.get_start() in cells or agent.get_goal() in cells:
+                return None
+            path = solution[agent.get_id()]
+            entries.append(next(path[t] for t in range(min(last_time_step, len(path) - 1), -1, -1)
+                                if path[t] not in cells))
+        if entries[0] == entries[1] or set(entries) != set(ends):
+            return None
+        exits = [entries[1], entries[0]]
+
+        length = len(cells) + 1
+        earliest_arrivals = [self.get_distance(agent.get_start(), exit_position)
+                             for agent, exit_position in zip(agents, exits)]
+        earliest_arrivals_avoiding = [self.get_distance_avoiding_corridor(agent.get_start(), exit_position, corridor)
+                                      for agent, exit_position in zip(agents, exits)]
+        if None in earliest_arrivals:
+            return None
+
+        range_constraints = []
+        for i in range(2):
+            last = earliest_arrivals[1 - i] + length
+            if earliest_arrivals_avoiding[i] is not None:
+                last = min(last, earliest_arrivals_avoiding[i] - 1)
+            range_constraints.append((agents[i].get_id(), exits[i], earliest_arrivals[i], last))
+
+        # Both the current paths must violate their range constraint, otherwise a child would be the same of the node.
+        for agent_id, exit_position, first, last in range_constraints:
+            path = solution[agent_id]
+            if not any(path[t] == exit_position for t in range(first, min(last, len(path) - 1) + 1)):
+                return None
+        return range_constraints
+
+    def get_corridor(self, position):
+        """
+        Return the corridor that contains the given position, None if the position is not in a corridor.
+        :param position: (x, y) position.
+        :return: a couple with the set of the cells of the corridor and the couple of cells at its ends.
+        """
+        if position not in self._corridors:
+            self._corridors[position] = self.find_corridor(position)
+        return self._corridors[position]
+
+    def find_corridor(self, position):
+        """
+        Find the corridor that contains the given position following the chain of cells with two free neighbours in
+        both directions.
+        """
+        problem_map = self._problem_instance.get_map()
+        if problem_map.is_obstacle(position) or len(problem_map.neighbours(position)) != 2:
+            return None
+
+        cells = {position}
+        ends = []
+        for next_position in problem_map.neighbours(position):
+            previous_position = position
+            while len(problem_map.neighbours(next_position)) == 2 and next_position not in cells:
+                cells.add(next_position)
+                previous_position, next_position = next_position, \
+                    next(pos for pos in problem_map.neighbours(next_position) if pos != previous_position)
+            if next_position in cells:
+                return None  # The chain is a cycle.
+            ends.append(next_position)
+
+        if ends[0] == ends[1]:
+            return None
+        corridor = (frozenset(cells), tuple(ends))
+        for cell in cells:
+            self._corridors[cell] = corridor
+        return corridor
+
+    def get_distance(self, start, goal):
+        """
+        Return the distance between the two positions, None if the goal can't be reached.
+        """
+        distance = get_distance_tables_cache().get_table(self._problem_instance.get_map(), goal).item(start[1],
+                                                                                                        start[0])
+        return distance if distance >= 0 else None
+
+    def get_distance_avoiding_corridor(self, start, goal, corridor):
+        """
+        Return the distance between the two positions without passing through the cells of the corridor, None if the
+        goal can't be reached in this way.
+        """
+        key = (start, goal, corridor[1])
+        if key not in self._distances_avoiding_corridors:
+            self._distances_avoiding_corridors[key] = self.breadth_first_search(start, goal, corridor[0])
+        return self._distances_avoiding_corridors[key]
+
+    def breadth_first_search(self, start, goal, forbidden_cells):
+        """
+        Return the distance between the two positions avoiding the forbidden cells, None if the goal can't be reached.
+        """
+        problem_map = self._problem_instance.get_map()
+        distances = {start: 0}
+        frontier = deque([start])
+        while frontier:
+            position = frontier.popleft()
+            if position == goal:
+                return distances[position]
+            for next_position in problem_map.neighbours(position):
+                if next_position not in distances and next_position not in forbidden_cells:
+                    distances[next_position] = distances[position] + 1
+                    frontier.append(next_position)
+        return None
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+
+class LowLevelPathsCache:
+    """
+    Bounded cache of the paths computed by the low level of CBS. Different branches of the constraint tree often ask the
+    low level for the path of the same agent under the same set of constraints, so the paths are stored by agent id and
+    key of the constraint table of the agent, see ConstraintTable.get_key(). The paths not found are stored too.
+    When the cache is full the least recently used path is evicted.
+    The low level returns an optimal path for the constraints, so a cached path has the same cost of a recomputed one.
+    Only the tie-breaking of the conflict avoidance table, that depends on the paths of the other agents, may differ.
+    """
+
+    def __init__(self, max_size):
+        """
+        Initialize an empty cache.
+        :param max_size: maximum number of paths stored.
+        """
+        self._max_size = max_size
+        self._paths = OrderedDict()
+        self._n_of_hits = 0
+        self._n_of_misses = 0
+
+    def get(self, agent_id, constraints_key):
+        """
+        Return the path of the agent stored for the given constraints, None if it is not in the cache.
+        :param agent_id: id of the agent.
+        :param constraints_key: key of the constraint table of the agent.
+        :return: the path, an empty list if the low level didn't find a path, None if not stored.
+        """
+        key = (agent_id, constraints_key)
+        path = self._paths.get(key)
+        if path is None:
+            self._n_of_misses += 1
+            return None
+        self._paths.move_to_end(key)
+        self._n_of_hits += 1
+        return path
+
+    def add(self, agent_id, constraints_key, path):
+        """
+        Store the path of the agent for the given constraints, evicting the least recently used path if the cache is
+        full.
+        :param agent_id: id of the agent.
+        :param constraints_key: key of the constraint table of the agent.
+        :param path: path computed by the low level, an empty list if it doesn't exist.
+        """
+        self._paths[(agent_id, constraints_key)] = path
+        if len(self._paths) > self._max_size:
+            self._paths.popitem(last=False)
+
+    def get_n_of_hits(self):
+        """
+        Return the number of paths taken from the cache.
+        """
+        return self._n_of_hits
+
+    def get_n_of_misses(self):
+        """
+        Return the number of paths not found in the cache, and so computed by the low level.
+        """
+        return self._n_of_misses
+
+    def get_hit_rate(self):
+        """
+        Return the fraction of the requests found in the cache, zero if there are no requests.
+        """
+        n_of_requests = self._n_of_hits + self._n_of_misses
+        return self._n_of_hits / n_of_requests if n_of_requests > 0 else 0
@@ -1,6 +1,7 @@
 from MAPFSolver.Utilities.paths_processing import calculate_soc, calculate_makespan
 from MAPFSolver.Utilities.AbstractSolver import AbstractSolver
 from MAPFSolver.Utilities.AStar import AStar
+from MAPFSolver.Utilities.SIPP import SIPP
 from threading import Thread, Event
 import time
 
@@ -69,7 +70,8 @@ class CooperativeAStarSolver(AbstractSolver):
             if verbose:
                 print("Agent n:", i, "of", len(problem_instance.get_agents()))
 
-            solver = AStar(self._solver_settings)
+            solver = SIPP(self._solver_settings) if self._solver_settings.get_low_level() == "SIPP" else \
+                AStar(self._solver_settings)
             path = solver.find_path_with_reservation_table(problem_instance.get_map(), agent.get_start(),
                                                            agent.get_goal(), self._reservation_table,
                                                            self._completed_pos)
@@ -0,0 +1,86 @@
+from MAPFSolver.SearchBasedAlgorithms.CBS.ConstraintTreeNode import ConstraintTreeNode
+from MAPFSolver.Utilities.AStar import AStar
+
+
+class ECBSConstraintTreeNode(ConstraintTreeNode):
+    """
+    Node of the constraint tree of ECBS. The paths are computed by a focal search, so they are bounded-suboptimal, and
+    for each of them the low level returns also a lower bound of the cost of the optimal path that respects the same
+    constraints. The lower bound of the node is the sum (or the maximum with the makespan) of the ones of the agents.
+    As for the paths, a child keeps only the lower bounds of the agents recomputed and shares the others with the
+    parent.
+    """
+
+    def __init__(self, problem_instance, solver_settings, parent=None, constraint_type=None, constraint=None,
+                 positive=False):
+        """
+        Initialize the node. See ConstraintTreeNode for the parameters.
+        """
+        self._agent_lower_bounds = dict()  # Lower bounds of the agents whose path has been computed in this node.
+        super().__init__(problem_instance, solver_settings, parent=parent, constraint_type=constraint_type,
+                         constraint=constraint, positive=positive)
+        self._lower_bound = self.calculate_lower_bound()
+
+    def single_agent_low_level_search(self, agent):
+        """
+        Low level search for a single agent. It searches a path that doesn't violate the set of constraints with a focal
+        search: between the paths with cost at most w times the lower bound, the one with fewer conflicts with the
+        other agents of the conflict index is preferred. The lower bound of the agent is stored in the node.
+        """
+        constraint_table = self.get_constraint_table(agent.get_id())
+
+        solver = AStar(self._solver_settings)
+        path = solver.find_path_with_focal_search(self._problem_instance.get_map(), agent.get_start(),
+                                                  agent.get_goal(), constraint_table, self._conflict_index,
+                                                  agent.get_id(), self._solver_settings.get_suboptimality_factor())
+        if path:
+            # The constraints of a child include the ones of the parent, so the lower bound of the parent still holds.
+            lower_bound = solver.get_lower_bound()
+            if self._parent is not None:
+                lower_bound = max(lower_bound, self._parent.get_agent_lower_bound(agent.get_id()))
+            self._agent_lower_bounds[agent.get_id()] = lower_bound
+        return path
+
+    def calculate_lower_bound(self):
+        """
+        Compute the lower bound of the cost of the solutions of the subtree of this node. Only the lower bounds of the
+        recomputed agents are updated with respect to the parent.
+        """
+        if not self.has_solution():
+            return None
+
+        objective_function = self._solver_settings.get_objective_function()
+        if self._parent is None:
+            if objective_function == "SOC":
+                return sum(self._agent_lower_bounds.values())
+            return max(self._agent_lower_bounds.values())
+
+        if objective_function == "SOC":
+            return self._parent.lower_bound() + sum(lower_bound - self._parent.get_agent_lower_bound(agent_id)
+                                                    for agent_id, lower_bound in self._agent_lower_bounds.items())
+        # The lower bounds of the agents never decrease from the parent to the child.
+        return max([self._parent.lower_bound()] + list(self._agent_lower_bounds.values()))
+
+    def get_agent_lower_bound(self, agent_id):
+        """
+        Return the lower bound of the cost of the given agent, stored in the nearest ancestor where his path has been
+        computed.
+        :param agent_id: id of the agent.
+        """
+        node = self
+        while node._parent is not None and agent_id not in node._agent_lower_bounds:
+            node = node._parent
+        return node._agent_lower_bounds[agent_id]
+
+    def lower_bound(self):
+        """
+        Return the lower bound of the cost of the solutions of the subtree of this node.
+        """
+        return self._lower_bound
+
+    def n_of_conflicts(self):
+        """
+        Return the number of conflicts between the paths of the node. It updates the conflict index with the solution.
+        """
+        self._conflict_index.set_paths(self.solution())
+        return self._conflict_index.get_n_of_conflicts()
@@ -0,0 +1,77 @@
+from MAPFSolver.SearchBasedAlgorithms.CBS.CBSSolver import CBSSolver
+from MAPFSolver.SearchBasedAlgorithms.ECBS.ECBSConstraintTreeNode import ECBSConstraintTreeNode
+from MAPFSolver.Utilities.FocalQueue import FocalQueue
+
+
+class ECBSSolver(CBSSolver):
+    """
+    ECBS (Enhanced CBS) is a bounded-suboptimal variant of CBS: the cost of the solution returned is at most w times the
+    optimal one, where w is the suboptimality factor of the settings. Both the levels use a focal search:
+    - the low level returns for each agent a path with cost at most w times the lower bound of his optimal path that
+      respects the constraints, preferring the paths with fewer conflicts with the other agents.
+    - the high level keeps the nodes ordered by their lower bound, the sum of the lower bounds of the agents, and
+      expands between the nodes with cost at most w times the lowest lower bound the one with fewer conflicts.
+    The lowest lower bound of the nodes to expand is a lower bound of the optimal cost, and it's returned in the output
+    infos. The high level heuristic of the settings is not used, and the paths of the low level are not cached since the
+    focal search depends on the paths of the other agents.
+    """
+
+    def __init__(self, solver_settings):
+        """
+        Initialize the ECBS solver.
+        :param solver_settings: settings used by the ECBS solver.
+        """
+        super().__init__(solver_settings)
+        self._lower_bound = None
+
+    def solve_problem(self, problem_instance, verbose=False):
+        """
+        The high level pops the nodes from the focal list. A node is a goal node when its paths have no conflicts, and
+        since its cost is at most w times the lowest lower bound, the solution is bounded-suboptimal.
+        """
+        self.initialize_problem(problem_instance)
+
+        while not self._frontier.is_empty():
+            cur_state = self._frontier.pop()
+            self._lower_bound = self._frontier.get_lower_bound()
+
+            if self._stop_event.is_set():
+                break
+
+            if verbose:
+                print("Expanding state ... Lower bound:", cur_state.lower_bound(), "Cost:", cur_state.total_cost(),
+                      "Focal bound:", self._solver_settings.get_suboptimality_factor() * self._lower_bound)
+
+            if cur_state.is_valid():
+                self._solution = cur_state.solution()
+                break
+
+            expanded_nodes = cur_state.expand()
+            self.update_statistics(cur_state, expanded_nodes)
+            self._frontier.add_list(expanded_nodes)
+
+    def initialize_problem(self, problem_instance):
+        """
+        Initialize the frontier for the given problem.
+        """
+        self._frontier = FocalQueue(self._solver_settings.get_suboptimality_factor(),
+                                    priority_function=lambda x: (x.n_of_conflicts(), x.total_cost()),
+                                    lower_bound_function=lambda x: x.lower_bound(),
+                                    cost_function=lambda x: x.total_cost())
+        self.reset_statistics()
+        self._lower_bound = None
+
+        starter_state = ECBSConstraintTreeNode(problem_instance, self._solver_settings)
+        self._n_of_conflicts_avoided = starter_state.n_of_conflicts_avoided()
+        if starter_state.has_solution():
+            self._frontier.add(starter_state)
+
+    def generate_output_infos(self, soc, makespan, generated_nodes, expanded_nodes, computation_time):
+        """
+        Return a struct with the output information, with also the suboptimality factor and the lower bound of the
+        optimal cost reached.
+        """
+        output_infos = super().generate_output_infos(soc, makespan, generated_nodes, expanded_nodes, computation_time)
+        output_infos["suboptimality_factor"] = self._solver_settings.get_suboptimality_factor()
+        output_infos["lower_bound"] = self._lower_bound
+        return output_infos
@@ -0,0 +1 @@
+from.ECBSSolver import ECBSSolver
@@ -0,0 +1,142 @@
+from MAPFSolver.Heuristics.DistanceTablesCache import get_distance_tables_cache
+from MAPFSolver.SearchBasedAlgorithms.ICTS.BitsetMDDNode import BitsetMDDNode
+import numpy as np
+
+
+class BitsetMDD:
+    """
+    Multi-value decision diagram (MDD) for a single agent stored by layers: the layer t is a boolean array over the
+    cells of the compiled map with the cells the agent can occupy at the time step t in a path of length equal to the
+    cost. Since the agent can wait, a cell is in the layer t if and only if its distance from the start is at most t
+    and its distance from the goal is at most cost - t, so all the layers are computed at once with vectorized
+    operations on the distance fields of the start and of the goal. The edges of the MDD are all the moves between
+    cells of consecutive layers.
+    The nodes are BitsetMDDNode views built only when visited, so it can be used by the TotalMDD as the MDD class.
+    """
+
+    def __init__(self, problem_map, agent, cost, solver_settings):
+        """
+        Initialize the Multi-value Decision Diagram.
+        :param problem_map: map of the problem.
+        :param agent: agent involved.
+        :param cost: maximum cost for which computing all the possible paths.
+        :param solver_settings: settings of the solver
+        """
+        self._problem_map = problem_map
+        self._compiled_map = problem_map.get_compiled_map()
+        self._agent = agent
+        self._cost = cost
+        self._solver_settings = solver_settings
+
+        self._layers = None
+        self._n_of_nodes = 0
+        self._nodes = dict()
+
+        self.build_mdd()
+
+    def build_mdd(self):
+        """
+        Compute the layers from the distance fields of the start and of the goal.
+        :return: True if the goal is reached at the time step equal to the cost.
+        """
+        free_cells = self._compiled_map.get_ids_grid() >= 0
+        # The free cells are numbered in row-major order, as the boolean indexing of the grid returns them.
+        start_distances = get_distance_tables_cache().get_table(self._problem_map, self._agent.get_start())[free_cells]
+        goal_distances = get_distance_tables_cache().get_table(self._problem_map, self._agent.get_goal())[free_cells]
+
+        time_steps = np.arange(self._cost + 1)[:, np.newaxis]
+        self._layers = (start_distances >= 0) & (start_distances <= time_steps) & \
+                       (goal_distances >= 0) & (goal_distances <= self._cost - time_steps)
+        self._n_of_nodes = int(np.count_nonzero(self._layers))
+        return self._n_of_nodes > 0
+
+    def get_next_cells(self, time_step, cell_id):
+        """
+        Return the cells of the layer after the given time step reachable with a move from the given cell.
+        :param time_step: time step of the cell.
+        :param cell_id: number of the cell in the compiled map.
+        """
+        if time_step >= self._cost:
+            return []
+        return self.get_moves_in_layer(cell_id, self._layers[time_step + 1])
+
+    def get_previous_cells(self, time_step, cell_id):
+        """
+        Return the cells of the layer before the given time step from which the given cell is reachable with a move.
+        :param time_step: time step of the cell.
+        :param cell_id: number of the cell in the compiled map.
+        """
+        if time_step <= 0:
+            return []
+        # The moves are reversible, so the cells from which the cell is reachable are the ones reachable from it.
+        return self.get_moves_in_layer(cell_id, self._layers[time_step - 1])
+
+    def get_moves_in_layer(self, cell_id, layer):
+        """
+        Return the cells reachable with a move from the given cell that are in the given layer.
+        """
+        offsets = self._compiled_map.get_offsets()
+        moves = self._compiled_map.get_indices()[offsets[cell_id]:offsets[cell_id + 1]]
+        return moves[layer[moves]].tolist()
+
+    def get_node(self, time_step, cell_id):
+        """
+        Return the node of the given cell in the layer of the given time step. The nodes are built when first asked.
+        :param time_step: time step of the layer.
+        :param cell_id: number of the cell in the compiled map.
+        """
+        node = self._nodes.get((time_step, cell_id))
+        if node is None:
+            node = BitsetMDDNode(self, cell_id, time_step)
+            self._nodes[(time_step, cell_id)] = node
+        return node
+
+    def get_paths(self):
+        """
+        Returns all the possible paths of length equal to the cost.
+        """
+        goal_node = self.get_node(self._cost, self._compiled_map.get_id(self._agent.get_goal()))
+        return goal_node.get_paths_to_root(self._solver_settings)
+
+    def get_root_node(self):
+        """
+        Return the reference to the root node.
+        """
+        return self.get_node(0, self._compiled_map.get_id(self._agent.get_start()))
+
+    def get_layers(self):
+        """
+        Return the (cost+1 x number of cells) boolean array with the layers of the MDD.
+        """
+        return self._layers
+
+    def get_cost(self):
+        """
+        Returns the max cost of this MDD.
+        """
+        return self._cost
+
+    def get_n_of_nodes(self):
+        """
+        Returns the number of nodes of this MDD.
+        """
+        return self._n_of_nodes
+
+    def get_map(self):
+        """
+        Returns the map of the MDD.
+        """
+        return self._problem_map
+
+    def get_goal(self):
+        """
+        Returns the goal position of the agent.
+        """
+        return self._agent.get_goal()
+
+    def get_position(self, cell_id):
+        """
+        Returns the (x, y) position of the given cell.
+        :param cell_id: number of the cell in the compiled map.
+        """
+        return self._compiled_map.get_position(cell_id)
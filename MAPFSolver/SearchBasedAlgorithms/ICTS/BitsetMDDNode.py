@@ -0,0 +1,40 @@
+from MAPFSolver.SearchBasedAlgorithms.ICTS.MDDNode import MDDNode
+
+
+class BitsetMDDNode(MDDNode):
+    """
+    Node of a BitsetMDD. It is a view of a cell of a layer of the MDD: the children and the parents are not stored but
+    computed, when asked, from the moves of the compiled map and the occupancy of the next and previous layers. So it
+    can be used by the TotalMDD and by the MDD paths functions as the other MDD nodes.
+    """
+
+    def __init__(self, mdd, cell_id, time_step):
+        """
+        Initialize the node.
+        :param mdd: BitsetMDD of the node.
+        :param cell_id: number of the cell of the node in the compiled map.
+        :param time_step: time step of the layer of the node.
+        """
+        self._mdd = mdd
+        self._cell_id = cell_id
+        super().__init__(mdd.get_map(), mdd.get_goal(), mdd.get_position(cell_id), time_step=time_step)
+        self._children = None
+
+    def get_children(self):
+        """
+        Returns the list of children of this node, the moves of the cell that are in the next layer.
+        """
+        if self._children is None:
+            self._children = [self._mdd.get_node(self._time_step + 1, cell_id)
+                              for cell_id in self._mdd.get_next_cells(self._time_step, self._cell_id)]
+        return self._children
+
+    def parent(self):
+        """
+        Returns the list of parents, the moves of the cell that are in the previous layer. None for the root.
+        """
+        if self._time_step == 0:
+            return None
+        return [self._mdd.get_node(self._time_step - 1, cell_id)
+                for cell_id in self._mdd.get_previous_cells(self._time_step, self._cell_id)]
+
@@ -1,5 +1,6 @@
 from MAPFSolver.SearchBasedAlgorithms.ICTS.TotalMDD import TotalMDD
 from MAPFSolver.SearchBasedAlgorithms.ICTS.MDD import MDD
+from MAPFSolver.SearchBasedAlgorithms.ICTS.BitsetMDD import BitsetMDD
 from MAPFSolver.Utilities.AStar import AStar
 from time import time
 
@@ -11,11 +12,25 @@ class ICTNode:
     s represents all possible complete solutions in which the cost of the individual path of agent a i is exactly C i.
     """
 
-    def __init__(self, problem_instance, solver_settings, path_costs_vector=None, parent=None):
+    def __init__(self, problem_instance, solver_settings, path_costs_vector=None, parent=None, mdd_cache=None,
+                 pairwise_pruning=None):
+        """
+        Initialize the node.
+        :param problem_instance: instance of the problem.
+        :param solver_settings: settings of the solver.
+        :param path_costs_vector: cost of each agent. If None (root) the optimal cost of each agent is used.
+        :param parent: parent node.
+        :param mdd_cache: MDDCache shared by the nodes of the tree, None to build all the MDDs. The children use the
+        one of the parent.
+        :param pairwise_pruning: PairwisePruning shared by the nodes of the tree, None to search directly the TotalMDD.
+        The children use the one of the parent.
+        """
         self._problem_instance = problem_instance
         self._solver_settings = solver_settings
         self._parent = parent
         self._path_costs_vector = path_costs_vector
+        self._mdd_cache = mdd_cache if parent is None else parent._mdd_cache
+        self._pairwise_pruning = pairwise_pruning if parent is None else parent._pairwise_pruning
 
         if parent is None:
             self.initialize_root()
@@ -32,6 +47,9 @@ class ICTNode:
             print("Initializing node: ", self._path_costs_vector)
         self._mdd_vector = self.compute_mdds(verbose)
         self.compute_solution(stop_event, verbose)
+        # The node is not tested again, the MDDs still needed by the other nodes are kept by the cache.
+        self._mdd_vector = None
+        self._total_mdd = None
 
     def expand(self):
         """
@@ -67,29 +85,62 @@ class ICTNode:
 
     def compute_mdds(self, verbose=False):
         """
-        Compute the mdd for each agents.
+        Compute the mdd for each agents. The MDDs already built by other nodes are taken from the cache, if used.
         """
         if verbose:
             print("Computing MDDs...", end=' ')
         mdd_vector = []
         for i, agent in enumerate(self._problem_instance.get_agents()):
-            mdd_vector.append(MDD(self._problem_instance.get_map(), agent, self._path_costs_vector[i],
-                                  self._solver_settings))
+            mdd = None
+            if self._mdd_cache is not None:
+                mdd = self._mdd_cache.get(agent.get_id(), self._path_costs_vector[i])
+            if mdd is None:
+                mdd = self.build_mdd(i, agent)
+                if self._mdd_cache is not None:
+                    self._mdd_cache.add(agent.get_id(), self._path_costs_vector[i], mdd)
+            mdd_vector.append(mdd)
 
         if verbose:
             print("MDDs computed.")
         return mdd_vector
 
+    def build_mdd(self, i, agent):
+        """
+        Build the MDD of the given agent with his cost in this node. If the bitset MDDs are not used and the MDD of the
+        agent with one less cost is still in the cache, its forward layers are reused.
+        :param i: index of the agent in the path costs vector.
+        :param agent: agent of the MDD.
+        """
+        if self._solver_settings.use_bitset_mdd():
+            return BitsetMDD(self._problem_instance.get_map(), agent, self._path_costs_vector[i], self._solver_settings)
+        previous_mdd = None
+        if self._mdd_cache is not None:
+            previous_mdd = self._mdd_cache.peek(agent.get_id(), self._path_costs_vector[i] - 1)
+        return MDD(self._problem_instance.get_map(), agent, self._path_costs_vector[i], self._solver_settings,
+                   previous_mdd=previous_mdd)
+
     def compute_solution(self, stop_event, verbose=False):
         """
-        Compute the total mdd and check if a solution exists.
+        Compute the total mdd and check if a solution exists. If the pairwise pruning is used, the pairs of agents are
+        checked before.
         """
         if verbose:
             print("Computing TotalMDD...", end=' ')
 
         start = time()
 
-        self._total_mdd = TotalMDD(self._problem_instance.get_map(), self._solver_settings, self._mdd_vector, stop_event)
+        allowed_nodes = None
+        if self._pairwise_pruning is not None:
+            allowed_nodes = self._pairwise_pruning.prune(self._problem_instance.get_agents(), self._path_costs_vector,
+                                                         self._mdd_vector, stop_event)
+            if allowed_nodes is None:
+                if verbose:
+                    print("Node pruned by a pair of agents.")
+                self._solution = []
+                return self._solution
+
+        self._total_mdd = TotalMDD(self._problem_instance.get_map(), self._solver_settings, self._mdd_vector, stop_event,
+                                   allowed_nodes=allowed_nodes)
         self._solution = self._total_mdd.get_solution()
 
         # Complete solution paths with the goal occupation time if needed.
@@ -114,18 +165,21 @@ class ICTNode:
 
         if self._solver_settings.get_objective_function() == "Makespan":
             optimal_costs_vector = self.compute_optimal_costs_vector()
-            max_value = max(optimal_costs_vector)
-            for i, agent in enumerate(self._problem_instance.get_agents()):
-                self._path_costs_vector[i] = max_value
+            if optimal_costs_vector is not None:
+                max_value = max(optimal_costs_vector)
+                self._path_costs_vector = [max_value for _ in self._problem_instance.get_agents()]
 
     def compute_optimal_costs_vector(self):
         """
-        Returns the the optimal costs vector. It will have all the optimal costs for each agent.
+        Returns the the optimal costs vector. It will have all the optimal costs for each agent. None if an agent can't
+        reach his goal, since then no node of the tree has a solution.
         """
         path_costs_vector = []
         solver = AStar(self._solver_settings)
         for agent in self._problem_instance.get_agents():
             path = solver.find_path(self._problem_instance.get_map(), agent.get_start(), agent.get_goal())
+            if not path:
+                return None
             if self._solver_settings.stay_at_goal():
                 cost = len(path) - 1
             else:
@@ -133,6 +187,13 @@ class ICTNode:
             path_costs_vector.append(cost)
         return path_costs_vector
 
+    def has_costs_vector(self):
+        """
+        Returns False if the root has no path costs vector because an agent can't reach his goal, so the problem has no
+        solution and the tree must not be searched.
+        """
+        return self._path_costs_vector is not None
+
     def goal_test(self):
         """
         Returns true if in the node a valid solution is found. Remember to call initialize_node() method before.
@@ -1,16 +1,19 @@
 from MAPFSolver.SearchBasedAlgorithms.ICTS.ICTNode import ICTNode
+from MAPFSolver.Utilities.HeapQueue import HeapQueue
 
 
-class ICTQueue:
+class ICTQueue(HeapQueue):
     """
-    Structure used as queue for the Increasing Cost Tree Nodes.
+    Structure used as queue for the Increasing Cost Tree Nodes. The nodes are kept in a binary heap ordered by their
+    costs and indexed by their path costs vector.
     """
 
     def __init__(self):
         """
         Initialize a new queue.
         """
-        self._queue = []
+        super().__init__(priority_function=lambda x: x.total_cost(),
+                         index_function=lambda x: tuple(x.path_costs_vector()))
 
     def contains_node(self, item):
         """
@@ -18,10 +21,7 @@ class ICTQueue:
         :param item: instance of ICTSNode.
         """
         assert isinstance(item, ICTNode)
-        for node in self._queue:
-            if item.path_costs_vector() == node.path_costs_vector():
-                return True
-        return False
+        return self.get(tuple(item.path_costs_vector())) is not None
 
     def add(self, item):
         """
@@ -29,29 +29,11 @@ class ICTQueue:
         :param item: node to add.
         """
         assert isinstance(item, ICTNode)
-        self._queue.append(item)
+        super().add(item)
 
     def add_list_of_nodes(self, node_list):
         """
         Add a list of nodes to the queue.
         :param node_list: node list to add.
         """
-        self._queue.extend(node_list)
-
-    def pop(self):
-        """
-        Pop the first element of the Queue and return it.
-        """
-        return self._queue.pop(0)
-
-    def is_empty(self):
-        """
-        Return True if the queue is empty.
-        """
-        return len(self._queue) == 0
-
-    def sort_by_cost(self):
-        """
-        Sort the queue by the node costs.
-        """
-        self._queue.sort(key=lambda x: x.total_cost(), reverse=False)
+        self.add_list(node_list)
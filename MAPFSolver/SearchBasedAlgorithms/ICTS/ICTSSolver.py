@@ -2,6 +2,8 @@ from MAPFSolver.Utilities.AbstractSolver import AbstractSolver
 from MAPFSolver.Utilities.paths_processing import calculate_soc, calculate_makespan
 from MAPFSolver.SearchBasedAlgorithms.ICTS.ICTNode import ICTNode
 from MAPFSolver.SearchBasedAlgorithms.ICTS.ICTQueue import ICTQueue
+from MAPFSolver.SearchBasedAlgorithms.ICTS.MDDCache import MDDCache
+from MAPFSolver.SearchBasedAlgorithms.ICTS.PairwisePruning import PairwisePruning
 from threading import Thread, Event
 import time
 
@@ -13,6 +15,8 @@ class ICTSSolver(AbstractSolver):
       consists of a k-vector [C 1 , C 2 , . . . C k ] which represents all possible solutions in which the cost of the
       individual path of each agent a i is exactly C i.
     - The low-level performs a goal test on each of these tree nodes.
+    The MDDs of the agents are shared between the nodes with an MDD cache, bounded by the MDD cache size of the
+    settings. With the pairwise pruning, before the goal test of a node each pair of agents is checked alone.
     """
 
     def __init__(self, solver_settings):
@@ -25,6 +29,8 @@ class ICTSSolver(AbstractSolver):
         self._closed_list = None
         self._n_of_generated_nodes = 0
         self._n_of_expanded_nodes = 1
+        self._mdd_cache = None
+        self._pairwise_pruning = None
         self._solution = []
 
         self._stop_event = None
@@ -53,6 +59,14 @@ class ICTSSolver(AbstractSolver):
 
         output_infos = self.generate_output_infos(soc, makespan, self._n_of_generated_nodes, self._n_of_expanded_nodes,
                                                   time.time() - start)
+        if self._mdd_cache is not None:
+            output_infos["mdd_cache_hits"] = self._mdd_cache.get_n_of_hits()
+            output_infos["mdd_cache_misses"] = self._mdd_cache.get_n_of_misses()
+            output_infos["mdd_cache_hit_rate"] = self._mdd_cache.get_hit_rate()
+        if self._pairwise_pruning is not None:
+            output_infos["pairwise_pruned_nodes"] = self._pairwise_pruning.get_n_of_pruned_nodes()
+            output_infos["pairs_cache_hits"] = self._pairwise_pruning.get_n_of_cache_hits()
+            output_infos["pairs_cache_misses"] = self._pairwise_pruning.get_n_of_cache_misses()
         if verbose:
             print("Problem ended: ", output_infos)
 
@@ -68,7 +82,6 @@ class ICTSSolver(AbstractSolver):
         self.initialize_problem(problem_instance)
 
         while not self._frontier.is_empty():
-            self._frontier.sort_by_cost()
             cur_state = self._frontier.pop()
 
             if self._stop_event.is_set():
@@ -110,9 +123,19 @@ class ICTSSolver(AbstractSolver):
         self._n_of_generated_nodes = 1
         self._n_of_expanded_nodes = 0
 
-        starter_state = ICTNode(problem_instance, self._solver_settings)
+        self._mdd_cache = None
+        if self._solver_settings.get_mdd_cache_size() > 0:
+            self._mdd_cache = MDDCache(self._solver_settings.get_mdd_cache_size())
 
-        self._frontier.add(starter_state)
+        self._pairwise_pruning = None
+        if self._solver_settings.get_pairwise_pruning() is not None:
+            self._pairwise_pruning = PairwisePruning(problem_instance.get_map(), self._solver_settings)
+
+        starter_state = ICTNode(problem_instance, self._solver_settings, mdd_cache=self._mdd_cache,
+                                pairwise_pruning=self._pairwise_pruning)
+
+        if starter_state.has_costs_vector():
+            self._frontier.add(starter_state)
 
     def __str__(self):
         return "Increasing Cost Tree Solver using " + self._solver_settings.get_heuristic_str() + \
@@ -1,65 +1,90 @@
 from MAPFSolver.SearchBasedAlgorithms.ICTS.MDDNode import MDDNode
-from MAPFSolver.SearchBasedAlgorithms.ICTS.MDDQueue import MDDQueue
 
 
 class MDD:
     """
     Multi-value decision diagram (MDD) for a single agent. It is represented by a list of paths from the start to the
     goal.
+    It is built in two passes: a forward pass computes the layers of the positions reachable from the start at each time
+    step, with the positions of the previous layer they are reached from, and a backward pass keeps only the nodes from
+    which the goal is reached at the last time step. The forward layers don't depend on the cost, so the MDD of cost
+    c+1 can reuse the layers of the MDD of cost c of the same agent and expand only the new one.
     """
 
-    def __init__(self, problem_map, agent, cost, solver_settings):
+    def __init__(self, problem_map, agent, cost, solver_settings, previous_mdd=None):
         """
         Initialize the Multi-value Decision Diagram.
         :param problem_map: map of the problem.
         :param agent: agent involved.
         :param cost: maximum cost for which computing all the possible paths.
         :param solver_settings: settings of the solver
+        :param previous_mdd: if given, an MDD of the same agent whose forward layers are reused.
         """
         self._problem_map = problem_map
         self._agent = agent
         self._cost = cost
         self._solver_settings = solver_settings
 
-        self._nodes = MDDQueue()
+        self._layers = []
         self._root = None
         self._goal_node = None
 
-        self.build_mdd()
+        self.build_mdd(previous_mdd)
 
-    def build_mdd(self):
+    def build_mdd(self, previous_mdd=None):
         """
         Multi-value decision diagram for the specific agent.
+        :param previous_mdd: if given, an MDD of the same agent whose forward layers are reused.
+        :return: True if the goal is reached at the time step equal to the cost.
         """
-        self._root = MDDNode(self._problem_map, self._agent.get_goal(), self._agent.get_start())
-        self._nodes.add(self._root)
-
-        frontier = MDDQueue()
-        frontier.add(self._root)
-
-        while not frontier.is_empty():
-            frontier.sort_by_time_step()
-            cur_node = frontier.pop()
-
-            if cur_node.time_step() > self._cost:
-                return True
-
-            if cur_node.time_step() == self._cost:
-                if cur_node.goal_test():
-                    self._goal_node = cur_node
-                    build_children_descendant(cur_node)
-
-            expanded_nodes = cur_node.expand()
-
-            for node in expanded_nodes:
-                if self._nodes.contains_node(node):
-                    self._nodes.add_parent_to_node(node, cur_node)
-                else:
-                    frontier.add(node)
-                    self._nodes.add(node)
-
+        if previous_mdd is not None:
+            # The layers are never modified once built, so they are shared with the previous MDD. A negative cost,
+            # possible without stay at goal, keeps only the layer of the start.
+            self._layers = previous_mdd._layers[:max(self._cost, 0) + 1]
+        else:
+            self._layers = [{self._agent.get_start(): []}]
+        while len(self._layers) <= self._cost:
+            self._layers.append(self.expand_layer(self._layers[-1]))
+
+        goal = self._agent.get_goal()
+        # Backward pass: the positions of each layer from which the goal can be reached at the last time step.
+        useful_positions = [set() for _ in self._layers]
+        if self._cost >= 0 and goal in self._layers[self._cost]:
+            useful_positions[self._cost].add(goal)
+        for time_step in range(self._cost, 0, -1):
+            for pos in useful_positions[time_step]:
+                useful_positions[time_step - 1].update(self._layers[time_step][pos])
+
+        self._root = MDDNode(self._problem_map, goal, self._agent.get_start())
+        nodes = {self._agent.get_start(): self._root}
+        for time_step in range(1, self._cost + 1):
+            layer_nodes = dict()
+            for pos, parent_positions in self._layers[time_step].items():
+                if pos in useful_positions[time_step]:
+                    parents = [nodes[parent_pos] for parent_pos in parent_positions]
+                    node = MDDNode(self._problem_map, goal, pos, time_step=time_step, parent=parents)
+                    for parent in parents:
+                        parent.add_child(node)
+                    layer_nodes[pos] = node
+            nodes = layer_nodes
+
+        if self._cost >= 0 and goal in useful_positions[self._cost]:
+            self._goal_node = nodes[goal]
+            return True
         return False
 
+    def expand_layer(self, layer):
+        """
+        Return the layer of the positions reachable in one time step from the positions of the given layer. Each
+        position is mapped to the list of positions of the given layer it is reached from.
+        :param layer: dictionary with the positions of a layer as keys.
+        """
+        next_layer = dict()
+        for pos in layer:
+            for next_pos in self._problem_map.moves(pos):  # Wait move included
+                next_layer.setdefault(next_pos, []).append(pos)
+        return next_layer
+
     def get_paths(self):
         """
         Returns all the possible paths of length equal to the cost.
@@ -78,24 +103,9 @@ class MDD:
         """
         return self._cost
 
-
-def build_children_descendant(goal_node):
-    """
-    Complete the building of the MDD. It adds at each node in the final MDD the children starting from the bottom.
-    Because we need to keep only the nodes involved in paths that ends in the goal state. So we construct this MDD
-    by starting from the bottom and going up, adding for each node the list of valid children. Since we start from
-    we just need to add the nodes we encounter going up.
-    This in order to have a way to going down through the nodes starting from the root.
-    """
-    node = goal_node
-
-    while node.parent() is not None and len(node.parent()) == 1:
-        node.parent()[0].add_child(node)
-        node = node.parent()[0]
-
-    if node.parent() is not None:
-        if len(node.parent()) > 1:
-            for parent in node.parent():
-                parent.add_child(node)
-                build_children_descendant(parent)
+    def get_n_of_nodes(self):
+        """
+        Returns the number of positions of the forward layers of this MDD, an upper bound of the number of its nodes.
+        """
+        return sum(len(layer) for layer in self._layers)
 
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+
+
+class MDDCache:
+    """
+    Bounded cache of the MDDs built by the ICT nodes. The MDD of an agent depends only on the agent and on his cost, and
+    the nodes of the ICT share most of them: the children of [C1, C2, ..] differ from it only in the cost of one agent.
+    So the MDDs are stored by (agent id, cost) and an ICT node builds only the ones not already in the cache.
+    The size of the MDDs grows with the cost, so the cache is bounded by the total number of MDD nodes stored: when it
+    is exceeded the least recently used MDDs are evicted. The MDDs are not modified once built, so they can be shared.
+    The ICT nodes release their MDDs after the goal test, so the cache is the only owner of the MDDs kept between the
+    nodes and the bound is a bound of their memory.
+    """
+
+    def __init__(self, max_n_of_nodes):
+        """
+        Initialize an empty cache.
+        :param max_n_of_nodes: maximum number of MDD nodes stored.
+        """
+        self._max_n_of_nodes = max_n_of_nodes
+        self._mdds = OrderedDict()
+        self._n_of_nodes = 0
+        self._n_of_hits = 0
+        self._n_of_misses = 0
+
+    def get(self, agent_id, cost):
+        """
+        Return the MDD of the agent with the given cost, None if it is not in the cache.
+        :param agent_id: id of the agent.
+        :param cost: cost of the MDD.
+        """
+        key = (agent_id, cost)
+        mdd = self._mdds.get(key)
+        if mdd is None:
+            self._n_of_misses += 1
+            return None
+        self._mdds.move_to_end(key)
+        self._n_of_hits += 1
+        return mdd
+
+    def peek(self, agent_id, cost):
+        """
+        Return the MDD of the agent with the given cost, None if it is not in the cache. Differently from get() the
+        request is not counted, since it is not an MDD needed by a node.
+        :param agent_id: id of the agent.
+        :param cost: cost of the MDD.
+        """
+        key = (agent_id, cost)
+        mdd = self._mdds.get(key)
+        if mdd is not None:
+            self._mdds.move_to_end(key)
+        return mdd
+
+    def add(self, agent_id, cost, mdd):
+        """
+        Store the MDD of the agent with the given cost, evicting the least recently used MDDs until the number of MDD
+        nodes stored is in the bound. The MDD just added is never evicted.
+        :param agent_id: id of the agent.
+        :param cost: cost of the MDD.
+        :param mdd: MDD to store.
+        """
+        key = (agent_id, cost)
+        if key in self._mdds:
+            self._n_of_nodes -= self._mdds.pop(key).get_n_of_nodes()
+        self._mdds[key] = mdd
+        self._n_of_nodes += mdd.get_n_of_nodes()
+        while self._n_of_nodes > self._max_n_of_nodes and len(self._mdds) > 1:
+            _, evicted_mdd = self._mdds.popitem(last=False)
+            self._n_of_nodes -= evicted_mdd.get_n_of_nodes()
+
+    def get_n_of_hits(self):
+        """
+        Return the number of MDDs taken from the cache.
+        """
+        return self._n_of_hits
+
+    def get_n_of_misses(self):
+        """
+        Return the number of MDDs not found in the cache, and so built.
+        """
+        return self._n_of_misses
+
+    def get_hit_rate(self):
+        """
+        Return the fraction of the requests found in the cache, zero if there are no requests.
+        """
+        n_of_requests = self._n_of_hits + self._n_of_misses
+        return self._n_of_hits / n_of_requests if n_of_requests > 0 else 0
@@ -19,8 +19,7 @@ class MDDNode:
         Expand the current state. It computes all the possible moves from that position.
         :return: the list of possible next states.
         """
-        possible_moves = self._problem_map.neighbours(self._position)
-        possible_moves.insert(0, self._position)   # Wait move
+        possible_moves = self._problem_map.moves(self._position)   # Wait move included
 
         expanded_nodes_list = []
         for pos in possible_moves:
@@ -0,0 +1,191 @@
+from MAPFSolver.SearchBasedAlgorithms.ICTS.TotalMDDNode import TotalMDDNode
+
+
+class PairwisePruning:
+    """
+    Pruning of the ICT nodes done before the search of the k-agents TotalMDD. If two agents alone can't reach their
+    goals without conflicts following their MDDs, the k agents can't either, so the node is not a goal node.
+    - Simple pairwise pruning: for each pair of agents the joint MDD of the two agents is searched, and the node is
+      pruned as soon as a pair has no joint solution.
+    - Enhanced pairwise pruning: the search of each pair is completed, and only the nodes of the MDDs of the two agents
+      that belong to a joint solution of the pair are kept. The nodes kept for an agent are the ones kept by all his
+      pairs, without the ones that are no more reachable from the start or can't reach the goal. The TotalMDD search is
+      then restricted to them, and the node is pruned if an agent can't reach his goal.
+    The result of a pair depends only on the two agents and on their costs, so it is cached and shared by all the ICT
+    nodes.
+    """
+
+    def __init__(self, problem_map, solver_settings):
+        """
+        Initialize the pruning.
+        :param problem_map: map of the problem.
+        :param solver_settings: settings of the solver, they define which pruning is done.
+        """
+        self._problem_map = problem_map
+        self._solver_settings = solver_settings
+        self._enhanced = solver_settings.get_pairwise_pruning() == "Enhanced"
+        self._pairs_cache = dict()
+        self._n_of_pruned_nodes = 0
+        self._n_of_cache_hits = 0
+        self._n_of_cache_misses = 0
+
+    def prune(self, agents, path_costs_vector, mdd_vector, stop_event):
+        """
+        Check all the pairs of agents of an ICT node.
+        :param agents: list of the agents.
+        :param path_costs_vector: cost of each agent in the node.
+        :param mdd_vector: MDD of each agent in the node.
+        :param stop_event: if set the checks are interrupted and the node is not pruned.
+        :return: None if the node is pruned. Otherwise the list with the set of (position, time step) of the MDD nodes
+        that the TotalMDD search can use for each agent, or None for an agent if all of them can be used.
+        """
+        allowed_nodes = [None] * len(agents)
+        for i in range(len(agents)):
+            for j in range(i + 1, len(agents)):
+                if stop_event.is_set():
+                    return allowed_nodes
+                pair_result = self.check_pair((agents[i].get_id(), path_costs_vector[i]),
+                                              (agents[j].get_id(), path_costs_vector[j]), mdd_vector[i], mdd_vector[j],
+                                              stop_event)
+                if pair_result is None:
+                    self._n_of_pruned_nodes += 1
+                    return None
+                if self._enhanced:
+                    for index, kept_nodes in zip((i, j), pair_result):
+                        allowed_nodes[index] = kept_nodes if allowed_nodes[index] is None else \
+                            allowed_nodes[index] & kept_nodes
+
+        if self._enhanced:
+            for i, mdd in enumerate(mdd_vector):
+                if allowed_nodes[i] is not None:
+                    allowed_nodes[i] = self.remove_unreachable_nodes(mdd, allowed_nodes[i])
+                    if not allowed_nodes[i]:
+                        self._n_of_pruned_nodes += 1
+                        return None
+        return allowed_nodes
+
+    def check_pair(self, first_key, second_key, first_mdd, second_mdd, stop_event):
+        """
+        Return the result of the pair of agents, taking it from the cache if already computed.
+        :param first_key: (agent id, cost) of the first agent.
+        :param second_key: (agent id, cost) of the second agent.
+        :param first_mdd: MDD of the first agent.
+        :param second_mdd: MDD of the second agent.
+        :param stop_event: if set the search is interrupted.
+        :return: None if the pair has no joint solution. Otherwise, with the enhanced pruning, the tuple with the sets of
+        the MDD nodes of the two agents that belong to a joint solution.
+        """
+        key = (first_key, second_key)
+        if key in self._pairs_cache:
+            self._n_of_cache_hits += 1
+            return self._pairs_cache[key]
+        self._n_of_cache_misses += 1
+
+        pair_result = self.search_pair(first_mdd, second_mdd, stop_event)
+        if not stop_event.is_set():
+            self._pairs_cache[key] = pair_result
+        return pair_result
+
+    def search_pair(self, first_mdd, second_mdd, stop_event):
+        """
+        Search the joint MDD of the two agents layer by layer, with the same conflicts and goal test of the TotalMDD
+        search. With the simple pruning it stops at the first joint goal node. With the enhanced pruning all the joint
+        nodes are generated, and the ones from which a joint goal node is reached are found going backward.
+        :return: None if the pair has no joint solution. Otherwise, with the enhanced pruning, the tuple with the sets of
+        the MDD nodes of the two agents that belong to a joint solution.
+        """
+        first_cost, second_cost = first_mdd.get_cost(), second_mdd.get_cost()
+        max_cost = max(first_cost, second_cost)
+        root = TotalMDDNode(self._problem_map, self._solver_settings,
+                            [first_mdd.get_root_node(), second_mdd.get_root_node()])
+
+        layer = {root.get_key(): root}
+        parents = dict()
+        goal_keys = []
+        for time_step in range(max_cost + 1):
+            next_layer = dict()
+            for key, joint_node in layer.items():
+                if stop_event.is_set():
+                    return () if self._enhanced else True
+                if joint_node.goal_test():
+                    if not self._enhanced:
+                        return True
+                    goal_keys.append(key)
+                if time_step == max_cost:
+                    continue
+                for child in joint_node.expand():
+                    child_key = child.get_key()
+                    if child_key not in next_layer:
+                        next_layer[child_key] = child
+                        parents[child_key] = [key]
+                    else:
+                        parents[child_key].append(key)
+            layer = next_layer
+
+        if not goal_keys:
+            return None
+
+        useful_keys = set(goal_keys)
+        stack = list(goal_keys)
+        while stack:
+            for parent_key in parents.get(stack.pop(), []):
+                if parent_key not in useful_keys:
+                    useful_keys.add(parent_key)
+                    stack.append(parent_key)
+
+        # The dummy nodes, after the cost of an agent, are not in his MDD.
+        first_kept_nodes = frozenset((positions[0], time_step) for time_step, positions in useful_keys
+                                     if time_step <= first_cost)
+        second_kept_nodes = frozenset((positions[1], time_step) for time_step, positions in useful_keys
+                                      if time_step <= second_cost)
+        return first_kept_nodes, second_kept_nodes
+
+    def remove_unreachable_nodes(self, mdd, allowed_nodes):
+        """
+        Return the allowed nodes of the MDD that are reachable from the root through allowed nodes and from which the
+        goal position is reachable through allowed nodes. The set is empty if the agent can't reach his goal.
+        :param mdd: MDD of the agent.
+        :param allowed_nodes: set of (position, time step) of the allowed MDD nodes.
+        """
+        root = mdd.get_root_node()
+        if (root.position(), root.time_step()) not in allowed_nodes:
+            return frozenset()
+
+        layers = [[root]]
+        reached = {(root.position(), root.time_step())}
+        while layers[-1]:
+            next_layer = []
+            for node in layers[-1]:
+                for child in node.get_children():
+                    child_key = (child.position(), child.time_step())
+                    if child_key in allowed_nodes and child_key not in reached:
+                        reached.add(child_key)
+                        next_layer.append(child)
+            layers.append(next_layer)
+
+        useful_nodes = set()
+        for layer in reversed(layers):
+            for node in layer:
+                if node.goal_test() or any((child.position(), child.time_step()) in useful_nodes
+                                           for child in node.get_children()):
+                    useful_nodes.add((node.position(), node.time_step()))
+        return frozenset(useful_nodes)
+
+    def get_n_of_pruned_nodes(self):
+        """
+        Return the number of ICT nodes pruned.
+        """
+        return self._n_of_pruned_nodes
+
+    def get_n_of_cache_hits(self):
+        """
+        Return the number of pairs results taken from the cache.
+        """
+        return self._n_of_cache_hits
+
+    def get_n_of_cache_misses(self):
+        """
+        Return the number of pairs searched.
+        """
+        return self._n_of_cache_misses
+
@@ -8,17 +8,30 @@ class TotalMDD:
     It also consider only the feasible nodes, by checking the presence of conflicts.
     """
 
-    def __init__(self, problem_map, solver_settings, list_of_mdd, stop_event):
+    def __init__(self, problem_map, solver_settings, list_of_mdd, stop_event, allowed_nodes=None):
+        """
+        Initialize the total MDD and search a solution.
+        :param problem_map: map of the problem.
+        :param solver_settings: settings of the solver.
+        :param list_of_mdd: MDD of each agent.
+        :param stop_event: if set the search is interrupted.
+        :param allowed_nodes: if given, for each agent the set of (position, time step) of the MDD nodes that can be
+        used, or None if all of them can be used. (See PairwisePruning)
+        """
         self._problem_map = problem_map
         self._solver_settings = solver_settings
         self._list_of_mdd = list_of_mdd
         self._cost = max([mdd.get_cost() for mdd in self._list_of_mdd])
 
         self._stop_event = stop_event
+        self._allowed_nodes = allowed_nodes
 
         self._solution = []
         self._nodes = MDDQueue()
-        self.build_total_mdd()
+        if self._solver_settings.use_depth_first_total_mdd():
+            self.search_depth_first()
+        else:
+            self.build_total_mdd()
 
     def build_total_mdd(self):
         """
@@ -29,7 +42,8 @@ class TotalMDD:
         for agent_mdd in self._list_of_mdd:
             list_of_root_mdd_nodes.append(agent_mdd.get_root_node())
 
-        root = TotalMDDNode(self._problem_map, self._solver_settings, list_of_root_mdd_nodes)
+        root = TotalMDDNode(self._problem_map, self._solver_settings, list_of_root_mdd_nodes,
+                            allowed_nodes=self._allowed_nodes)
         self._nodes.add(root)
 
         frontier = MDDQueue()
@@ -58,6 +72,46 @@ class TotalMDD:
                     frontier.add(node)
                     self._nodes.add(node)
 
+    def search_depth_first(self):
+        """
+        Search a solution depth-first, stopping at the first one. The children of each node are generated lazily, one
+        at a time, so only the path from the root and the current child of each of its nodes are kept. The keys of the
+        nodes already expanded without reaching a solution are remembered, so that the same joint positions at the same
+        time step are not expanded again from another parent.
+        """
+        list_of_root_mdd_nodes = []
+        for agent_mdd in self._list_of_mdd:
+            list_of_root_mdd_nodes.append(agent_mdd.get_root_node())
+
+        root = TotalMDDNode(self._problem_map, self._solver_settings, list_of_root_mdd_nodes,
+                            allowed_nodes=self._allowed_nodes)
+        if root.goal_test():
+            self._solution = root.get_paths_to_root()
+            return
+
+        dead_ends = set()
+        stack = [(root, root.generate_children())]
+        while stack:
+            if self._stop_event.is_set():
+                break
+
+            cur_node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                dead_ends.add(cur_node.get_key())
+                stack.pop()
+                continue
+
+            if child.get_key() in dead_ends:
+                continue
+
+            if child.goal_test():
+                self._solution = child.get_paths_to_root()
+                return
+
+            if child.time_step() < self._cost:
+                stack.append((child, child.generate_children()))
+
     def get_solution(self):
         """
         Returns all the possible paths of length equal to their respective cost.
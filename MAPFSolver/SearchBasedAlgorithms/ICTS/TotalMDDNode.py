@@ -4,38 +4,55 @@ import itertools
 
 class TotalMDDNode:
 
-    def __init__(self, problem_map, solver_settings, list_of_mdd_nodes, time_step=0, parent=None):
+    def __init__(self, problem_map, solver_settings, list_of_mdd_nodes, time_step=0, parent=None, allowed_nodes=None):
+        """
+        Initialize the node.
+        :param problem_map: map of the problem.
+        :param solver_settings: settings of the solver.
+        :param list_of_mdd_nodes: MDD node of each agent.
+        :param time_step: time step of the node.
+        :param parent: list of parents.
+        :param allowed_nodes: if given, for each agent the set of (position, time step) of the MDD nodes that can be
+        used, or None if all of them can be used. The children keep the same.
+        """
         self._problem_map = problem_map
         self._solver_settings = solver_settings
         self._list_of_mdd_nodes = list_of_mdd_nodes
         self._time_step = time_step
         self._parent = parent
+        self._allowed_nodes = allowed_nodes
 
     def expand(self):
         """
         Expand the current state. For every mdd of the agents it returns their children and compute a cartesian product
-        in order to get all the possible next states. It is also checked that those states are without conflict.
+        in order to get all the possible next states. It is also checked that those states are without conflict. If some
+        nodes of the MDDs are not allowed, they are not used.
         :return: the list of possible next states.
         """
+        return list(self.generate_children())
+
+    def generate_children(self):
+        """
+        Generate one at a time the possible next states returned by expand(), without building the whole cartesian
+        product.
+        """
         candidate_list = []  # list of list of children. (One for each agent)
-        for single_mdd_node in self._list_of_mdd_nodes:
+        for i, single_mdd_node in enumerate(self._list_of_mdd_nodes):
             single_children_list = single_mdd_node.get_children()
-            if not single_children_list:
+            if single_children_list and self._allowed_nodes is not None and self._allowed_nodes[i] is not None:
+                single_children_list = [child for child in single_children_list
+                                        if (child.position(), child.time_step()) in self._allowed_nodes[i]]
+            elif not single_children_list:
                 # Add a dummy node
                 single_children_list = [MDDNode(self._problem_map, single_mdd_node.goal_position(),
                                                 single_mdd_node.position(), time_step=self._time_step+1,
                                                 parent=[single_mdd_node], dummy=True)]
             candidate_list.append(single_children_list)
 
-        candidate_state_list = list(itertools.product(*candidate_list))
-
-        free_conflict_states = []
-        for multi_state in candidate_state_list:
+        for multi_state in itertools.product(*candidate_list):
             if not self.is_conflict(multi_state):
-                free_conflict_states.append(TotalMDDNode(self._problem_map, self._solver_settings, multi_state,
-                                                         time_step=self._time_step+1, parent=[self]))
-
-        return free_conflict_states
+                yield TotalMDDNode(self._problem_map, self._solver_settings, multi_state, time_step=self._time_step+1,
+                                   parent=[self], allowed_nodes=self._allowed_nodes)
 
     def is_conflict(self, multi_state):
         """
@@ -121,6 +138,12 @@ class TotalMDDNode:
         """
         return self._list_of_mdd_nodes
 
+    def get_key(self):
+        """
+        Return the key of the node, given by its time step and the positions of the agents.
+        """
+        return self._time_step, tuple(mdd_node.position() for mdd_node in self._list_of_mdd_nodes)
+
     def equal(self, other):
         """
         Return True if the total mdd node and the given total mdd node has the same positions and the same time
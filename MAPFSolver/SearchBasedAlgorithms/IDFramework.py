@@ -1,6 +1,7 @@
 import copy
 
 from MAPFSolver.Utilities.AbstractSolver import AbstractSolver
+from MAPFSolver.Utilities.ConflictIndex import ConflictIndex
 from MAPFSolver.Utilities.ProblemInstance import ProblemInstance
 from MAPFSolver.Utilities.paths_processing import *
 from MAPFSolver.Utilities.useful_functions import get_solver
@@ -20,13 +21,14 @@ class IDFramework(AbstractSolver):
         will be the whole sum counting all the iterations.
         :param solver_str: string of the solver to put on top of ID.
         ["Cooperative A*", "A*", "A* with Operator Decomposition", "Increasing Cost Tree Search",
-        "Conflict Based Search", "M*"]
+        "Conflict Based Search", "Enhanced Conflict Based Search", "M*"]
         :param solver_settings: settings of the solver.
         """
         super().__init__(solver_settings)
         self._solver_str = solver_str
         self._problems = []
         self._paths = []
+        self._conflict_index = None
         self._biggest_subset = 1
         self._n_of_generated_nodes = 0
         self._n_of_expanded_nodes = 0
@@ -78,8 +80,7 @@ class IDFramework(AbstractSolver):
         if not self.initialize_paths(problem_instance):
             return False
 
-        conflict = check_conflicts(self._paths, self._solver_settings.stay_at_goal(),
-                                   self._solver_settings.is_edge_conflict())
+        conflict = self.check_conflicts()
         while conflict is not None:
 
             if self._stop_event.is_set():
@@ -90,11 +91,19 @@ class IDFramework(AbstractSolver):
             if not self.update_merged_paths(merged_problem):
                 return
 
-            conflict = check_conflicts(self._paths, self._solver_settings.stay_at_goal(),
-                                       self._solver_settings.is_edge_conflict())
+            conflict = self.check_conflicts()
 
         self._solution = self._paths
 
+    def check_conflicts(self):
+        """
+        Return the first two conflicting agents. The conflict index is updated only with the paths changed since the
+        last check.
+        :return: the ids of two conflicting agents, None if there are no conflicts.
+        """
+        self._conflict_index.set_paths(self._paths)
+        return self._conflict_index.get_first_conflict()
+
     def initialize_paths(self, problem_instance):
         """
         Initialize the groups with singleton groups. The list problem will contains the single agent problem for each
@@ -102,6 +111,8 @@ class IDFramework(AbstractSolver):
         :param problem_instance: instance of the problem to solve.
         :return:
         """
+        self._conflict_index = ConflictIndex(self._solver_settings.stay_at_goal(),
+                                             self._solver_settings.is_edge_conflict())
         for agent in problem_instance.get_original_agents():
             self._problems.append(ProblemInstance(problem_instance.get_map(), [agent]))
 
@@ -220,8 +231,7 @@ class IDFramework(AbstractSolver):
                 if not self.update_merged_paths(merged_problem):
                     return False
 
-            conflict = check_conflicts(self._paths, self._solver_settings.stay_at_goal(),
-                                       self._solver_settings.is_edge_conflict())
+            conflict = self.check_conflicts()
 
             if conflict is None:
                 break
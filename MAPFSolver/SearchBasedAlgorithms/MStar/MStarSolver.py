@@ -1,7 +1,7 @@
 from MAPFSolver.SearchBasedAlgorithms.MStar.MStarStatesQueue import MStarStatesQueue
 from MAPFSolver.Utilities.AbstractSolver import AbstractSolver
 from MAPFSolver.Utilities.SingleAgentState import SingleAgentState
-from MAPFSolver.Utilities.StatesQueue import StatesQueue
+from MAPFSolver.Utilities.HeapQueue import HeapQueue
 from MAPFSolver.Utilities.paths_processing import calculate_soc, calculate_makespan
 from MAPFSolver.SearchBasedAlgorithms.MStar.MStarState import MStarState
 from threading import Thread, Event
@@ -79,7 +79,6 @@ class MStarSolver(AbstractSolver):
         self.initialize_problem(problem_instance)
 
         while not self._frontier.is_empty():
-            self._frontier.sort_by_f_value()
             cur_state = self._frontier.pop()
 
             if self._stop_event.is_set():
@@ -127,7 +126,7 @@ class MStarSolver(AbstractSolver):
         Initialize the frontier and the heuristic for the given problem.
         """
         self._solver_settings.initialize_heuristic(problem_instance)
-        self._frontier = StatesQueue()
+        self._frontier = HeapQueue(hash_function=lambda x: x.state_key())
         self._closed_list = MStarStatesQueue()
         self._n_of_generated_nodes = 1
         self._n_of_expanded_nodes = 0
@@ -2,6 +2,7 @@ from .AStar.AStarSolver import AStarSolver
 from .AStarOD.AStarODSolver import AStarODSolver
 from .CBS.CBSSolver import CBSSolver
 from .CooperativeAStar.CooperativeAStarSolver import CooperativeAStarSolver
+from .ECBS.ECBSSolver import ECBSSolver
 from .ICTS.ICTSSolver import ICTSSolver
 from .MStar.MStarSolver import MStarSolver
 from .IDFramework import IDFramework
@@ -1,6 +1,8 @@
 from .ProblemInstance import ProblemInstance
 from .SingleAgentState import SingleAgentState
-from .StatesQueue import StatesQueue
+from .ClosedList import ClosedList
+from .FocalQueue import FocalQueue
+from .HeapQueue import HeapQueue
 from .Agent import Agent
 
 
@@ -19,6 +21,8 @@ class AStar:
         self._frontier = None
         self._closed_list = None  # Keep all the states already expanded
         self._closed_list_of_positions = None  # Keep all the positions already visited
+        self._n_of_conflicts_avoided = 0
+        self._lower_bound = None
 
     def find_path(self, problem_map, start_pos, goal_pos):
         """
@@ -33,7 +37,6 @@ class AStar:
         self.initialize_problem(problem_map, start_pos, goal_pos)
 
         while not self._frontier.is_empty():
-            self._frontier.sort_by_f_value()
             cur_state = self._frontier.pop()
 
             if cur_state.goal_test():
@@ -45,9 +48,9 @@ class AStar:
                 return path
 
             if cur_state.get_position() not in self._closed_list_of_positions:
-                self._closed_list_of_positions.append(cur_state.get_position())
+                self._closed_list_of_positions.add(cur_state.get_position())
                 expanded_nodes = cur_state.expand()
-                self._frontier.add_list_of_states(expanded_nodes)
+                self._frontier.add_list(expanded_nodes)
 
         return []
 
@@ -67,7 +70,6 @@ class AStar:
         self.initialize_problem(problem_map, start_pos, goal_pos)
 
         while not self._frontier.is_empty():
-            self._frontier.sort_by_f_value()
             cur_state = self._frontier.pop()
 
             if cur_state.f_value() > 80:
@@ -119,30 +121,43 @@ class AStar:
                         else:
                             expanded_nodes_no_conflicts.append(state)
 
-                self._frontier.add_list_of_states(expanded_nodes_no_conflicts)
+                self._frontier.add_list(expanded_nodes_no_conflicts)
 
         return []
 
-    def find_path_with_constraints(self, problem_map, start_pos, goal_pos, vertex_constraints, edge_constraints=None):
+    def find_path_with_constraints(self, problem_map, start_pos, goal_pos, constraint_table, conflict_index=None,
+                                   agent_id=None):
         """
-        It computes the path from his start position to his goal position using the A* algorithm with reservation table.
-        It return the path as list of (x, y) positions. Closed lists are used to accelerate the process.
+        It computes the path from his start position to his goal position using the A* algorithm with a table of
+        constraints. It return the path as list of (x, y) positions. Closed lists are used to accelerate the process.
+        If a conflict index with the paths of the other agents is given, it is used as conflict avoidance table: between
+        the states with the same f-value the ones with less conflicts with the other agents are expanded first, so
+        between the optimal paths it returns the one with the fewest conflicts.
         :param problem_map: map of the problem.
         :param start_pos: start position of the agent.
         :param goal_pos: goal position of the agent.
-        :param vertex_constraints: list of vertex constraints.
-        :param edge_constraints: list of edge constraints.
+        :param constraint_table: ConstraintTable with the vertex, edge and positive constraints of the agent.
+        :param conflict_index: ConflictIndex with the paths of the other agents, used as conflict avoidance table.
+        :param agent_id: index of the agent in the conflict index. Needed only if the conflict index is given.
         :return: solution path.
         """
-        self.initialize_problem(problem_map, start_pos, goal_pos)
-        if edge_constraints is None:
-            edge_constraints = []
+        if conflict_index is None:
+            self.initialize_problem(problem_map, start_pos, goal_pos)
+        else:
+            self.initialize_problem(problem_map, start_pos, goal_pos, priority_function=conflicts_priority)
+        self._n_of_conflicts_avoided = 0
+        first_completed_conflicts = dict()  # For each f-value the conflicts of the first completed state generated.
+        # After the last constraint the goal, if reachable, is reached visiting each position at most once, so the
+        # states after this time step can be discarded. Without it the search would never end if there is no path.
+        max_time_step = self.get_max_time_step(problem_map, constraint_table)
 
         while not self._frontier.is_empty():
-            self._frontier.sort_by_f_value()
             cur_state = self._frontier.pop()
 
             if cur_state.is_completed():
+                if conflict_index is not None:
+                    self._n_of_conflicts_avoided = first_completed_conflicts.get(cur_state.f_value(), 0) - \
+                                                   cur_state.n_of_conflicts()
                 return cur_state.get_path_to_root()
 
             if not self._closed_list.contains_state(cur_state):
@@ -151,35 +166,156 @@ class AStar:
 
                 expanded_nodes_no_conflicts = []
                 for state in expanded_nodes:
-                    if (state.get_position(), state.time_step()) not in vertex_constraints:
-                        if (state.parent().get_position(), state.get_position(), state.time_step()) not in \
-                                edge_constraints or edge_constraints is None:
-                            if self._solver_settings.stay_at_goal() and state.goal_test():
-                                temp_bool = True
-                                for pos, ts in vertex_constraints:
-                                    if pos == state.get_position() and ts > state.time_step():
-                                        temp_bool = False
-                                if temp_bool:
-                                    expanded_nodes_no_conflicts.append(state)
-                            else:
-                                expanded_nodes_no_conflicts.append(state)
-                self._frontier.add_list_of_states(expanded_nodes_no_conflicts)
+                    if state.time_step() > max_time_step or self.violates_constraints(cur_state, state,
+                                                                                      constraint_table):
+                        continue
+                    if conflict_index is not None:
+                        self.count_conflicts(cur_state, state, conflict_index, agent_id)
+                        if state.is_completed():
+                            first_completed_conflicts.setdefault(state.f_value(), state.n_of_conflicts())
+                    expanded_nodes_no_conflicts.append(state)
+                self._frontier.add_list(expanded_nodes_no_conflicts)
+
+        return []
+
+    def find_path_with_focal_search(self, problem_map, start_pos, goal_pos, constraint_table, conflict_index, agent_id,
+                                    suboptimality_factor):
+        """
+        It computes a bounded-suboptimal path from his start position to his goal position with a focal search, used
+        by the low level of ECBS. The open list is ordered by f-value, while the focal list contains the states with
+        f-value at most w times the lowest one in the open list, ordered by number of conflicts with the other agents.
+        The cost of the path returned is at most w times the lower bound of the cost of the optimal path that respects
+        the constraints, see get_lower_bound().
+        :param problem_map: map of the problem.
+        :param start_pos: start position of the agent.
+        :param goal_pos: goal position of the agent.
+        :param constraint_table: ConstraintTable with the constraints of the agent.
+        :param conflict_index: ConflictIndex with the paths of the other agents, used to count the conflicts.
+        :param agent_id: index of the agent in the conflict index.
+        :param suboptimality_factor: factor w >= 1 of the bound on the cost of the path.
+        :return: solution path.
+        """
+        self.initialize_problem(problem_map, start_pos, goal_pos,
+                                frontier=FocalQueue(suboptimality_factor, focal_priority, lambda x: x.f_value()))
+        self._lower_bound = None
+        max_time_step = self.get_max_time_step(problem_map, constraint_table)
+
+        while not self._frontier.is_empty():
+            cur_state = self._frontier.pop()
+
+            if cur_state.is_completed():
+                self._lower_bound = self._frontier.get_lower_bound()
+                if not self._solver_settings.stay_at_goal():
+                    # The agent completes his task at least at the time step goal occupation time, so the paths cost
+                    # at least one in calculate_soc() even if the agent starts in his goal with g-value 0.
+                    self._lower_bound = max(self._lower_bound, 1)
+                return cur_state.get_path_to_root()
+
+            if not self._closed_list.contains_state(cur_state):
+                self._closed_list.add(cur_state)
+                expanded_nodes = cur_state.expand()
+
+                expanded_nodes_no_conflicts = []
+                for state in expanded_nodes:
+                    if state.time_step() > max_time_step or self.violates_constraints(cur_state, state,
+                                                                                      constraint_table):
+                        continue
+                    self.count_conflicts(cur_state, state, conflict_index, agent_id)
+                    expanded_nodes_no_conflicts.append(state)
+                self._frontier.add_list(expanded_nodes_no_conflicts)
 
         return []
 
-    def initialize_problem(self, problem_map, start_pos, goal_pos):
+    def get_max_time_step(self, problem_map, constraint_table):
+        """
+        Return the last time step of the states to expand. After the last constraint the goal, if reachable, is reached
+        visiting each position at most once, so the states after this time step can be discarded. Without it the search
+        would never end if there is no path.
+        """
+        return constraint_table.get_last_constraint_time() + problem_map.get_compiled_map().get_n_of_cells() + \
+            self._solver_settings.get_goal_occupation_time()
+
+    def violates_constraints(self, cur_state, state, constraint_table):
+        """
+        Return True if the move from the current state to the given state violates the constraints of the agent.
+        :param cur_state: state expanded.
+        :param state: child state.
+        :param constraint_table: ConstraintTable with the constraints of the agent.
+        """
+        pos, ts = state.get_position(), state.time_step()
+        if constraint_table.is_vertex_constrained(pos, ts):
+            return True
+        if constraint_table.is_edge_constrained(cur_state.get_position(), pos, ts):
+            return True
+        if self._solver_settings.stay_at_goal() and state.goal_test() and \
+                constraint_table.get_latest_constraint_time(pos) >= ts:
+            # The agent can't stop in the goal if it's constrained in a following time step.
+            return True
+        if not self._solver_settings.stay_at_goal() and state.is_completed() and \
+                constraint_table.get_latest_positive_constraint_time() > ts:
+            # The agent can't disappear before the time steps in which it's forced to be somewhere.
+            return True
+        return False
+
+    def count_conflicts(self, cur_state, state, conflict_index, agent_id):
+        """
+        Set the number of conflicts of the given state with the other agents of the conflict index: the ones of the
+        current state plus the ones of the move. If the state is completed and the agent stays in his goal, also the
+        agents that will pass through his goal are counted.
+        """
+        pos, ts = state.get_position(), state.time_step()
+        n_of_conflicts = cur_state.n_of_conflicts() + \
+            conflict_index.count_move_conflicts(agent_id, cur_state.get_position(), pos, ts)
+        if state.is_completed() and self._solver_settings.stay_at_goal():
+            n_of_conflicts += conflict_index.count_goal_conflicts(agent_id, pos, ts)
+        state.set_n_of_conflicts(n_of_conflicts)
+
+    def get_n_of_conflicts_avoided(self):
+        """
+        Return an estimate of the conflicts avoided by the conflict avoidance table in the last search: the difference
+        between the conflicts of the first optimal path reached and the conflicts of the path returned.
+        """
+        return self._n_of_conflicts_avoided
+
+    def get_lower_bound(self):
+        """
+        Return the lower bound of the cost of the optimal path found by the last focal search: the highest f-value that
+        has been the lowest one in the open list. It is in the same units of the path costs of calculate_soc().
+        """
+        return self._lower_bound
+
+    def initialize_problem(self, problem_map, start_pos, goal_pos, priority_function=None, frontier=None):
         """
         Initialize the A* problem. Initialize the frontier and the closed lists.
         :param problem_map: map of the problem.
         :param start_pos: start position of the agent.
         :param goal_pos: goal position of the agent.
+        :param priority_function: priority of the states in the frontier. If None they are ordered by f-value and
+        h-value.
+        :param frontier: empty queue used as frontier. If None a HeapQueue with the given priority function is used.
         """
         problem_instance = ProblemInstance(problem_map, [Agent(0, start_pos, goal_pos)])
         self._solver_settings.initialize_heuristic(problem_instance)
 
-        self._frontier = StatesQueue()
-        self._closed_list = StatesQueue()
-        self._closed_list_of_positions = []
+        self._frontier = frontier if frontier is not None else HeapQueue(priority_function=priority_function)
+        self._closed_list = ClosedList()
+        self._closed_list_of_positions = set()
 
         starter_state = SingleAgentState(problem_map, goal_pos, start_pos, self._solver_settings)
         self._frontier.add(starter_state)
+
+
+def conflicts_priority(state):
+    """
+    Priority of the states when a conflict avoidance table is used: the f-value, then the number of conflicts with the
+    other agents and the h-value.
+    """
+    return state.f_value(), state.n_of_conflicts(), state.h_value()
+
+
+def focal_priority(state):
+    """
+    Priority of the states in the focal list of the focal search: the number of conflicts with the other agents, then
+    the f-value and the h-value.
+    """
+    return state.n_of_conflicts(), state.f_value(), state.h_value()
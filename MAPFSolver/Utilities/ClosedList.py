@@ -0,0 +1,77 @@
+class ClosedList:
+    """
+    Structure used as closed list of states. Can be used for both the single-agent state and the multi-agent state.
+    The states are kept in hash tables indexed by the state keys (position(s) and time step(s)) and by the positions keys
+    (only the position(s)), so the duplicate detection is done in constant time instead of scanning all the states.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new closed list.
+        """
+        self._states = dict()  # For each state key the list of states added with that key.
+        self._positions = dict()  # For each positions key the first state added with those positions.
+        self._size = 0
+
+    def add(self, item):
+        """
+        Add an item state to the closed list.
+        :param item: state to add.
+        """
+        self._states.setdefault(item.state_key(), []).append(item)
+        self._positions.setdefault(item.positions_key(), item)
+        self._size += 1
+
+    def add_list_of_states(self, state_list):
+        """
+        Add a list of states to the closed list.
+        :param state_list: state list to add.
+        """
+        for state in state_list:
+            self.add(state)
+
+    def is_empty(self):
+        """
+        Return True if the closed list is empty.
+        """
+        return self._size == 0
+
+    def size(self):
+        """
+        Return the number of states in the closed list.
+        """
+        return self._size
+
+    def contains_state(self, item):
+        """
+        Return True if the closed list already contains the exact same state. That is if exists already a state with the
+        same position(s) and same time step(s).
+        :param item: instance of State.
+        :return: True if the closed list contains the same state.
+        """
+        return item.state_key() in self._states
+
+    def contains_state_same_positions(self, item):
+        """
+        If the closed list already contains a state with the same position(s) then returns it. Otherwise it returns
+        None. It is different from the previous since it considers equals two states that has the same list of positions
+        but different time steps.
+        :param item: instance of State.
+        :return: the first equal state if present, otherwise None.
+        """
+        return self._positions.get(item.positions_key())
+
+    def contains_position(self, position):
+        """
+        If the closed list already contains a state with the same given position then returns it. Otherwise it returns
+        None. (Only if the closed list contains SingleAgentState instances)
+        :param position: (x,y) position.
+        :return: the first equal state if present, otherwise None.
+        """
+        return self._positions.get(position)
+
+    def __str__(self):
+        string = ''
+        for states in list(self._states.values())[:5]:
+            string = string + states[0].__str__()
+        return string
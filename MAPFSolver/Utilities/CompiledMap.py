@@ -0,0 +1,105 @@
+import numpy as np
+
+
+class CompiledMap:
+    """
+    Compiled representation of a map. The free cells are numbered once, in row-major order, and the moves available
+    from each cell are stored in flat arrays in compressed sparse row (CSR) style: the moves of the cell i are the
+    entries from offsets[i] to offsets[i+1] of the indices array. The first move of each cell is always the wait move,
+    followed by the horizontal and vertical neighbours in the same order of Map.neighbours().
+    The same moves are also kept as a flat list of (x, y) positions, so that a neighbours query is a single slice.
+    """
+
+    def __init__(self, problem_map):
+        """
+        Compile the given map.
+        :param problem_map: map to compile.
+        """
+        self._h = problem_map.get_height()
+        self._w = problem_map.get_width()
+
+        obstacles = problem_map.get_obstacles_xy()
+        if not isinstance(obstacles, (set, frozenset)):
+            obstacles = set(obstacles)
+
+        self._cells = [(x, y) for y in range(self._h) for x in range(self._w) if (x, y) not in obstacles]
+        self._ids = {pos: i for i, pos in enumerate(self._cells)}
+
+        self._ids_grid = np.full((self._h, self._w), -1, dtype=np.int32)
+        for i, (x, y) in enumerate(self._cells):
+            self._ids_grid[y, x] = i
+
+        offsets = [0]
+        moves = []
+        for pos in self._cells:
+            moves.append(pos)
+            moves.extend(problem_map.compute_neighbours(pos))
+            offsets.append(len(moves))
+
+        self._offsets_list = offsets
+        self._moves_list = moves
+        self._offsets = np.array(offsets, dtype=np.int32)
+        self._indices = np.array([self._ids[pos] for pos in moves], dtype=np.int32)
+
+    def neighbours(self, xy):
+        """
+        Returns the positions of the neighbours in (x, y) coordinates, without the wait move.
+        :param xy: is a tuple (x, y) representing a free position on the map.
+        :return: a list of (x, y) positions.
+        """
+        i = self._ids[xy]
+        return self._moves_list[self._offsets_list[i]+1:self._offsets_list[i+1]]
+
+    def moves(self, xy):
+        """
+        Returns the positions reachable in one time step from the given one. The first one is the wait move.
+        :param xy: is a tuple (x, y) representing a free position on the map.
+        :return: a list of (x, y) positions.
+        """
+        i = self._ids[xy]
+        return self._moves_list[self._offsets_list[i]:self._offsets_list[i+1]]
+
+    def contains(self, xy):
+        """
+        Return True if the given position is a free cell of the map.
+        :param xy: is a tuple (x, y).
+        """
+        return xy in self._ids
+
+    def get_id(self, xy):
+        """
+        Return the number of the given free cell.
+        :param xy: is a tuple (x, y) representing a free position on the map.
+        """
+        return self._ids[xy]
+
+    def get_position(self, cell_id):
+        """
+        Return the (x, y) position of the given cell number.
+        :param cell_id: number of the cell.
+        """
+        return self._cells[cell_id]
+
+    def get_n_of_cells(self):
+        """
+        Return the number of free cells.
+        """
+        return len(self._cells)
+
+    def get_offsets(self):
+        """
+        Return the CSR offsets array. The moves of the cell i are indices[offsets[i]:offsets[i+1]].
+        """
+        return self._offsets
+
+    def get_indices(self):
+        """
+        Return the CSR indices array, which stores the cell numbers of the moves of each cell (wait move included).
+        """
+        return self._indices
+
+    def get_ids_grid(self):
+        """
+        Return a (height x width) array with the number of each free cell and -1 for the obstacles.
+        """
+        return self._ids_grid
@@ -0,0 +1,329 @@
+import heapq
+
+
+class ConflictIndex:
+    """
+    Incremental index of the conflicts between a set of paths. When the path of an agent changes only the entries of
+    that path are updated, so the conflicts can be checked without scanning again the paths that didn't change and
+    without copying them.
+    The positions occupied by the agents are indexed by position and time step. If stay at goal is True, an agent that
+    reaches his goal occupies it from that time step on: instead of extending the path, this is kept as an interval
+    starting from the last time step of the path. The index keeps the set of positions where at least a vertex conflict
+    occurs and the set of edge conflicts. The first conflict returned is the same returned by the functions
+    check_conflicts() and check_conflicts_with_type() on the same paths.
+    """
+
+    def __init__(self, stay_at_goal, is_edge_conflict):
+        """
+        Initialize an empty index.
+        :param stay_at_goal: True if the paths has been computed with the assumption stay at goal.
+        :param is_edge_conflict: if True, edge conflicts are also checked.
+        """
+        self._stay_at_goal = stay_at_goal
+        self._is_edge_conflict = is_edge_conflict
+        self._paths = []
+        self._visits = dict()  # For each position a dictionary with the agents in that position at each time step.
+        self._parked = dict()  # For each goal position the agents that stay there and the time step they arrive.
+        self._moves = dict()  # For each (initial_position, final_position, time_step) the agents that do that move.
+        self._conflict_positions = set()
+        self._edge_conflicts = set()  # Edge conflicts as (agent_i, agent_j, time_step) with agent_i < agent_j.
+        self._agent_edge_conflicts = dict()
+
+    def set_paths(self, paths):
+        """
+        Update the index with the given list of paths. Only the paths that are not the same objects already indexed
+        for the same agents are updated.
+        :param paths: list of paths, one for each agent.
+        """
+        for agent, path in enumerate(paths):
+            if agent >= len(self._paths) or self._paths[agent] is not path:
+                self.update_path(agent, path)
+        for agent in range(len(paths), len(self._paths)):
+            self.update_path(agent, None)
+        del self._paths[len(paths):]
+
+    def update_path(self, agent, path):
+        """
+        Replace the path of the given agent.
+        :param agent: index of the agent.
+        :param path: new path of the agent. If None the agent is removed from the index.
+        """
+        while len(self._paths) <= agent:
+            self._paths.append(None)
+        if self._paths[agent]:
+            self._remove_path(agent)
+        self._paths[agent] = path
+        if path:
+            self._add_path(agent)
+
+    def get_first_conflict(self):
+        """
+        Return the two agents ids that has a conflict, None if there are no conflicts. Same as check_conflicts().
+        """
+        conflict = self.get_first_conflict_with_type()
+        if conflict is None:
+            return None
+        conflict_type, constraints = conflict
+        if conflict_type == 'vertex_conflict':
+            return constraints[0][0], constraints[1][0]
+        return constraints[1][0], constraints[0][0]
+
+    def get_first_conflict_with_type(self):
+        """
+        Returns a couple (type of constraint, new children constraints) or None if the paths have no conflicts. Same
+        as check_conflicts_with_type().
+        """
+        best, best_position = None, None
+        for position in self._conflict_positions:
+            key = self._first_conflict_in_position(position)
+            if key is not None and (best is None or key < best):
+                best, best_position = key, position
+
+        if best is not None:
+            ag_j, ts, ag_i = best
+            return 'vertex_conflict', [(ag_i, best_position, ts), (ag_j, best_position, ts)]
+
+        if self._is_edge_conflict and self._edge_conflicts:
+            ag_i, ag_j, ts = min(self._edge_conflicts, key=lambda x: (x[0], x[2]))
+            path_i, path_j = self._paths[ag_i], self._paths[ag_j]
+            return 'edge_conflict', [(ag_j, path_j[ts-1], path_j[ts], ts), (ag_i, path_i[ts-1], path_i[ts], ts)]
+
+        return None
+
+    def get_all_conflicts_with_type(self):
+        """
+        Return the list of all the conflicts as couples (type of constraint, new children constraints), in the same
+        form of get_first_conflict_with_type(). The vertex conflicts come first and the list is sorted in the same order
+        used by check_conflicts_with_type(), so the first element is the first conflict. When two agents stay in the
+        same goal, only the time step in which the second one arrives is returned.
+        """
+        vertex_conflicts = []
+        for position in self._conflict_positions:
+            visits = self._visits.get(position, {})
+            parked = self._parked.get(position, {})
+            for ts in self._conflict_time_steps(position):
+                visitors = visits.get(ts, set())
+                occupants = sorted(self._occupants(visits, parked, ts))
+                for i, ag_i in enumerate(occupants):
+                    for ag_j in occupants[i+1:]:
+                        if ag_i in visitors or ag_j in visitors or max(parked[ag_i], parked[ag_j]) == ts:
+                            vertex_conflicts.append((ag_j, ts, ag_i, position))
+        vertex_conflicts.sort()
+
+        conflicts = [('vertex_conflict', [(ag_i, position, ts), (ag_j, position, ts)])
+                     for ag_j, ts, ag_i, position in vertex_conflicts]
+
+        if self._is_edge_conflict:
+            for ag_i, ag_j, ts in sorted(self._edge_conflicts, key=lambda x: (x[0], x[2], x[1])):
+                path_i, path_j = self._paths[ag_i], self._paths[ag_j]
+                conflicts.append(('edge_conflict', [(ag_j, path_j[ts-1], path_j[ts], ts),
+                                                    (ag_i, path_i[ts-1], path_i[ts], ts)]))
+        return conflicts
+
+    def get_n_of_conflicts(self):
+        """
+        Return the number of conflicts, counted as in get_all_conflicts_with_type().
+        """
+        return len(self.get_all_conflicts_with_type())
+
+    def get_conflicting_pairs(self):
+        """
+        Return the set of all the couples of agents (agent_i, agent_j), with agent_i < agent_j, that have at least one
+        conflict.
+        """
+        pairs = set()
+        for position in self._conflict_positions:
+            visits = self._visits.get(position, {})
+            parked = self._parked.get(position, {})
+            for ts in self._conflict_time_steps(position):
+                occupants = sorted(self._occupants(visits, parked, ts))
+                for i, ag_i in enumerate(occupants):
+                    for ag_j in occupants[i+1:]:
+                        pairs.add((ag_i, ag_j))
+        if self._is_edge_conflict:
+            for ag_i, ag_j, ts in self._edge_conflicts:
+                pairs.add((ag_i, ag_j))
+        return pairs
+
+    def get_agents_in_position(self, position, time_step):
+        """
+        Return the set of the indexed agents that are in the given position at the given time step.
+        :param position: (x, y) position.
+        :param time_step: time step.
+        """
+        return self._occupants(self._visits.get(position, {}), self._parked.get(position, {}), time_step)
+
+    def get_agents_in_position_from(self, position, time_step):
+        """
+        Return the set of the indexed agents that are in the given position at any time step from the given one on.
+        :param position: (x, y) position.
+        :param time_step: first time step.
+        """
+        agents = set(self._parked.get(position, {}))
+        for ts, occupants in self._visits.get(position, {}).items():
+            if ts >= time_step:
+                agents.update(occupants)
+        return agents
+
+    def get_agents_in_move(self, initial_position, final_position, time_step):
+        """
+        Return the set of the indexed agents that move from the initial position to the final position arriving at the
+        given time step. (Only if edge conflicts are checked)
+        :param initial_position: (x, y) position at time_step-1.
+        :param final_position: (x, y) position at time_step.
+        :param time_step: time step in which the agents arrive in the final position.
+        """
+        return set(self._moves.get((initial_position, final_position, time_step), ()))
+
+    def count_move_conflicts(self, agent, initial_position, final_position, time_step):
+        """
+        Return the number of conflicts that the given agent would have with the other indexed agents moving from the
+        initial position to the final position arriving at the given time step. Used as conflict avoidance table.
+        :param agent: index of the agent that moves. His own path is ignored.
+        :param initial_position: (x, y) position at time_step-1.
+        :param final_position: (x, y) position at time_step.
+        :param time_step: time step in which the agent arrives in the final position.
+        """
+        n_of_conflicts = 0
+        occupants = self._visits.get(final_position, {}).get(time_step)
+        if occupants:
+            n_of_conflicts += len(occupants) - (agent in occupants)
+        for other, start in self._parked.get(final_position, {}).items():
+            if start <= time_step and other != agent:
+                n_of_conflicts += 1
+        if self._is_edge_conflict and initial_position != final_position:
+            movers = self._moves.get((final_position, initial_position, time_step))
+            if movers:
+                n_of_conflicts += len(movers) - (agent in movers)
+        return n_of_conflicts
+
+    def count_goal_conflicts(self, agent, goal, time_step):
+        """
+        Return the number of times the other indexed agents pass through the goal of the given agent after the given
+        time step, in which the agent stops in his goal forever. (Only if stay at goal is True)
+        :param agent: index of the agent. His own path is ignored.
+        :param goal: (x, y) goal position of the agent.
+        :param time_step: time step from which the agent stays in his goal.
+        """
+        n_of_conflicts = 0
+        for ts, occupants in self._visits.get(goal, {}).items():
+            if ts > time_step:
+                n_of_conflicts += len(occupants) - (agent in occupants)
+        for other, start in self._parked.get(goal, {}).items():
+            if start > time_step and other != agent:
+                n_of_conflicts += 1
+        return n_of_conflicts
+
+    def _add_path(self, agent):
+        """
+        Add the entries of the path of the given agent.
+        """
+        path = self._paths[agent]
+        for ts in range(self._n_of_visits(path)):
+            position = path[ts]
+            agents = self._visits.setdefault(position, {}).setdefault(ts, set())
+            agents.add(agent)
+            if len(agents) > 1 or any(start <= ts for start in self._parked.get(position, {}).values()):
+                self._conflict_positions.add(position)
+
+        if self._stay_at_goal:
+            goal, start = path[-1], len(path) - 1
+            parked = self._parked.setdefault(goal, {})
+            if parked or any(ts >= start for ts in self._visits.get(goal, {})):
+                self._conflict_positions.add(goal)
+            parked[agent] = start
+
+        if self._is_edge_conflict:
+            for ts in range(1, len(path)):
+                pos_i, pos_f = path[ts-1], path[ts]
+                if pos_i == pos_f:
+                    continue
+                for other in self._moves.get((pos_f, pos_i, ts), ()):
+                    conflict = (min(agent, other), max(agent, other), ts)
+                    self._edge_conflicts.add(conflict)
+                    self._agent_edge_conflicts.setdefault(agent, set()).add(conflict)
+                    self._agent_edge_conflicts.setdefault(other, set()).add(conflict)
+                self._moves.setdefault((pos_i, pos_f, ts), set()).add(agent)
+
+    def _remove_path(self, agent):
+        """
+        Remove the entries of the path of the given agent.
+        """
+        path = self._paths[agent]
+        touched = set()
+        for ts in range(self._n_of_visits(path)):
+            position = path[ts]
+            visits = self._visits[position]
+            visits[ts].discard(agent)
+            if not visits[ts]:
+                del visits[ts]
+                if not visits:
+                    del self._visits[position]
+            touched.add(position)
+
+        if self._stay_at_goal:
+            goal = path[-1]
+            del self._parked[goal][agent]
+            if not self._parked[goal]:
+                del self._parked[goal]
+            touched.add(goal)
+
+        for position in touched:
+            if position in self._conflict_positions and self._first_conflict_in_position(position) is None:
+                self._conflict_positions.discard(position)
+
+        if self._is_edge_conflict:
+            for ts in range(1, len(path)):
+                pos_i, pos_f = path[ts-1], path[ts]
+                if pos_i == pos_f:
+                    continue
+                agents = self._moves[(pos_i, pos_f, ts)]
+                agents.discard(agent)
+                if not agents:
+                    del self._moves[(pos_i, pos_f, ts)]
+            for conflict in self._agent_edge_conflicts.pop(agent, ()):
+                self._edge_conflicts.discard(conflict)
+                other = conflict[1] if conflict[0] == agent else conflict[0]
+                self._agent_edge_conflicts[other].discard(conflict)
+
+    def _n_of_visits(self, path):
+        """
+        Return the number of time steps of the path indexed as single visits. If stay at goal is True the last one is
+        indexed as the start of the interval in which the agent stays in his goal.
+        """
+        return len(path) - 1 if self._stay_at_goal else len(path)
+
+    def _conflict_time_steps(self, position):
+        """
+        Return the time steps in which a conflict in the given position can start.
+        """
+        visits = self._visits.get(position, {})
+        parked = self._parked.get(position, {})
+        if parked:
+            return set(visits).union(parked.values())
+        return [ts for ts, agents in visits.items() if len(agents) > 1]
+
+    @staticmethod
+    def _occupants(visits, parked, ts):
+        """
+        Return the set of agents in the position at the given time step.
+        """
+        occupants = set(visits.get(ts, ()))
+        occupants.update(agent for agent, start in parked.items() if start <= ts)
+        return occupants
+
+    def _first_conflict_in_position(self, position):
+        """
+        Return the first vertex conflict in the given position as (agent_j, time_step, agent_i), where agent_i and
+        agent_j are the two agents with lowest ids in the position at that time step. Return None if no conflicts.
+        """
+        visits = self._visits.get(position, {})
+        parked = self._parked.get(position, {})
+        best = None
+        for ts in self._conflict_time_steps(position):
+            occupants = self._occupants(visits, parked, ts)
+            if len(occupants) > 1:
+                ag_i, ag_j = heapq.nsmallest(2, occupants)
+                if best is None or (ag_j, ts, ag_i) < best:
+                    best = (ag_j, ts, ag_i)
+        return best
@@ -0,0 +1,234 @@
+class ConstraintTable:
+    """
+    Table of the constraints of a single agent, used by the low level of CBS. The vertex constraints are indexed by
+    (position, time_step) and the edge constraints by (initial_position, final_position, final_time_step), so that
+    checking if a move is constrained costs a constant time regardless of the number of constraints. For each position
+    it also keeps the latest time step in which it is constrained, needed to know if an agent can stop in his goal.
+    The positive constraints, used by the disjoint splitting, force the agent to be in a position at a time step: they
+    are indexed by time step and they forbid all the other positions at that time step.
+    The constraints of the target reasoning are about the time the agent stays in a position forever: a length
+    constraint doesn't let the agent stop in his goal until a time step, a stay constraint forces the agent to be in
+    his goal from a time step on, and a permanent constraint forbids a position from a time step on.
+    For the search over safe intervals (SIPP) the vertex constraints are also grouped by position, the first time the
+    safe intervals are requested.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty constraint table.
+        """
+        self._vertex_constraints = set()
+        self._edge_constraints = set()
+        self._latest_constraint_times = dict()
+        self._positive_constraints = dict()
+        self._latest_positive_constraint = (-1, None)  # (time step, position) of the latest positive constraint.
+        self._latest_other_positive_time = -1  # Latest time step of the positive constraints in another position.
+        self._stay_constraint = None
+        self._permanent_constraints = dict()
+        self._vertex_constraint_times = None  # For each position the time steps of its vertex constraints.
+
+    def add_vertex_constraint(self, position, time_step):
+        """
+        Add a vertex constraint: the agent can't be in the given position at the given time step.
+        :param position: (x, y) position.
+        :param time_step: time step of the constraint.
+        """
+        self._vertex_constraints.add((position, time_step))
+        self._vertex_constraint_times = None
+        if time_step > self._latest_constraint_times.get(position, -1):
+            self._latest_constraint_times[position] = time_step
+
+    def add_edge_constraint(self, initial_position, final_position, time_step):
+        """
+        Add an edge constraint: the agent can't move from the initial position to the final position arriving at the
+        given time step.
+        :param initial_position: (x, y) position at time_step-1.
+        :param final_position: (x, y) position at time_step.
+        :param time_step: time step in which the agent arrives in the final position.
+        """
+        self._edge_constraints.add((initial_position, final_position, time_step))
+
+    def add_length_constraint(self, position, time_step):
+        """
+        Add a length constraint: the agent can't stop forever in the given position (his goal) at or before the given
+        time step, so his path must be longer.
+        :param position: (x, y) position.
+        :param time_step: time step of the constraint.
+        """
+        if time_step > self._latest_constraint_times.get(position, -1):
+            self._latest_constraint_times[position] = time_step
+
+    def add_stay_constraint(self, position, time_step):
+        """
+        Add a stay constraint: the agent must be in the given position (his goal) at every time step from the given one
+        on, so his path can't be longer.
+        :param position: (x, y) position.
+        :param time_step: time step of the constraint.
+        """
+        if self._stay_constraint is None or time_step < self._stay_constraint[1]:
+            self._stay_constraint = (position, time_step)
+
+    def add_permanent_constraint(self, position, time_step):
+        """
+        Add a permanent constraint: the agent can't be in the given position at any time step from the given one on.
+        :param position: (x, y) position.
+        :param time_step: first time step of the constraint.
+        """
+        if time_step < self._permanent_constraints.get(position, float('inf')):
+            self._permanent_constraints[position] = time_step
+
+    def add_positive_constraint(self, position, time_step):
+        """
+        Add a positive constraint: the agent must be in the given position at the given time step.
+        :param position: (x, y) position.
+        :param time_step: time step of the constraint.
+        """
+        self._positive_constraints[time_step] = position
+        latest_time_step, latest_position = self._latest_positive_constraint
+        if time_step > latest_time_step:
+            if position != latest_position:
+                self._latest_other_positive_time = latest_time_step
+            self._latest_positive_constraint = (time_step, position)
+        elif position != latest_position and time_step > self._latest_other_positive_time:
+            self._latest_other_positive_time = time_step
+
+    def is_vertex_constrained(self, position, time_step):
+        """
+        Return True if the agent can't be in the given position at the given time step.
+        :param position: (x, y) position.
+        :param time_step: time step.
+        """
+        if (position, time_step) in self._vertex_constraints or \
+                self._positive_constraints.get(time_step, position) != position:
+            return True
+        if self._stay_constraint is not None and time_step >= self._stay_constraint[1] and \
+                position != self._stay_constraint[0]:
+            return True
+        return time_step >= self._permanent_constraints.get(position, float('inf'))
+
+    def is_edge_constrained(self, initial_position, final_position, time_step):
+        """
+        Return True if the agent can't move from the initial position to the final position arriving at the given time
+        step.
+        :param initial_position: (x, y) position at time_step-1.
+        :param final_position: (x, y) position at time_step.
+        :param time_step: time step in which the agent arrives in the final position.
+        """
+        return (initial_position, final_position, time_step) in self._edge_constraints
+
+    def get_latest_constraint_time(self, position):
+        """
+        Return the latest time step in which the agent can't stop forever in the given position, -1 if there is none. It
+        is infinite if the agent can never stop there.
+        :param position: (x, y) position.
+        """
+        if position in self._permanent_constraints or \
+                (self._stay_constraint is not None and self._stay_constraint[0] != position):
+            return float('inf')
+        latest_time_step, latest_position = self._latest_positive_constraint
+        latest_positive_time = latest_time_step if latest_position != position else self._latest_other_positive_time
+        return max(self._latest_constraint_times.get(position, -1), latest_positive_time)
+
+    def get_last_constraint_time(self):
+        """
+        Return the last time step in which the constraints change, -1 if there are none. After it the same positions
+        and moves are allowed at every time step.
+        """
+        time_steps = [ts for position, ts in self._vertex_constraints] + \
+                     [ts for initial_position, final_position, ts in self._edge_constraints] + \
+                     list(self._latest_constraint_times.values()) + list(self._positive_constraints) + \
+                     list(self._permanent_constraints.values())
+        if self._stay_constraint is not None:
+            time_steps.append(self._stay_constraint[1])
+        return max(time_steps, default=-1)
+
+    def get_safe_intervals(self, position):
+        """
+        Return the safe intervals of the given position: the maximal intervals of time steps in which the position is
+        not vertex constrained, in increasing order. The last time step of the last interval is infinite if the position
+        is never constrained after it.
+        :param position: (x, y) position.
+        :return: list of (first_time_step, last_time_step) intervals.
+        """
+        if self._vertex_constraint_times is None:
+            self._vertex_constraint_times = dict()
+            for pos, ts in self._vertex_constraints:
+                self._vertex_constraint_times.setdefault(pos, set()).add(ts)
+
+        unsafe_time_steps = self._vertex_constraint_times.get(position, set()) | \
+            {ts for ts, positive_position in self._positive_constraints.items() if positive_position != position}
+        end = self._permanent_constraints.get(position, float('inf'))
+        if self._stay_constraint is not None and self._stay_constraint[0] != position:
+            end = min(end, self._stay_constraint[1])
+
+        intervals = []
+        first = 0
+        for ts in sorted(unsafe_time_steps):
+            if ts >= end:
+                break
+            if ts > first:
+                intervals.append((first, ts - 1))
+            first = ts + 1
+        if first < end:
+            intervals.append((first, end - 1))
+        return intervals
+
+    def get_latest_positive_constraint_time(self):
+        """
+        Return the latest time step of the positive constraints, -1 if there are none. The path of the agent must last
+        at least until that time step.
+        """
+        return self._latest_positive_constraint[0]
+
+    def vertex_constraints(self):
+        """
+        Return the set of vertex constraints as (position, time_step) tuples.
+        """
+        return self._vertex_constraints
+
+    def edge_constraints(self):
+        """
+        Return the set of edge constraints as (initial_position, final_position, time_step) tuples.
+        """
+        return self._edge_constraints
+
+    def positive_constraints(self):
+        """
+        Return the set of positive constraints as (position, time_step) tuples.
+        """
+        return {(position, time_step) for time_step, position in self._positive_constraints.items()}
+
+    def get_key(self):
+        """
+        Return a hashable key of the constraints of the table, independent from the order in which they have been added.
+        Two tables with the same key forbid exactly the same paths.
+        """
+        return frozenset(self._vertex_constraints), frozenset(self._edge_constraints), \
+            frozenset(self._latest_constraint_times.items()), frozenset(self._positive_constraints.items()), \
+            self._stay_constraint, frozenset(self._permanent_constraints.items())
+
+    def copy(self):
+        """
+        Return a copy of the table that can be extended without modifying this one.
+        """
+        table = ConstraintTable()
+        table._vertex_constraints = self._vertex_constraints.copy()
+        table._edge_constraints = self._edge_constraints.copy()
+        table._latest_constraint_times = self._latest_constraint_times.copy()
+        table._positive_constraints = self._positive_constraints.copy()
+        table._latest_positive_constraint = self._latest_positive_constraint
+        table._latest_other_positive_time = self._latest_other_positive_time
+        table._stay_constraint = self._stay_constraint
+        table._permanent_constraints = self._permanent_constraints.copy()
+        return table
+
+    def size(self):
+        """
+        Return the number of constraints in the table.
+        """
+        return len(self._vertex_constraints) + len(self._edge_constraints) + len(self._positive_constraints)
+
+    def __str__(self):
+        return '[Vertex constraints:' + str(self._vertex_constraints) + \
+               ' Edge constraints:' + str(self._edge_constraints) + \
+               ' Positive constraints:' + str(self.positive_constraints()) + ']'
@@ -0,0 +1,118 @@
+import heapq
+import itertools
+
+
+class FocalQueue:
+    """
+    Queue used by the bounded-suboptimal searches with a focal list. Each item has a lower bound of the cost of the
+    solutions reachable from it and a cost. The open list contains all the items ordered by lower bound, while the focal
+    list contains the items whose cost is within the suboptimality factor w of the lowest lower bound in the open list,
+    ordered by a secondary priority (e.g. the number of conflicts). The items are always popped from the focal list, so
+    the cost of the item popped is at most w times the lower bound.
+    The lower bound of the queue never decreases: the lowest lower bound in the open list is a valid lower bound each
+    time it is computed, so the highest one found is kept. In this way the focal list only grows, and the items not yet
+    in it are kept in buckets by cost, moved to the focal list when the bound reaches their cost.
+    If no item has a cost within the bound, the focal list is empty and the item with the lowest lower bound is popped
+    from the open list instead.
+    """
+
+    def __init__(self, suboptimality_factor, priority_function, lower_bound_function, cost_function=None):
+        """
+        Initialize a new queue.
+        :param suboptimality_factor: factor w >= 1 of the bound on the cost of the items in the focal list.
+        :param priority_function: function that returns the priority of an item in the focal list. The lower is the
+        value, the sooner the item will be popped.
+        :param lower_bound_function: function that returns the lower bound of an item, used to order the open list.
+        :param cost_function: function that returns the cost of an item, compared with the bound to put it in the focal
+        list. If None the lower bound is used.
+        """
+        self._suboptimality_factor = suboptimality_factor
+        self._priority_function = priority_function
+        self._lower_bound_function = lower_bound_function
+        self._cost_function = cost_function if cost_function is not None else lower_bound_function
+        self._counter = itertools.count()
+        self._open = []  # Heap of (lower bound, count, entry), the entries popped are removed lazily.
+        self._focal = []  # Heap of the entries in the focal list.
+        self._buckets = dict()  # For each cost the entries not yet in the focal list.
+        self._bucket_costs = []  # Heap of the costs of the buckets.
+        self._lower_bound = None
+        self._focal_bound = None
+        self._size = 0
+
+    def add(self, item):
+        """
+        Add an item to the queue.
+        :param item: item to add.
+        """
+        entry = [self._priority_function(item), next(self._counter), item, False]
+        heapq.heappush(self._open, (self._lower_bound_function(item), entry[1], entry))
+
+        cost = self._cost_function(item)
+        if self._focal_bound is not None and cost <= self._focal_bound:
+            heapq.heappush(self._focal, entry)
+        else:
+            if cost not in self._buckets:
+                self._buckets[cost] = []
+                heapq.heappush(self._bucket_costs, cost)
+            self._buckets[cost].append(entry)
+        self._size += 1
+
+    def add_list(self, item_list):
+        """
+        Add a list of items to the queue.
+        :param item_list: list of items to add.
+        """
+        for item in item_list:
+            self.add(item)
+
+    def pop(self):
+        """
+        Pop the item of the focal list with the lowest priority and return it. If the focal list is empty, the item
+        with the lowest lower bound in the open list is popped.
+        """
+        if self._size == 0:
+            raise IndexError("pop from an empty queue")
+        self.update_focal()
+        while self._focal and self._focal[0][3]:
+            heapq.heappop(self._focal)  # Entries already popped from the open list.
+        if self._focal:
+            entry = heapq.heappop(self._focal)
+        else:
+            entry = self._open[0][2]
+        entry[3] = True
+        self._size -= 1
+        return entry[2]
+
+    def update_focal(self):
+        """
+        Update the lower bound with the lowest one in the open list and move to the focal list the items whose cost is
+        within the new bound.
+        """
+        while self._open[0][2][3]:
+            heapq.heappop(self._open)
+        lower_bound = self._open[0][0]
+        if self._lower_bound is not None and lower_bound <= self._lower_bound:
+            return
+        self._lower_bound = lower_bound
+        self._focal_bound = self._suboptimality_factor * lower_bound
+        while self._bucket_costs and self._bucket_costs[0] <= self._focal_bound:
+            for entry in self._buckets.pop(heapq.heappop(self._bucket_costs)):
+                heapq.heappush(self._focal, entry)
+
+    def get_lower_bound(self):
+        """
+        Return the highest lower bound found, None if no item has been popped yet.
+        """
+        return self._lower_bound
+
+    def is_empty(self):
+        """
+        Return True if the queue is empty.
+        """
+        return self._size == 0
+
+    def size(self):
+        """
+        Return the number of items in the queue.
+        """
+        return self._size
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+
+
+class HeapQueue:
+    """
+    Priority queue built on a binary heap. It can be used as frontier for any of the solvers, both with states and with
+    tree nodes. The items are popped in increasing order of priority and, between items with the same priority, in
+    insertion order. So, the sequence of popped items is the same of the one obtained by sorting a list with a stable
+    sort and popping the first element, but each operation costs O(log n) instead of O(n log n).
+    If an index function is given, each item is indexed by its key (e.g. the position of a single-agent state). In this
+    way an item can be retrieved and updated in constant time. Updates use lazy deletion: the old entry is marked as
+    removed and it is discarded only when it reaches the top of the heap.
+    If a hash function is given, the items are also grouped in buckets by their hash key, so that contains_state() only
+    compares the items in the same bucket.
+    """
+
+    def __init__(self, priority_function=None, index_function=None, hash_function=None):
+        """
+        Initialize a new queue.
+        :param priority_function: function that returns the priority of an item. The lower is the value, the sooner the
+        item will be popped. If None the states are ordered by f-value, using the h-value as second index.
+        :param index_function: function that returns the key used to index an item. If None the items are not indexed.
+        :param hash_function: function that returns the hash key of an item used by contains_state(). It must be
+        consistent with the equal() method of the items: equal items must have the same hash key.
+        """
+        self._heap = []
+        self._counter = itertools.count()
+        self._priority_function = priority_function if priority_function is not None else f_value_priority
+        self._index_function = index_function
+        self._entries = dict()
+        self._hash_function = hash_function
+        self._buckets = dict()
+        self._size = 0
+
+    def add(self, item):
+        """
+        Add an item to the queue. If the items are indexed and an item with the same key is already present, the old
+        one is replaced.
+        :param item: item to add.
+        """
+        entry = [self._priority_function(item), next(self._counter), item, False]
+
+        if self._index_function is not None:
+            key = self._index_function(item)
+            old_entry = self._entries.get(key)
+            if old_entry is not None:
+                old_entry[3] = True
+                self._remove_from_bucket(old_entry)
+                self._size -= 1
+            self._entries[key] = entry
+
+        if self._hash_function is not None:
+            self._buckets.setdefault(self._hash_function(item), []).append(entry)
+
+        heapq.heappush(self._heap, entry)
+        self._size += 1
+
+    def add_list(self, item_list):
+        """
+        Add a list of items to the queue.
+        :param item_list: list of items to add.
+        """
+        for item in item_list:
+            self.add(item)
+
+    def pop(self):
+        """
+        Pop the item with the lowest priority and return it.
+        """
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if not entry[3]:
+                item = entry[2]
+                self._size -= 1
+                if self._index_function is not None:
+                    del self._entries[self._index_function(item)]
+                self._remove_from_bucket(entry)
+                return item
+        raise IndexError("pop from an empty queue")
+
+    def is_empty(self):
+        """
+        Return True if the queue is empty.
+        """
+        return self._size == 0
+
+    def size(self):
+        """
+        Return the number of items in the queue.
+        """
+        return self._size
+
+    def get(self, key):
+        """
+        Return the item with the given key if present, otherwise it returns None. (Only if the items are indexed)
+        :param key: key of the item.
+        """
+        assert self._index_function is not None, "It can be called only if the items are indexed."
+        entry = self._entries.get(key)
+        return entry[2] if entry is not None else None
+
+    def update(self, item):
+        """
+        Check if exists an item in the queue with the same key of the given one. In that case it replaces that item
+        with the given one. (Only if the items are indexed)
+        :param item: new item.
+        :return: True if the item has been updated, False if the item was not present in the queue.
+        """
+        assert self._index_function is not None, "It can be called only if the items are indexed."
+        if self._index_function(item) not in self._entries:
+            return False
+        self.add(item)
+        return True
+
+    def contains_state(self, item):
+        """
+        Return True if the queue already contains the exact same state. That is if exists already a state with the same
+        position(s) and same time step(s).
+        :param item: instance of State.
+        """
+        if self._hash_function is not None:
+            for entry in self._buckets.get(self._hash_function(item), []):
+                if entry[2].equal(item):
+                    return True
+            return False
+
+        for priority, count, state, removed in self._heap:
+            if not removed and state.equal(item):
+                return True
+        return False
+
+    def _remove_from_bucket(self, entry):
+        """
+        Remove the entry from its bucket. (Only if the hash function is given)
+        :param entry: heap entry to remove.
+        """
+        if self._hash_function is None:
+            return
+        key = self._hash_function(entry[2])
+        bucket = self._buckets[key]
+        bucket.remove(entry)
+        if not bucket:
+            del self._buckets[key]
+
+    def __str__(self):
+        string = ''
+        for entry in heapq.nsmallest(5, (e for e in self._heap if not e[3])):
+            string = string + entry[2].__str__()
+        return string
+
+
+def f_value_priority(state):
+    """
+    Default priority of the states: the f-value, using the h-value as second index in order to speed up the process.
+    """
+    return state.f_value(), state.h_value()
@@ -0,0 +1,47 @@
+import numpy as np
+
+# Moves in the same order of Map.moves(): wait, left, right, up, down.
+MOVES = [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+class IndividualPolicy:
+    """
+    Optimal individual policy of an agent toward his goal, ignoring the other agents. For every cell of the map it
+    stores the next move on an optimal path to the goal, so following the policy costs a constant time lookup.
+    It is computed from the distance field of the goal: the next move of a cell is the first neighbour (in the order of
+    Map.neighbours()) whose distance is one less. The goal, the obstacles and the cells that can't reach the goal have
+    the wait move.
+    """
+
+    def __init__(self, distance_table):
+        """
+        Compute the policy from the distance table of the goal.
+        :param distance_table: (height x width) array with the distance of each cell to the goal, negative for the
+        unreachable cells.
+        """
+        h, w = distance_table.shape
+        self._moves = np.zeros((h, w), dtype=np.int8)
+
+        for code, (dx, dy) in enumerate(MOVES):
+            if code == 0:
+                continue
+            neighbour_distance = np.full((h, w), -1, dtype=distance_table.dtype)
+            neighbour_distance[max(-dy, 0):h - max(dy, 0), max(-dx, 0):w - max(dx, 0)] = \
+                distance_table[max(dy, 0):h - max(-dy, 0), max(dx, 0):w - max(-dx, 0)]
+            best_move = (self._moves == 0) & (distance_table > 0) & (neighbour_distance == distance_table - 1)
+            self._moves[best_move] = code
+
+    def next_position(self, position):
+        """
+        Return the next position following the optimal policy from the given one.
+        :param position: (x, y) position of the agent.
+        """
+        dx, dy = MOVES[self._moves.item(position[1], position[0])]
+        return position[0] + dx, position[1] + dy
+
+    @property
+    def nbytes(self):
+        """
+        Number of bytes used by the policy table.
+        """
+        return self._moves.nbytes
@@ -13,11 +13,38 @@ class Map:
         self._h = h
         self._w = w
         self._obstacles_xy = obstacles
+        self._compiled_map = None
+        self._key = None
 
     def neighbours(self, xy):
         """
         Returns the positions of the neighbours in (x, y) Coordinates. It considers as neighbours only the horizontal
         and vertical neighbours, not the traversals ones, so it'll move left, right, up and down.
+        For the free cells the neighbours are read from the compiled map, which is built at the first call and then
+        shared by all the solvers that use this map.
+        :param xy: is a tuple (x, y) representing a position on the map.
+        :return: a list of (x, y) positions.
+        """
+        compiled_map = self.get_compiled_map()
+        if compiled_map.contains(xy):
+            return compiled_map.neighbours(xy)
+        return self.compute_neighbours(xy)
+
+    def moves(self, xy):
+        """
+        Returns the positions reachable from the given one in one time step. The first one is the wait move, followed by
+        the neighbours.
+        :param xy: is a tuple (x, y) representing a position on the map.
+        :return: a list of (x, y) positions.
+        """
+        compiled_map = self.get_compiled_map()
+        if compiled_map.contains(xy):
+            return compiled_map.moves(xy)
+        return [xy] + self.compute_neighbours(xy)
+
+    def compute_neighbours(self, xy):
+        """
+        Computes the positions of the neighbours in (x, y) Coordinates by checking the map boundaries and the obstacles.
         :param xy: is a tuple (x, y) representing a position on the map.
         :return: a list of (x, y) positions.
         """
@@ -35,6 +62,24 @@ class Map:
 
         return neighbours
 
+    def get_compiled_map(self):
+        """
+        Returns the compiled representation of the map. It is built only once.
+        """
+        if self._compiled_map is None:
+            from .CompiledMap import CompiledMap
+            self._compiled_map = CompiledMap(self)
+        return self._compiled_map
+
+    def get_key(self):
+        """
+        Returns a hashable key that identifies the map by its dimensions and obstacles. Two maps with the same
+        dimensions and the same obstacles have the same key. It is computed only once.
+        """
+        if self._key is None:
+            self._key = (self._h, self._w, frozenset(self._obstacles_xy))
+        return self._key
+
     def get_height(self):
         """
         Returns the height of the map.
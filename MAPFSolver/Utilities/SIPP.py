@@ -0,0 +1,195 @@
+from .ConstraintTable import ConstraintTable
+from .ProblemInstance import ProblemInstance
+from .Agent import Agent
+import heapq
+import itertools
+
+
+class SIPP:
+    """
+    Single-agent Safe Interval Path Planning (SIPP). Instead of searching the (position, time step) space one time step
+    at a time, the time of each position is divided in safe intervals, the maximal intervals without vertex constraints,
+    and a state is a position with one of its safe intervals. Since the agent can wait in a position for all its safe
+    interval, only the earliest arrival time in each interval is needed: the long waits behind the constraints are a
+    single successor instead of a chain of wait states. The edge constraints are checked on the arrival time, delaying
+    it while the move is constrained.
+    It returns paths with the same cost of the ones of the AStar class under the same constraints, so it can be used as
+    low level of CBS and Cooperative A*.
+    """
+
+    def __init__(self, solver_settings):
+        """
+        Initialize the SIPP solver.
+        :param solver_settings: settings used by the solver.
+        """
+        self._solver_settings = solver_settings
+        self._safe_intervals = None
+        self._best_arrivals = None
+        self._parents = None
+
+    def find_path_with_constraints(self, problem_map, start_pos, goal_pos, constraint_table, max_f_value=None):
+        """
+        It computes the path from his start position to his goal position searching the safe intervals built from the
+        table of constraints. It return the path as list of (x, y) positions, in the same form of
+        AStar.find_path_with_constraints().
+        :param problem_map: map of the problem.
+        :param start_pos: start position of the agent.
+        :param goal_pos: goal position of the agent.
+        :param constraint_table: ConstraintTable with the constraints of the agent.
+        :param max_f_value: if given, the search stops when the f-value of the states exceeds it.
+        :return: solution path.
+        """
+        problem_instance = ProblemInstance(problem_map, [Agent(0, start_pos, goal_pos)])
+        self._solver_settings.initialize_heuristic(problem_instance)
+        heuristic = self._solver_settings.get_heuristic_object()
+        self._safe_intervals = dict()
+        self._best_arrivals = dict()
+        self._parents = dict()
+
+        start_intervals = self.get_safe_intervals(start_pos, goal_pos, constraint_table)
+        if not start_intervals or start_intervals[0][0] > 0:
+            return []
+        counter = itertools.count()
+        h_value = heuristic.compute_heuristic(start_pos, goal_pos)
+        # The entries are (f-value, h-value, count, position, interval index, arrival time step, completion time step).
+        # The completion time step is None for the states to expand, otherwise the entry is a completed path.
+        frontier = [(h_value, h_value, next(counter), start_pos, 0, 0, None)]
+        self._best_arrivals[(start_pos, 0)] = 0
+        self._parents[(start_pos, 0)] = None
+
+        while frontier:
+            f_value, h_value, count, pos, index, ts, completion_ts = heapq.heappop(frontier)
+
+            if max_f_value is not None and f_value > max_f_value:
+                break
+
+            if completion_ts is not None:
+                return self.build_path((pos, index), ts, completion_ts)
+
+            if ts > self._best_arrivals[(pos, index)]:
+                continue  # An earlier arrival in the same interval has been found.
+
+            first, last = self._safe_intervals[pos][index]
+            if pos == goal_pos:
+                completion_ts = self.get_completion_time_step(ts, last, goal_pos, constraint_table)
+                if completion_ts is not None:
+                    cost = ts if self._solver_settings.stay_at_goal() else \
+                        completion_ts + 1 - self._solver_settings.get_goal_occupation_time()
+                    heapq.heappush(frontier, (cost, 0, next(counter), pos, index, ts, completion_ts))
+
+            for next_pos in problem_map.neighbours(pos):
+                for next_index, (next_first, next_last) in enumerate(self.get_safe_intervals(next_pos, goal_pos,
+                                                                                             constraint_table)):
+                    if next_first > last + 1:
+                        break
+                    if next_last < ts + 1:
+                        continue
+                    # The agent waits in his position until the move is possible, at most until his interval ends.
+                    latest_arrival = min(last + 1, next_last)
+                    arrival = max(ts + 1, next_first)
+                    while arrival <= latest_arrival and constraint_table.is_edge_constrained(pos, next_pos, arrival):
+                        arrival += 1
+                    if arrival > latest_arrival:
+                        continue
+                    if arrival < self._best_arrivals.get((next_pos, next_index), float('inf')):
+                        self._best_arrivals[(next_pos, next_index)] = arrival
+                        self._parents[(next_pos, next_index)] = (pos, index)
+                        h_value = heuristic.compute_heuristic(next_pos, goal_pos)
+                        heapq.heappush(frontier, (arrival + h_value, h_value, next(counter), next_pos, next_index,
+                                                  arrival, None))
+
+        return []
+
+    def find_path_with_reservation_table(self, problem_map, start_pos, goal_pos, reservation_table, completed_pos=None):
+        """
+        It computes the path from his start position to his goal position searching the safe intervals built from the
+        reservation table, with the same rules of AStar.find_path_with_reservation_table(): the busy positions are
+        vertex constraints, the goals of the agents already completed are forbidden from their last busy time step on,
+        and the agent can't move in a position busy at the previous time step if his position is busy at the arrival.
+        :param problem_map: map of the problem.
+        :param start_pos: starting position of the agent.
+        :param goal_pos: goal position of the agent.
+        :param reservation_table: it's a dictionary that keeps for each position the list of busy time steps.
+        :param completed_pos: is the list of goals of the agents already computed. This is used only if the option stay
+        at goal is active.
+        :return: the path for the agent, if found any.
+        """
+        constraint_table = ConstraintTable()
+        busy_time_sets = {pos: set(busy_times) for pos, busy_times in reservation_table.items()}
+        for pos, busy_times in busy_time_sets.items():
+            for ts in busy_times:
+                constraint_table.add_vertex_constraint(pos, ts)
+                if self._solver_settings.is_edge_conflict():
+                    for next_pos in problem_map.neighbours(pos):
+                        if ts + 1 in busy_time_sets.get(next_pos, ()):
+                            constraint_table.add_edge_constraint(next_pos, pos, ts + 1)
+        if self._solver_settings.stay_at_goal():
+            for pos in completed_pos:
+                constraint_table.add_permanent_constraint(pos, reservation_table[pos][-1])
+
+        # As the A* search, it stops when the f-value exceeds 80.
+        return self.find_path_with_constraints(problem_map, start_pos, goal_pos, constraint_table, max_f_value=80)
+
+    def get_safe_intervals(self, position, goal_pos, constraint_table):
+        """
+        Return the safe intervals of the given position. If stay at goal is True, the interval of the goal that contains
+        the latest constraint time is split after it, so that the agent can stop in his goal only arriving there after
+        the latest constraint.
+        """
+        intervals = self._safe_intervals.get(position)
+        if intervals is None:
+            intervals = constraint_table.get_safe_intervals(position)
+            if self._solver_settings.stay_at_goal() and position == goal_pos:
+                latest_ts = constraint_table.get_latest_constraint_time(goal_pos)
+                for i, (first, last) in enumerate(intervals):
+                    if first <= latest_ts < last:
+                        intervals = intervals[:i] + [(first, latest_ts), (latest_ts + 1, last)] + intervals[i+1:]
+                        break
+            self._safe_intervals[position] = intervals
+        return intervals
+
+    def get_completion_time_step(self, time_step, last_time_step, goal_pos, constraint_table):
+        """
+        Return the time step in which the agent, arrived in his goal at the given time step, completes his task, None if
+        it can't complete it in the safe interval. If stay at goal is True the agent must stay in the goal forever, so
+        it is the arrival time step. Otherwise the agent must stay in the goal for the goal occupation time, as the A*
+        search until a time step not lower than the goal occupation time, and until the latest positive constraint.
+        :param time_step: arrival time step in the goal.
+        :param last_time_step: last time step of the safe interval of the goal.
+        :param goal_pos: goal position of the agent.
+        :param constraint_table: ConstraintTable with the constraints of the agent.
+        """
+        if self._solver_settings.stay_at_goal():
+            if last_time_step == float('inf') and time_step > constraint_table.get_latest_constraint_time(goal_pos):
+                return time_step
+            return None
+        goal_occupation_time = self._solver_settings.get_goal_occupation_time()
+        completion_ts = max(time_step + goal_occupation_time - 1, goal_occupation_time,
+                            constraint_table.get_latest_positive_constraint_time())
+        return completion_ts if completion_ts <= last_time_step else None
+
+    def build_path(self, key, time_step, completion_time_step):
+        """
+        Build the path to the given state following the parents: between two states the agent waits in the position of
+        the first one until the arrival time of the second one. If stay at goal is False the agent stays in the goal
+        until the completion time step.
+        :param key: (position, interval index) of the last state.
+        :param time_step: arrival time step of the last state.
+        :param completion_time_step: time step in which the agent completes his task.
+        """
+        states = []
+        while key is not None:
+            states.append((key[0], time_step))
+            key = self._parents[key]
+            if key is not None:
+                time_step = self._best_arrivals[key]
+        states.reverse()
+
+        path = []
+        for pos, ts in states:
+            if path:
+                path.extend([path[-1]] * (ts - len(path)))
+            path.append(pos)
+        if not self._solver_settings.stay_at_goal():
+            path.extend([path[-1]] * (completion_time_step + 1 - len(path)))
+        return path
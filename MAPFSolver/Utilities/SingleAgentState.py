@@ -21,6 +21,7 @@ class SingleAgentState(State):
         self._position = position
         self._goal = goal
         self._solver_settings = solver_settings
+        self._n_of_conflicts = 0
         self.compute_cost()
         self.compute_heuristics()
 
@@ -31,10 +32,9 @@ class SingleAgentState(State):
         to move from the goal with an increase of the cost or stay in the goal without increase the cost.
         :return: the list of possible next states.
         """
-        expanded_nodes_list = [self.wait_state()]
-        possible_moves = self._map.neighbours(self._position)
-        for i in possible_moves:
-            expanded_nodes_list.append(SingleAgentState(self._map, self._goal, i, self._solver_settings, parent=self))
+        expanded_nodes_list = []
+        for pos in self._map.moves(self._position):
+            expanded_nodes_list.append(SingleAgentState(self._map, self._goal, pos, self._solver_settings, parent=self))
         return expanded_nodes_list
 
     def wait_state(self):
@@ -60,14 +60,12 @@ class SingleAgentState(State):
 
     def get_next_optimal_state(self):
         """
-        Compute the next optimal state following the optimal policy.
+        Compute the next optimal state following the optimal policy. The policy toward the goal is precomputed for all
+        the cells of the map and shared through the distance tables cache, so this is a constant time lookup.
         :return: the next state following the optimal policy
         """
-        from MAPFSolver.Utilities.AStar import AStar
-        from MAPFSolver.Utilities.SolverSettings import SolverSettings
-        solver = AStar(SolverSettings())
-        path = solver.find_path(self._map, self._position, self._goal)
-        next_pos = path[1]
+        from MAPFSolver.Heuristics.DistanceTablesCache import get_distance_tables_cache
+        next_pos = get_distance_tables_cache().get_policy(self._map, self._goal).next_position(self._position)
         return SingleAgentState(self._map, self._goal, next_pos, self._solver_settings, parent=self)
 
     def compute_heuristics(self):
@@ -81,24 +79,18 @@ class SingleAgentState(State):
         Compute the cost of the current state. (g-value)
         For the case in which the agent need to stay in the goal for a goal occupation time, the time spent in the goal
         is not count in the cost.
+        Each state keeps the number of consecutive time steps spent in the goal up to itself, obtained by incrementing
+        the one of the parent, so the cost is computed in constant time without walking the path to the root.
         """
-        if self.is_root():
-            self._g = 0
+        if self.goal_test():
+            self._time_at_goal = 1 if self.is_root() else self._parent.time_at_goal() + 1
+        else:
+            self._time_at_goal = 0
+
+        if self._time_at_goal == 0:
+            self._g = self.time_step()
         else:
-            list_of_states = [self]
-            state = self
-            while not state.is_root():
-                state = state.parent()
-                list_of_states.append(state)
-
-            self._g = 0
-            for i, s in enumerate(list_of_states):
-                if not s.goal_test():
-                    if i == 0:
-                        self._g = len(list_of_states) - 1
-                    else:
-                        self._g = len(list_of_states) - i
-                    break
+            self._g = self.time_step() + 1 - self._time_at_goal
 
     def goal_test(self):
         """
@@ -119,14 +111,8 @@ class SingleAgentState(State):
         if self._solver_settings.stay_at_goal():
             return self.goal_test()
         else:
-            state = self
-            for i in range(self._solver_settings.get_goal_occupation_time()):
-                if not state.goal_test():
-                    return False
-                state = state.parent()
-                if not state:
-                    return False
-            return True
+            goal_occupation_time = self._solver_settings.get_goal_occupation_time()
+            return self._time_at_goal >= goal_occupation_time and self.time_step() >= goal_occupation_time
 
     def is_gone(self):
         """
@@ -138,14 +124,29 @@ class SingleAgentState(State):
         if self._solver_settings.stay_at_goal():
             return False
         else:
-            state = self
-            for i in range(self._solver_settings.get_goal_occupation_time()+1):
-                if not state.goal_test():
-                    return False
-                state = state.parent()
-                if not state:
-                    return False
-            return True
+            goal_occupation_time = self._solver_settings.get_goal_occupation_time()
+            return self._time_at_goal > goal_occupation_time and self.time_step() > goal_occupation_time
+
+    def time_at_goal(self):
+        """
+        Return the number of consecutive time steps spent in the goal up to this state (this one included). It is zero
+        if the agent is not in the goal position.
+        """
+        return self._time_at_goal
+
+    def n_of_conflicts(self):
+        """
+        Return the number of conflicts with the other agents along the path up to this state. It is used by the low
+        level of CBS as tie-breaking between paths with the same cost, it is zero if not computed.
+        """
+        return self._n_of_conflicts
+
+    def set_n_of_conflicts(self, n_of_conflicts):
+        """
+        Set the number of conflicts with the other agents along the path up to this state.
+        :param n_of_conflicts: number of conflicts.
+        """
+        self._n_of_conflicts = n_of_conflicts
 
     def get_position(self):
         """
@@ -186,6 +187,18 @@ class SingleAgentState(State):
         path.reverse()
         return path
 
+    def positions_key(self):
+        """
+        Return the hash key of the state position. Two states with the same position have the same key.
+        """
+        return self._position
+
+    def state_key(self):
+        """
+        Return the hash key of the state. Two states with the same position and the same time step have the same key.
+        """
+        return self._position, self.time_step()
+
     def equal_position(self, other):
         """
         Return True if the state and the other state has the same position.
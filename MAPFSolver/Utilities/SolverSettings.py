@@ -8,10 +8,16 @@ class SolverSettings:
     """
 
     def __init__(self, heuristic="Manhattan", objective_function="SOC", stay_at_goal=True, goal_occupation_time=1,
-                 edge_conflict=True, time_out=None):
+                 edge_conflict=True, time_out=None, conflict_avoidance_table=True,
+                 prioritize_conflicts=True, bypass=False, high_level_heuristic=None,
+                 disjoint_splitting=False, rectangle_reasoning=False, corridor_reasoning=False, target_reasoning=False,
+                 suboptimality_factor=1.5, low_level="A*",
+                 paths_cache_size=10000, mdd_cache_size=100000, bitset_mdd=False,
+                 pairwise_pruning=None, depth_first_total_mdd=False):
         """
         Initialization of the variables representing the solver settings.
-        :param heuristic: heuristic used. ("Manhattan" or "Abstract Distance with RRA*")
+        :param heuristic: heuristic used. ("Manhattan", "AbstractDistance" for the abstract distance with RRA* or
+        "TrueDistance" for the distance tables computed with breadth-first search)
         :param objective_function: objective function that the solver will minimize. ("SOC" or "Makespan")
         :param stay_at_goal: True if the agents never disappear once reach the goal.
         :param goal_occupation_time: if stay_at_goal is False, this variable tells how many time step the agents
@@ -20,6 +26,36 @@ class SolverSettings:
         conflicts.
         :param time_out: max time for computing the solution. If the time is over it returns an empty solution.
         The time is expressed in seconds.
+        :param conflict_avoidance_table: if True, the low level of CBS breaks the ties between paths with the same cost
+        preferring the ones with fewer conflicts with the other agents.
+        :param prioritize_conflicts: if True, CBS splits first on the cardinal conflicts, then on the semi-cardinal ones.
+        :param bypass: if True, when a child of a CBS node has the same cost and fewer conflicts its path is adopted by
+        the node instead of branching.
+        :param high_level_heuristic: admissible heuristic used to order the CBS nodes with the sum of costs. (None, "CG"
+        for the conflict graph, "DG" for the dependency graph or "WDG" for the weighted dependency graph)
+        :param disjoint_splitting: if True, CBS splits a conflict forcing one agent to be in the conflict position in a
+        child and forbidding it in the other, so that the two subtrees don't share any solution.
+        :param rectangle_reasoning: if True, CBS splits the rectangle conflicts between agents with Manhattan-optimal
+        paths using barrier constraints.
+        :param corridor_reasoning: if True, CBS splits the conflicts between agents that cross a corridor in opposite
+        directions using range constraints. (Only with edge conflicts)
+        :param target_reasoning: if True, CBS splits the conflicts with an agent that stays in his goal using length
+        constraints. (Only if stay at goal is True)
+        :param suboptimality_factor: factor w >= 1 used by the bounded-suboptimal solvers (ECBS): the cost of the
+        solution returned is at most w times the optimal one.
+        :param low_level: single-agent search used by the low level of CBS and by Cooperative A*. ("A*" or "SIPP" for
+        the safe interval path planning, that doesn't use the conflict avoidance table)
+        :param paths_cache_size: maximum number of paths of the low level of CBS cached by agent and constraints, the
+        least recently used are evicted. If 0 the paths are always recomputed.
+        :param mdd_cache_size: maximum number of MDD nodes of the MDDs cached by ICTS by agent and cost, the least
+        recently used MDDs are evicted. If 0 each ICT node builds all its MDDs.
+        :param bitset_mdd: if True, ICTS stores the MDDs as layers of boolean arrays over the cells of the map, built
+        from the distance fields of the start and of the goal, instead of building them node by node.
+        :param pairwise_pruning: pruning of the ICT nodes checking the pairs of agents before the search of the k-agents
+        MDD. (None, "Simple" to prune the nodes where a pair has no joint solution or "Enhanced" to also remove the MDD
+        nodes that don't belong to a joint solution of a pair)
+        :param depth_first_total_mdd: if True, the goal test of the ICT nodes searches the k-agents MDD depth-first,
+        generating the children lazily and remembering the dead ends, instead of building it breadth-first.
         """
         self._heuristic_str = heuristic
         self._heuristic_obj = None
@@ -31,8 +67,27 @@ class SolverSettings:
             self._time_out = time_out if time_out > 0 else None
         else:
             self._time_out = None
+        self._conflict_avoidance_table = conflict_avoidance_table
+        self._prioritize_conflicts = prioritize_conflicts
+        self._bypass = bypass
+        self._high_level_heuristic = high_level_heuristic
+        self._disjoint_splitting = disjoint_splitting
+        self._rectangle_reasoning = rectangle_reasoning
+        self._corridor_reasoning = corridor_reasoning
+        self._target_reasoning = target_reasoning
+        self._suboptimality_factor = suboptimality_factor
+        self._low_level = low_level
+        self._paths_cache_size = paths_cache_size
+        self._mdd_cache_size = mdd_cache_size
+        self._bitset_mdd = bitset_mdd
+        self._pairwise_pruning = pairwise_pruning
+        self._depth_first_total_mdd = depth_first_total_mdd
 
         assert self._goal_occupation_time > 0, "Goal occupation time must be greater than zero!"
+        assert self._high_level_heuristic in [None, "CG", "DG", "WDG"], "Unknown high level heuristic!"
+        assert self._suboptimality_factor >= 1, "Suboptimality factor must be at least one!"
+        assert self._low_level in ["A*", "SIPP"], "Unknown low level search!"
+        assert self._pairwise_pruning in [None, "Simple", "Enhanced"], "Unknown pairwise pruning!"
 
     def initialize_heuristic(self, problem_instance):
         """
@@ -97,6 +152,97 @@ class SolverSettings:
         """
         return self._time_out
 
+    def use_conflict_avoidance_table(self):
+        """
+        Return True if the low level of CBS uses the conflict avoidance table to break the ties between paths.
+        """
+        return self._conflict_avoidance_table
+
+    def prioritize_conflicts(self):
+        """
+        Return True if CBS chooses the conflict to split classifying them as cardinal, semi-cardinal or non-cardinal.
+        """
+        return self._prioritize_conflicts
+
+    def use_bypass(self):
+        """
+        Return True if CBS adopts the paths of the children with the same cost and fewer conflicts instead of branching.
+        """
+        return self._bypass
+
+    def get_high_level_heuristic(self):
+        """
+        Return the heuristic used by the high level of CBS, None if the nodes are ordered only by cost.
+        """
+        return self._high_level_heuristic
+
+    def use_disjoint_splitting(self):
+        """
+        Return True if CBS splits the conflicts with a positive and a negative constraint on the same agent.
+        """
+        return self._disjoint_splitting
+
+    def use_rectangle_reasoning(self):
+        """
+        Return True if CBS splits the rectangle conflicts using barrier constraints.
+        """
+        return self._rectangle_reasoning
+
+    def use_corridor_reasoning(self):
+        """
+        Return True if CBS splits the corridor conflicts using range constraints.
+        """
+        return self._corridor_reasoning
+
+    def use_target_reasoning(self):
+        """
+        Return True if CBS splits the target conflicts using length constraints.
+        """
+        return self._target_reasoning
+
+    def get_suboptimality_factor(self):
+        """
+        Return the factor w that bounds the cost of the solutions of the bounded-suboptimal solvers.
+        """
+        return self._suboptimality_factor
+
+    def get_low_level(self):
+        """
+        Return the single-agent search used by the low level of CBS and by Cooperative A*. ("A*" or "SIPP")
+        """
+        return self._low_level
+
+    def get_paths_cache_size(self):
+        """
+        Return the maximum number of paths of the low level of CBS cached, 0 if the cache is not used.
+        """
+        return self._paths_cache_size
+
+    def get_mdd_cache_size(self):
+        """
+        Return the maximum number of MDD nodes of the MDDs cached by ICTS, 0 if the cache is not used.
+        """
+        return self._mdd_cache_size
+
+    def use_bitset_mdd(self):
+        """
+        Return True if ICTS stores the MDDs as layers of boolean arrays built from the distance fields.
+        """
+        return self._bitset_mdd
+
+    def get_pairwise_pruning(self):
+        """
+        Return the pruning of the ICT nodes done checking the pairs of agents, None if the nodes are not pruned.
+        ("Simple" or "Enhanced")
+        """
+        return self._pairwise_pruning
+
+    def use_depth_first_total_mdd(self):
+        """
+        Return True if the goal test of the ICT nodes searches the k-agents MDD depth-first.
+        """
+        return self._depth_first_total_mdd
+
     def __str__(self):
         return "Heuristics: " + self._heuristic_str + ".\tObjective function: " + str(self._objective_function) + \
                ".\tGoal occupation time: " + str(self._goal_occupation_time)
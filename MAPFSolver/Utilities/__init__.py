@@ -1,12 +1,21 @@
 from .AbstractSolver import AbstractSolver
 from .Agent import Agent
 from .AStar import AStar
+from .ClosedList import ClosedList
+from .ConflictIndex import ConflictIndex
+from .CompiledMap import CompiledMap
+from .ConstraintTable import ConstraintTable
+from .distance_field import compute_distance_field, UNREACHABLE
+from .FocalQueue import FocalQueue
+from .HeapQueue import HeapQueue
+from .IndividualPolicy import IndividualPolicy
 from .Map import Map
 from .paths_processing import check_conflicts, check_conflicts_with_type, calculate_soc, calculate_makespan
 from .problem_generation import *
 from .ProblemInstance import ProblemInstance
 from .Reader import MAPS_NAMES_LIST, Reader
 from .SingleAgentState import SingleAgentState
+from .SIPP import SIPP
 from .SolverSettings import SolverSettings
 from .State import State
 from .StatesQueue import StatesQueue
@@ -0,0 +1,40 @@
+import numpy as np
+
+UNREACHABLE = -1  # Value of the distance field in the cells that can't be reached (and in the obstacles).
+
+
+def compute_distance_field(problem_map, source):
+    """
+    Compute the distance of every cell of the map from the source position, moving only horizontally and vertically.
+    It is a breadth-first sweep over the occupancy grid where each layer is computed with vectorized NumPy operations
+    on the whole grid. Since the moves are reversible it is also the distance of every cell to the source, so it can be
+    used as backward search from a goal.
+    :param problem_map: map of the problem.
+    :param source: (x, y) position from which compute the distances.
+    :return: a (height x width) int32 array with the distances. The unreachable cells have value UNREACHABLE.
+    """
+    free_cells = problem_map.get_compiled_map().get_ids_grid() >= 0
+    distances = np.full(free_cells.shape, UNREACHABLE, dtype=np.int32)
+
+    frontier = np.zeros(free_cells.shape, dtype=bool)
+    frontier[source[1], source[0]] = True
+    visited = frontier.copy()
+    next_frontier = np.empty_like(frontier)
+
+    distance = 0
+    while frontier.any():
+        distances[frontier] = distance
+        distance += 1
+
+        next_frontier.fill(False)
+        next_frontier[1:, :] |= frontier[:-1, :]
+        next_frontier[:-1, :] |= frontier[1:, :]
+        next_frontier[:, 1:] |= frontier[:, :-1]
+        next_frontier[:, :-1] |= frontier[:, 1:]
+        next_frontier &= free_cells
+        next_frontier &= ~visited
+
+        visited |= next_frontier
+        frontier, next_frontier = next_frontier, frontier
+
+    return distances
@@ -108,12 +108,5 @@ def normalize_paths_lengths(paths):
     :param paths: paths to update.
     :return: return the updated paths.
     """
-    import copy
     max_length = max([len(path) for path in paths])
-    new_paths = copy.deepcopy(paths)
-
-    for path in new_paths:
-        while len(path) < max_length:
-            path.append(path[len(path)-1])
-
-    return new_paths
+    return [path + [path[-1]] * (max_length - len(path)) for path in paths]
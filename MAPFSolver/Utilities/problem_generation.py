@@ -219,7 +219,9 @@ def load_map_from_file(file_path):
             if c == occupied_char:
                 occupancy_lst.add((x, y))
 
-    return Map(height, width, occupancy_lst)
+    problem_map = Map(height, width, occupancy_lst)
+    problem_map.get_compiled_map()  # Build the compiled map once, it will be shared by all the solvers.
+    return problem_map
 
 
 def load_scenario(scene_file_path, map_width, map_height, occupancy_lst, n_of_agents=10):
@@ -282,9 +284,11 @@ def load_map(reader):
 
     print("Loading map...")
     map_width, map_height, occupancy_list = reader.load_map_file()
+    problem_map = Map(map_height, map_width, occupancy_list)
+    problem_map.get_compiled_map()  # Build the compiled map once, it will be shared by all the solvers.
     print("Map loaded.")
 
-    return Map(map_height, map_width, occupancy_list)
+    return problem_map
 
 
 def load_agents(reader, problem_map, n_of_agents):
@@ -17,6 +17,9 @@ def get_solver(algorithm_str, solver_settings):
     if algorithm_str == "Conflict Based Search":
         from MAPFSolver.SearchBasedAlgorithms.CBS.CBSSolver import CBSSolver
         return CBSSolver(solver_settings)
+    if algorithm_str == "Enhanced Conflict Based Search":
+        from MAPFSolver.SearchBasedAlgorithms.ECBS.ECBSSolver import ECBSSolver
+        return ECBSSolver(solver_settings)
     if algorithm_str == "M*":
         from MAPFSolver.SearchBasedAlgorithms.MStar.MStarSolver import MStarSolver
         return MStarSolver(solver_settings)